@@ -5,10 +5,14 @@ from pathlib import Path
 import click
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
 
 from .config import Config
-from .pipeline import process_file
-from .pseudonymizer.mapping import MappingStore
+from .detectors.composite import executor as detector_executor
+from .detectors.ner_detector import NerOptions
+from .detectors.ner_detector import stats as ner_stats
+from .pipeline import process_files, start_warm_up
+from .pseudonymizer.mapping import MappingStore, SqliteMappingStore, is_database_path
 from .readers.registry import list_supported_files
 
 logger = logging.getLogger(__name__)
@@ -16,7 +20,44 @@ logger = logging.getLogger(__name__)
 console = Console()
 
 
-@click.command()
+class _DefaultCommandGroup(click.Group):
+    """Command group that falls back to the ``run`` command.
+
+    Keeps ``caviardeur INPUT_PATH [OPTIONS]`` working next to subcommands such as
+    ``caviardeur model quantize``.
+    """
+
+    default_command = "run"
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if args and args[0] not in self.commands and args[0] not in ("--help", "--version"):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+def _parse_language_models(ctx: click.Context, param: click.Parameter, value: tuple[str, ...]) -> dict[str, str]:
+    """Turn repeated ``LANG=MODEL`` options into a language -> model mapping."""
+    models: dict[str, str] = {}
+    for item in value:
+        language, sep, model = item.partition("=")
+        if not sep or not language.strip() or not model.strip():
+            raise click.BadParameter(f"expected LANG=MODEL, got {item!r}", ctx=ctx, param=param)
+        models[language.strip().lower()] = model.strip()
+    return models
+
+
+@click.group(cls=_DefaultCommandGroup)
+@click.version_option(version=version("caviardeur"))
+def main() -> None:
+    """Pseudonymize PII in documents.
+
+    Run `caviardeur INPUT_PATH` (short for `caviardeur run INPUT_PATH`) to process
+    documents, `caviardeur model` to manage the NER model, or `caviardeur mapping`
+    to convert mapping files.
+    """
+
+
+@main.command("run")
 @click.argument("input_path", type=click.Path(exists=True, path_type=Path))
 @click.option(
     "-o",
@@ -46,16 +87,170 @@ console = Console()
     "mapping_path",
     type=click.Path(path_type=Path),
     default=None,
-    help="Path to existing mapping.json for cross-batch consistency.",
+    help=(
+        "Path to existing mapping.json for cross-batch consistency. A .sqlite or .db path is a "
+        "mapping database, created if missing and updated in place."
+    ),
+)
+@click.option(
+    "--model-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=None,
+    help="Load the NER model from a local directory (see `caviardeur model fetch`); no network access.",
+)
+@click.option(
+    "--language-model",
+    "language_models",
+    multiple=True,
+    callback=_parse_language_models,
+    metavar="LANG=MODEL",
+    help="NER model (HuggingFace id or local directory) for documents detected as LANG (fr or en); "
+    "repeatable. Other documents use the default model.",
+)
+@click.option(
+    "--max-loaded-mb",
+    type=click.IntRange(min=1),
+    default=2048,
+    show_default=True,
+    help="Keep loaded NER models up to this many MB of weights; least recently used are unloaded first.",
+)
+@click.option(
+    "--draft-model",
+    default=None,
+    help="Small first-stage NER model (HuggingFace id or local directory); only windows it "
+    "is unsure about run on the full model.",
+)
+@click.option(
+    "--escalation-threshold",
+    type=click.FloatRange(min=0.0, max=1.0),
+    default=0.9,
+    show_default=True,
+    help="Cascade: send a window to the full model when a draft token's confidence is below this.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Number of NER windows per inference batch.",
+)
+@click.option(
+    "--intra-op-threads",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="ONNX Runtime threads per operator (0 = one per physical core).",
+)
+@click.option(
+    "--inter-op-threads",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="ONNX Runtime threads across operators in parallel execution mode (0 = default).",
+)
+@click.option(
+    "--sessions",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Parallel ONNX Runtime sessions sharing one copy of the weights "
+    "(threads per operator default to cores / sessions).",
+)
+@click.option(
+    "--graph-optimization",
+    type=click.Choice(["disable", "basic", "extended", "all"]),
+    default="all",
+    show_default=True,
+    help="ONNX Runtime graph optimization level.",
+)
+@click.option(
+    "--execution-mode",
+    type=click.Choice(["sequential", "parallel"]),
+    default="sequential",
+    show_default=True,
+    help="ONNX Runtime execution mode.",
+)
+@click.option(
+    "--mem-arena/--no-mem-arena",
+    default=True,
+    show_default=True,
+    help="Use ONNX Runtime's CPU memory arena.",
+)
+@click.option(
+    "--quantize",
+    is_flag=True,
+    default=False,
+    help="Run the INT8 quantized NER model (created on first use).",
+)
+@click.option(
+    "--model-cache/--no-model-cache",
+    default=True,
+    show_default=True,
+    help="Cache the optimized NER graph next to the model and reuse it on later runs.",
+)
+@click.option(
+    "--ner-cache",
+    "ner_cache_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="SQLite file caching NER results per window, reused across runs (disabled by default).",
+)
+@click.option(
+    "--ner-cache-size",
+    type=click.IntRange(min=1),
+    default=256,
+    show_default=True,
+    help="Maximum NER cache size in MB; least recently used entries are evicted.",
+)
+@click.option(
+    "--prefilter/--no-prefilter",
+    default=True,
+    show_default=True,
+    help="Skip NER on windows with no capitalised word or mostly numbers and symbols.",
+)
+@click.option(
+    "--min-letter-ratio",
+    type=click.FloatRange(min=0.0, max=1.0),
+    default=0.1,
+    show_default=True,
+    help="Pre-filter: minimum share of letters among non-space characters in a NER window.",
+)
+@click.option(
+    "--warm-up",
+    type=click.Choice(["none", "load", "infer"]),
+    default="load",
+    show_default=True,
+    help=(
+        "Load the NER model in the background while files are discovered and read ('infer' also runs a "
+        "dummy batch, which can slow the first detection on machines with few cores)."
+    ),
 )
 @click.option("-v", "--verbose", is_flag=True, default=False, help="Verbose logging.")
-@click.version_option(version=version("caviardeur"))
-def main(
+def run(
     input_path: Path,
     output_dir: Path,
     dry_run: bool,
     confidence: float,
     mapping_path: Path | None,
+    model_dir: Path | None,
+    language_models: dict[str, str],
+    max_loaded_mb: int,
+    draft_model: str | None,
+    escalation_threshold: float,
+    batch_size: int,
+    intra_op_threads: int,
+    inter_op_threads: int,
+    sessions: int,
+    graph_optimization: str,
+    execution_mode: str,
+    mem_arena: bool,
+    quantize: bool,
+    model_cache: bool,
+    ner_cache_path: Path | None,
+    ner_cache_size: int,
+    prefilter: bool,
+    min_letter_ratio: float,
+    warm_up: str,
     verbose: bool,
 ) -> None:
     """Pseudonymize PII in documents.
@@ -73,10 +268,35 @@ def main(
         confidence_threshold=confidence,
         dry_run=dry_run,
         mapping_path=mapping_path,
+        ner_model=str(model_dir) if model_dir is not None else Config.ner_model,
+        ner_language_models=language_models,
+        ner_max_loaded_mb=max_loaded_mb,
+        ner_draft_model=draft_model,
+        ner_escalation_threshold=escalation_threshold,
+        ner_batch_size=batch_size,
+        ner_intra_op_threads=intra_op_threads,
+        ner_inter_op_threads=inter_op_threads,
+        ner_sessions=sessions,
+        ner_graph_optimization=graph_optimization,
+        ner_execution_mode=execution_mode,
+        ner_cpu_mem_arena=mem_arena,
+        ner_cache_optimized_model=model_cache,
+        ner_quantized=quantize,
+        ner_cache_path=ner_cache_path,
+        ner_cache_max_mb=ner_cache_size,
+        ner_prefilter=prefilter,
+        ner_prefilter_min_letter_ratio=min_letter_ratio,
+        ner_warm_up=warm_up,
     )
+    # Cold start overlaps with mapping load, file discovery and the first reads
+    start_warm_up(config)
 
     # Load or create mapping
-    if mapping_path and mapping_path.exists():
+    mapping: MappingStore
+    if mapping_path and is_database_path(mapping_path):
+        console.print(f"Using mapping database {mapping_path}")
+        mapping = SqliteMappingStore(mapping_path)
+    elif mapping_path and mapping_path.exists():
         console.print(f"Loading existing mapping from {mapping_path}")
         mapping = MappingStore.load(mapping_path)
     else:
@@ -103,22 +323,166 @@ def main(
         console=console,
     ) as progress:
         task = progress.add_task("Processing...", total=len(files))
-        for file_path in files:
-            progress.update(task, description=f"Processing {file_path.name}...")
-            try:
-                entities = process_file(file_path, config, mapping, console=console)
-                total_entities += len(entities)
-            except Exception:
-                console.print(f"  [red]Error processing {file_path.name}[/red]")
-                logger.debug("Failed to process %s", file_path.name, exc_info=True)
+        # Files are read and scanned in groups so NER inference is batched across documents
+        for result in process_files(files, config, mapping, console=console):
+            progress.update(task, description=f"Processed {result.path.name}")
+            if result.error is not None:
+                console.print(f"  [red]Error processing {result.path.name}[/red]")
+                logger.debug("Failed to process %s", result.path.name, exc_info=result.error)
+            else:
+                total_entities += len(result.entities)
             progress.advance(task)
 
     # Summary
     console.print()
     console.print(f"[bold green]Done.[/bold green] {total_entities} PII entities detected across {len(files)} file(s).")
 
+    if prefilter and ner_stats.skipped:
+        console.print(f"NER pre-filter: skipped {ner_stats.skipped} of {ner_stats.windows} window(s)")
+    if draft_model is not None and ner_stats.drafted:
+        escalated = f"{ner_stats.escalated} of {ner_stats.drafted} window(s)"
+        console.print(f"NER cascade: escalated {escalated} to the full model")
+    if ner_cache_path is not None:
+        from .detectors.ner_cache import open_ner_cache
+
+        cache = open_ner_cache(ner_cache_path, ner_cache_size)
+        console.print(f"NER cache: {cache.hits} window(s) reused, {cache.misses} computed")
+    if verbose and detector_executor.timings:
+        timings = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in detector_executor.timings.items())
+        console.print(f"Detector time: {timings}")
+
+    if isinstance(mapping, SqliteMappingStore):
+        mapping.close()
     if not dry_run and total_entities > 0:
-        mapping_out = config.output_dir / "mapping.json"
-        mapping.save(mapping_out)
-        console.print(f"Mapping saved to {mapping_out}")
+        if isinstance(mapping, SqliteMappingStore):
+            # New pseudonyms were committed to the database as each document was written
+            console.print(f"Mapping saved to {mapping.path}")
+        else:
+            mapping_out = config.output_dir / "mapping.json"
+            mapping.save(mapping_out)
+            console.print(f"Mapping saved to {mapping_out}")
         console.print(f"Anonymized files in {config.output_dir}/")
+
+
+@main.group("mapping")
+def mapping_group() -> None:
+    """Convert between mapping.json files and mapping databases."""
+
+
+@mapping_group.command("import")
+@click.argument("json_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("database_path", type=click.Path(dir_okay=False, path_type=Path))
+def import_mapping(json_path: Path, database_path: Path) -> None:
+    """Add the entries of JSON_PATH to the mapping database DATABASE_PATH."""
+    store = SqliteMappingStore(database_path)
+    count = store.import_json(json_path)
+    store.close()
+    console.print(f"Imported {count} pseudonym(s) into {database_path}")
+
+
+@mapping_group.command("export")
+@click.argument("database_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.argument("json_path", type=click.Path(dir_okay=False, path_type=Path))
+def export_mapping(database_path: Path, json_path: Path) -> None:
+    """Write the mapping database DATABASE_PATH as a mapping.json file."""
+    store = SqliteMappingStore(database_path)
+    store.export_json(json_path)
+    store.close()
+    console.print(f"Mapping exported to {json_path}")
+
+
+@main.group()
+def model() -> None:
+    """Manage the NER model."""
+
+
+@model.command()
+@click.argument("model_dir", type=click.Path(file_okay=False, path_type=Path))
+@click.option(
+    "--model",
+    "model_name",
+    default=Config.ner_model,
+    show_default=True,
+    help="HuggingFace model id.",
+)
+@click.option("--force", is_flag=True, default=False, help="Download and rewrite the model even if present.")
+@click.option("-v", "--verbose", is_flag=True, default=False, help="Verbose logging.")
+def fetch(model_dir: Path, model_name: str, force: bool, verbose: bool) -> None:
+    """Download the NER model into MODEL_DIR for offline runs.
+
+    Use it with `caviardeur run --model-dir MODEL_DIR`: startup then reads only local
+    files, and the weights are memory-mapped so concurrent runs share them.
+    """
+    from .detectors.ner_model import fetch_model
+
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(message)s",
+    )
+
+    fetch_model(model_name, model_dir, force=force)
+    console.print(f"NER model ready in {model_dir}")
+
+
+@model.command()
+@click.option(
+    "--model",
+    "model_name",
+    default=Config.ner_model,
+    show_default=True,
+    help="HuggingFace model id, or a directory filled by `caviardeur model fetch`.",
+)
+@click.option(
+    "--corpus",
+    "corpus_path",
+    type=click.Path(exists=True, path_type=Path),
+    default=None,
+    help="File or directory of documents on which to compare the FP32 and INT8 models.",
+)
+@click.option("--force", is_flag=True, default=False, help="Re-create the INT8 model even if it is cached.")
+@click.option("-v", "--verbose", is_flag=True, default=False, help="Verbose logging.")
+def quantize(model_name: str, corpus_path: Path | None, force: bool, verbose: bool) -> None:
+    """Create an INT8 dynamically quantized copy of the NER model.
+
+    The copy is cached next to the downloaded model and used by `caviardeur run --quantize`.
+    With --corpus, also report latency and entity-level agreement against the FP32 model.
+    """
+    from .detectors.ner_benchmark import compare_quantized
+    from .detectors.ner_model import quantize_model, resolve_model_files
+    from .readers.registry import read_document
+
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format="%(message)s",
+    )
+
+    model_path = resolve_model_files(model_name)[0]
+    int8_path = quantize_model(model_path, force=force)
+    console.print(f"INT8 model: {int8_path}")
+
+    if corpus_path is None:
+        return
+
+    texts = []
+    for file_path in list_supported_files(corpus_path):
+        content = read_document(file_path)
+        if content is not None and content.raw_text.strip():
+            texts.append(content.raw_text)
+    if not texts:
+        console.print("[red]No supported documents with text found in the corpus.[/red]")
+        raise SystemExit(1)
+
+    report = compare_quantized(texts, NerOptions(model_name=model_name))
+
+    table = Table(title=f"FP32 vs INT8 on {len(texts)} document(s)")
+    table.add_column("Metric")
+    table.add_column("FP32", justify="right")
+    table.add_column("INT8", justify="right")
+    table.add_row("Model size (MB)", f"{report.fp32_size_mb:.1f}", f"{report.int8_size_mb:.1f}")
+    table.add_row("Inference time (s)", f"{report.fp32_seconds:.2f}", f"{report.int8_seconds:.2f}")
+    table.add_row("Entities", str(report.fp32_entities), str(report.int8_entities))
+    console.print(table)
+    console.print(
+        f"Speedup: {report.speedup:.2f}x — entity agreement vs FP32: "
+        f"precision {report.precision:.3f}, recall {report.recall:.3f}, F1 {report.f1:.3f}"
+    )
@@ -8,6 +8,42 @@ class Config:
     confidence_threshold: float = 0.7
     dry_run: bool = False
     mapping_path: Path | None = None
+    # HuggingFace model id, or a local directory filled by `caviardeur model fetch`
     ner_model: str = "Jean-Baptiste/camembert-ner-with-dates"
+    # Per-language models ("en" -> model id or directory); other languages use ner_model
+    ner_language_models: dict[str, str] = field(default_factory=dict)
+    # Loaded NER models are kept up to this many MB of weights, least recently used first out
+    ner_max_loaded_mb: int = 2048
     sliding_window_size: int = 2000
     sliding_window_overlap: int = 200
+    # "tokens" packs windows up to the model's token limit; "chars" uses sliding_window_size
+    sliding_window_mode: str = "tokens"
+    sliding_window_token_overlap: int = 32
+    ner_batch_size: int = 8
+    # ONNX Runtime session options (0 threads = let ONNX Runtime decide)
+    ner_intra_op_threads: int = 0
+    ner_inter_op_threads: int = 0
+    ner_graph_optimization: str = "all"
+    ner_execution_mode: str = "sequential"
+    ner_cpu_mem_arena: bool = True
+    ner_cache_optimized_model: bool = True
+    # Parallel ONNX Runtime sessions sharing one copy of the weights
+    ner_sessions: int = 1
+    # Run the INT8 dynamically quantized copy of the NER model
+    ner_quantized: bool = False
+    # On-disk cache of NER window results (None = disabled), capped at ner_cache_max_mb
+    ner_cache_path: Path | None = None
+    ner_cache_max_mb: int = 256
+    # Model cascade: a small draft model (id or directory) screens windows; only those with
+    # candidate entities or a token below ner_escalation_threshold run on ner_model
+    ner_draft_model: str | None = None
+    ner_escalation_threshold: float = 0.9
+    # Skip NER windows with no capitalised word or too few letters (numbers, codes, JSON)
+    ner_prefilter: bool = True
+    ner_prefilter_min_letter_ratio: float = 0.1
+    # Background model load at startup: "none", "load", or "infer" (load + dummy batch).
+    # "infer" is opt-in: its dummy batch can compete with the first real detection for threads.
+    ner_warm_up: str = "load"
+    # Cross-document scheduling: documents whose NER windows are batched together
+    scheduler_max_documents: int = 64
+    scheduler_max_chars: int = 1_000_000
@@ -1,5 +1,6 @@
 from .base import DetectedEntity
-from .ner_detector import detect_ner
+from .executor import DetectorExecutor
+from .ner_detector import NerEngine, NerOptions, detect_ner, detect_ner_batch
 from .regex_detector import detect_regex
 
 
@@ -10,6 +11,8 @@ def _resolve_overlaps(entities: list[DetectedEntity]) -> list[DetectedEntity]:
     1. Higher confidence
     2. Longer span
     3. More specific type (SIRET > ADDRESS > PERSON/COMPANY)
+
+    Runs in O(n log n) for non-empty spans (detectors never produce empty ones).
     """
     if not entities:
         return []
@@ -26,18 +29,23 @@ def _resolve_overlaps(entities: list[DetectedEntity]) -> list[DetectedEntity]:
             specificity.get(e.entity_type.value, 0),
         )
 
+    # Sweep by start position. Kept entities never overlap each other and are appended
+    # in start order, so their ends are increasing too: the ones overlapping the next
+    # entity are exactly those ending after its start, a suffix of the list.
     resolved: list[DetectedEntity] = []
     for entity in entities:
-        overlapping = [a for a in resolved if entity.overlaps(a)]
+        first_overlap = len(resolved)
+        while first_overlap > 0 and resolved[first_overlap - 1].end > entity.start:
+            first_overlap -= 1
 
-        if not overlapping:
+        if first_overlap == len(resolved):
             resolved.append(entity)
             continue
 
         # Only replace if the new entity beats every overlapping entity
-        if all(_score(entity) > _score(a) for a in overlapping):
-            for a in overlapping:
-                resolved.remove(a)
+        score = _score(entity)
+        if all(score > _score(a) for a in resolved[first_overlap:]):
+            del resolved[first_overlap:]
             resolved.append(entity)
 
     # Sort by start position for consistent output
@@ -45,22 +53,46 @@ def _resolve_overlaps(entities: list[DetectedEntity]) -> list[DetectedEntity]:
     return resolved
 
 
+def _detect_regex_batch(texts: list[str]) -> list[list[DetectedEntity]]:
+    return [detect_regex(text) for text in texts]
+
+
+# Detectors run next to NER on every call; register third-party detectors here
+executor = DetectorExecutor()
+executor.register("regex", _detect_regex_batch)
+
+
 def detect_all(
     text: str,
-    model_name: str = "Jean-Baptiste/camembert-ner-with-dates",
-    confidence_threshold: float = 0.7,
-    window_size: int = 2000,
-    window_overlap: int = 200,
+    options: NerOptions | None = None,
+    *,
+    boundaries: list[int] | None = None,
+    engine: NerEngine | None = None,
 ) -> list[DetectedEntity]:
-    """Run all detectors and merge results."""
-    ner_entities = detect_ner(
-        text,
-        model_name=model_name,
-        confidence_threshold=confidence_threshold,
-        window_size=window_size,
-        window_overlap=window_overlap,
-    )
-    regex_entities = detect_regex(text)
-
-    all_entities = ner_entities + regex_entities
-    return _resolve_overlaps(all_entities)
+    """Run all detectors and merge results.
+
+    NER runs with ``options`` on ``engine`` if given, otherwise on the default engine
+    for ``options.model_name``, while the detectors registered on ``executor`` run on
+    worker threads. ``boundaries`` are character offsets where NER windows may end
+    (paragraph ends...).
+    """
+
+    def _ner(texts: list[str]) -> list[list[DetectedEntity]]:
+        return [detect_ner(texts[0], options, boundaries=boundaries, engine=engine)]
+
+    return _resolve_overlaps(executor.run([text], {"ner": _ner})[0])
+
+
+def detect_all_batch(
+    texts: list[str],
+    options: NerOptions | None = None,
+    *,
+    boundaries: list[list[int]] | None = None,
+    engine: NerEngine | None = None,
+) -> list[list[DetectedEntity]]:
+    """Run all detectors on several documents, sharing NER inference batches across them."""
+
+    def _ner(texts: list[str]) -> list[list[DetectedEntity]]:
+        return detect_ner_batch(texts, options, boundaries=boundaries, engine=engine)
+
+    return [_resolve_overlaps(entities) for entities in executor.run(texts, {"ner": _ner})]
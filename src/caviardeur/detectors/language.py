@@ -0,0 +1,37 @@
+import re
+
+# Frequent function words that are specific to one language (shared ones like "a" or "on" are left out)
+_FRENCH_STOPWORDS = (
+    "le la les des du de un une et est sont dans pour par sur avec pas que qui ce cette ces "
+    "nous vous ils elles au aux ou mais donc leur leurs son sa ses été être avoir très"
+)
+_ENGLISH_STOPWORDS = (
+    "the of and to is are was were in for with that this these those by from be been have has "
+    "not which their they he she we you our at or but will would"
+)
+_STOPWORDS = {"fr": frozenset(_FRENCH_STOPWORDS.split()), "en": frozenset(_ENGLISH_STOPWORDS.split())}
+
+_WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+# Characters read from the start of a document; function words are dense enough to decide early
+_SAMPLE_CHARS = 5000
+
+
+def detect_language(text: str, default: str = "fr") -> str:
+    """Guess the language of a document from the function words it uses.
+
+    Returns the language (``"fr"`` or ``"en"``) whose stopwords occur most often in
+    the first few thousand characters, or ``default`` when none occur or on a tie.
+    """
+    counts = dict.fromkeys(_STOPWORDS, 0)
+    for match in _WORD_PATTERN.finditer(text, 0, _SAMPLE_CHARS):
+        word = match.group().lower()
+        for language, stopwords in _STOPWORDS.items():
+            if word in stopwords:
+                counts[language] += 1
+
+    best = max(counts.values())
+    leaders = [language for language, count in counts.items() if count == best]
+    if best == 0 or len(leaders) > 1:
+        return default
+    return leaders[0]
@@ -0,0 +1,72 @@
+import os
+import time
+from dataclasses import dataclass
+
+from .ner_detector import NerEngine, NerOptions
+from .ner_model import model_size, quantize_model, resolve_model_files
+
+
+@dataclass
+class QuantizationReport:
+    """FP32 vs INT8 comparison of the NER model on a corpus."""
+
+    fp32_size_mb: float
+    int8_size_mb: float
+    fp32_seconds: float
+    int8_seconds: float
+    fp32_entities: int
+    int8_entities: int
+    # Entities found by both models with identical span and type
+    matched_entities: int
+
+    @property
+    def speedup(self) -> float:
+        return self.fp32_seconds / self.int8_seconds if self.int8_seconds else 0.0
+
+    @property
+    def precision(self) -> float:
+        """Share of INT8 entities that the FP32 model also found."""
+        return self.matched_entities / self.int8_entities if self.int8_entities else 1.0
+
+    @property
+    def recall(self) -> float:
+        """Share of FP32 entities that the INT8 model also found."""
+        return self.matched_entities / self.fp32_entities if self.fp32_entities else 1.0
+
+    @property
+    def f1(self) -> float:
+        total = self.precision + self.recall
+        return 2 * self.precision * self.recall / total if total else 0.0
+
+
+def compare_quantized(texts: list[str], options: NerOptions | None = None) -> QuantizationReport:
+    """Run the FP32 and INT8 models over ``texts`` and measure size, latency and agreement.
+
+    Both models run with ``options`` (its ``quantized`` field is ignored). Model
+    loading is excluded from the timings; the INT8 copy is created if missing.
+    """
+    if options is None:
+        options = NerOptions()
+    model_path = resolve_model_files(options.model_name)[0]
+    int8_path = quantize_model(model_path)
+
+    timings: dict[bool, float] = {}
+    spans: dict[bool, set[tuple[int, int, int, str]]] = {}
+    for quantized in (False, True):
+        with NerEngine.load(options.model_name, options.session_settings, quantized) as engine:
+            started = time.perf_counter()
+            results = engine.detect(texts, options)
+            timings[quantized] = time.perf_counter() - started
+        spans[quantized] = {
+            (doc_idx, e.start, e.end, e.entity_type.value) for doc_idx, doc in enumerate(results) for e in doc
+        }
+
+    return QuantizationReport(
+        fp32_size_mb=model_size(model_path) / 1e6,
+        int8_size_mb=os.path.getsize(int8_path) / 1e6,
+        fp32_seconds=timings[False],
+        int8_seconds=timings[True],
+        fp32_entities=len(spans[False]),
+        int8_entities=len(spans[True]),
+        matched_entities=len(spans[False] & spans[True]),
+    )
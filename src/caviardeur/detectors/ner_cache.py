@@ -0,0 +1,123 @@
+import functools
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# SQLite host parameters per statement (older builds allow at most 999)
+_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS windows (
+    key TEXT PRIMARY KEY,
+    entities TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL
+)
+"""
+
+
+class NerCache:
+    """On-disk cache of raw NER results per window, keyed by model and window content.
+
+    Values are the entity dicts produced by inference, with offsets relative to the
+    window start and before any confidence threshold, so one entry serves every run
+    and every document that contains the same window. The database is capped at
+    ``max_size_mb``; least recently used entries are evicted first.
+    """
+
+    def __init__(self, path: str | Path, max_size_mb: int = 256) -> None:
+        self.path = Path(path)
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def key(model_id: str, text: str, token_ids: bytes = b"") -> str:
+        """Content address of one window.
+
+        ``token_ids`` guards against the same text being tokenized differently
+        depending on the context it was cut from.
+        """
+        digest = hashlib.sha256()
+        for part in (model_id.encode(), text.encode(), token_ids):
+            digest.update(len(part).to_bytes(8, "little"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def get_many(self, keys: list[str]) -> dict[str, list[dict]]:
+        """Return cached entities for the keys that are present and mark them as recently used."""
+        found: dict[str, list[dict]] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._lock:
+            for i in range(0, len(unique), _CHUNK):
+                chunk = unique[i : i + _CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, entities FROM windows WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update((key, json.loads(entities)) for key, entities in rows)
+            if found:
+                now = time.time_ns()
+                self._conn.executemany("UPDATE windows SET last_used = ? WHERE key = ?", [(now, k) for k in found])
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        return found
+
+    def put_many(self, items: dict[str, list[dict]]) -> None:
+        """Store entities for several windows, then evict old entries beyond the size cap."""
+        if not items:
+            return
+        now = time.time_ns()
+        rows = []
+        for key, entities in items.items():
+            value = json.dumps(entities, separators=(",", ":"))
+            rows.append((key, value, len(key) + len(value), now))
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO windows VALUES (?, ?, ?, ?)", rows)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Keep the most recently used entries that fit in the size cap."""
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM windows").fetchone()
+        if total <= self.max_size_bytes:
+            return
+        cursor = self._conn.execute(
+            """
+            DELETE FROM windows WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY last_used DESC, rowid DESC) AS kept FROM windows
+                ) WHERE kept > ?
+            )
+            """,
+            (self.max_size_bytes,),
+        )
+        logger.debug("NER cache: evicted %d entries", cursor.rowcount)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM windows").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@functools.lru_cache(maxsize=4)
+def open_ner_cache(path: Path, max_size_mb: int = 256) -> NerCache:
+    """Open the NER cache at ``path`` once per process."""
+    logger.debug("Opening NER cache %s (max %d MB)", path, max_size_mb)
+    return NerCache(path, max_size_mb)
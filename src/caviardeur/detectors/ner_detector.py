@@ -1,42 +1,359 @@
-import functools
 import json
 import logging
+import queue
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
 
 from .base import NER_LABEL_MAP, DetectedEntity
+from .language import detect_language
+from .ner_cache import NerCache, open_ner_cache
+from .ner_model import (
+    PREDICTION_OUTPUTS,
+    SessionSettings,
+    add_prediction_outputs,
+    build_session_pool,
+    model_fingerprint,
+    model_size,
+    quantize_model,
+    resolve_model_files,
+)
 
 logger = logging.getLogger(__name__)
 
+# Alphabetic words (two letters or more) and single letters, for the window pre-filter
+_WORD_PATTERN = re.compile(r"[^\W\d_]{2,}")
+_LETTER_PATTERN = re.compile(r"[^\W\d_]")
+# Sentence ends (before the following space) and line breaks: clean places to cut a window
+_BOUNDARY_PATTERN = re.compile(r"[.!?…][\"'»”)\]]*(?=\s)|(?=\n)")
 
-@functools.lru_cache(maxsize=1)
-def _get_session_and_tokenizer(model_name: str):
-    """Load the ONNX session and SentencePiece tokenizer on first use."""
-    logger.info("Loading NER model '%s' (first run downloads ~500MB)...", model_name)
-    import onnxruntime as ort
-    import sentencepiece as spm
-    from huggingface_hub import hf_hub_download
 
-    model_path = hf_hub_download(repo_id=model_name, filename="model.onnx")
-    config_path = hf_hub_download(repo_id=model_name, filename="config.json")
-    spm_path = hf_hub_download(repo_id=model_name, filename="sentencepiece.bpe.model")
+@dataclass
+class NerStats:
+    """Window counters accumulated by ``detect_ner_batch`` over the process lifetime.
 
-    session = ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+    Detections running on several threads update them through ``add``, under a lock.
+    """
 
-    sp = spm.SentencePieceProcessor()
-    sp.Load(spm_path)
+    windows: int = 0
+    skipped: int = 0
+    # Model cascade: windows screened by the draft model, and those sent on to the full model
+    drafted: int = 0
+    escalated: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
 
-    with open(config_path) as f:
-        config = json.load(f)
-    id2label: dict[int, str] = {int(k): v for k, v in config.get("id2label", {}).items()}
+    def add(self, windows: int = 0, skipped: int = 0, drafted: int = 0, escalated: int = 0) -> None:
+        with self._lock:
+            self.windows += windows
+            self.skipped += skipped
+            self.drafted += drafted
+            self.escalated += escalated
 
-    # CamemBERT (and similar fairseq-based models) shift the SentencePiece vocabulary
-    # by adding special tokens before the regular vocab.  The model's BOS/EOS ids differ
-    # from sp.bos_id() / sp.eos_id(); every regular token id must be offset accordingly.
-    model_bos_id: int = config.get("bos_token_id", sp.bos_id())
-    model_eos_id: int = config.get("eos_token_id", sp.eos_id())
-    fairseq_offset: int = model_bos_id - sp.bos_id()
+    def reset(self) -> None:
+        with self._lock:
+            self.windows = 0
+            self.skipped = 0
+            self.drafted = 0
+            self.escalated = 0
 
-    logger.info("NER model loaded.")
-    return session, sp, id2label, model_bos_id, model_eos_id, fairseq_offset
+
+stats = NerStats()
+
+
+@dataclass(frozen=True)
+class NerOptions:
+    """What NER detection runs and how, built once per run and passed down unchanged.
+
+    Model selection: ``model_name`` (HuggingFace id or local directory), its
+    ``session_settings``, ``quantized`` (the INT8 copy), ``num_sessions`` (size of the
+    session pool), ``language_models`` (language code to model, ``model_name`` being
+    the fallback), ``draft_model`` and ``escalation_threshold`` for the cascade, and
+    ``max_loaded_mb`` of weights kept loaded. Windowing and batching: see
+    ``NerEngine.detect``.
+    """
+
+    model_name: str = "Jean-Baptiste/camembert-ner-with-dates"
+    confidence_threshold: float = 0.7
+    # "tokens" packs windows up to max_length tokens; "chars" uses window_size characters
+    window_mode: str = "tokens"
+    window_size: int = 2000
+    window_overlap: int = 200
+    token_overlap: int = 32
+    max_length: int = 512
+    batch_size: int = 8
+    session_settings: SessionSettings = field(default_factory=SessionSettings)
+    quantized: bool = False
+    num_sessions: int = 1
+    cache_path: Path | None = None
+    cache_max_mb: int = 256
+    prefilter: bool = True
+    min_letter_ratio: float = 0.1
+    draft_model: str | None = None
+    escalation_threshold: float = 0.9
+    language_models: dict[str, str] = field(default_factory=dict)
+    max_loaded_mb: int = 2048
+
+    def __post_init__(self) -> None:
+        _check_window_mode(self.window_mode)
+
+
+class _InputBuffers:
+    """Reusable input arrays for batched inference.
+
+    Backing storage grows to the largest batch seen; each batch gets C-contiguous
+    ``[rows, cols]`` views over it so numpy does not allocate per ``session.run``.
+    """
+
+    def __init__(self) -> None:
+        import numpy as np
+
+        self._ids = np.empty(0, dtype=np.int64)
+        self._mask = np.empty(0, dtype=np.int64)
+        self._zeros = np.empty(0, dtype=np.int64)
+
+    def views(self, rows: int, cols: int):
+        """Return (input_ids, attention_mask, token_type_ids) views of shape [rows, cols]."""
+        import numpy as np
+
+        size = rows * cols
+        if size > self._ids.size:
+            self._ids = np.empty(size, dtype=np.int64)
+            self._mask = np.empty(size, dtype=np.int64)
+            self._zeros = np.zeros(size, dtype=np.int64)
+        return (
+            self._ids[:size].reshape(rows, cols),
+            self._mask[:size].reshape(rows, cols),
+            self._zeros[:size].reshape(rows, cols),
+        )
+
+
+# BIO tag kinds used by the span decoder
+_TAG_OUTSIDE, _TAG_BEGIN, _TAG_INSIDE = 0, 1, 2
+
+
+def _label_arrays(id2label: dict[int, str]):
+    """Lookup tables for the span decoder: tag kind and entity-group index per label id.
+
+    Returns (kinds, groups, group_names). Labels that are not B-/I- tagged decode as O.
+    """
+    import numpy as np
+
+    size = max(id2label, default=0) + 1
+    kinds = np.zeros(size, dtype=np.int8)
+    groups = np.full(size, -1, dtype=np.int64)
+    group_names: list[str] = []
+    for label_id, label in id2label.items():
+        if label[:2] not in ("B-", "I-"):
+            continue
+        kinds[label_id] = _TAG_BEGIN if label.startswith("B-") else _TAG_INSIDE
+        if label[2:] not in group_names:
+            group_names.append(label[2:])
+        groups[label_id] = group_names.index(label[2:])
+    return kinds, groups, group_names
+
+
+def _decode_spans(pred_ids, pred_scores, id2label: dict[int, str], sequence_starts=None):
+    """Group per-token BIO predictions into entity spans with array operations.
+
+    ``pred_ids``/``pred_scores`` cover real tokens only (BOS/EOS/padding removed),
+    possibly several windows back to back: ``sequence_starts`` flags the first
+    token of each window so no entity runs across windows. A span starts at a B-
+    token, or at an I- token that does not continue an entity of the same group;
+    its score is the mean of its token scores.
+
+    Returns (first_token, last_token, group_names, group_index, score) arrays.
+    """
+    import numpy as np
+
+    kinds, groups, group_names = _label_arrays(id2label)
+    # Ids the label map does not know decode as O
+    known = pred_ids < len(kinds)
+    safe_ids = np.where(known, pred_ids, 0)
+    kind = np.where(known, kinds[safe_ids], _TAG_OUTSIDE)
+    group = np.where(known, groups[safe_ids], -1)
+
+    in_entity = kind != _TAG_OUTSIDE
+    continues = np.zeros(len(kind), dtype=bool)
+    continues[1:] = in_entity[1:] & (kind[1:] == _TAG_INSIDE) & in_entity[:-1] & (group[1:] == group[:-1])
+    if sequence_starts is not None:
+        continues &= ~sequence_starts
+
+    first = np.flatnonzero(in_entity & ~continues)
+    ends_here = in_entity.copy()
+    ends_here[:-1] &= ~continues[1:]
+    last = np.flatnonzero(ends_here)
+
+    # Segment means via cumulative sums: sum(scores[first..last]) / length
+    cumulative = np.concatenate(([0.0], np.cumsum(pred_scores, dtype=np.float64)))
+    scores = (cumulative[last + 1] - cumulative[first]) / (last - first + 1)
+    return first, last, group_names, group[first], scores
+
+
+def _encode_texts(sp, texts: list[str], fairseq_offset: int, num_threads: int = -1) -> list[tuple]:
+    """Tokenize whole documents once.
+
+    Returns one ``(ids, offsets)`` pair per text: ``ids`` is an int64 array of model
+    vocabulary ids and ``offsets`` an int64 ``[n, 2]`` array of character spans.
+    Several texts are encoded in one call using SentencePiece's thread pool.
+    """
+    import numpy as np
+
+    if len(texts) == 1:
+        encoded_texts = [sp.encode(texts[0], out_type="immutable_proto")]
+    else:
+        encoded_texts = sp.encode(texts, out_type="immutable_proto", num_threads=num_threads)
+
+    results = []
+    for encoded in encoded_texts:
+        pieces = encoded.pieces
+        n = len(pieces)
+        # Raw SentencePiece ids are shifted by fairseq_offset to match the model vocabulary
+        # (e.g. CamemBERT adds 4 special tokens before the regular vocab: offset=4).
+        ids = np.fromiter((p.id for p in pieces), dtype=np.int64, count=n) + fairseq_offset
+        offsets = np.fromiter((x for p in pieces for x in (p.begin, p.end)), dtype=np.int64, count=2 * n)
+        results.append((ids, offsets.reshape(n, 2)))
+    return results
+
+
+def _predict_tokens(
+    session,
+    windows: list[tuple],
+    model_bos_id: int,
+    model_eos_id: int,
+    model_pad_id: int,
+    max_length: int = 512,
+    buffers: _InputBuffers | None = None,
+):
+    """Run several pre-tokenized windows through the model with a single padded ``session.run``.
+
+    ``windows`` holds ``(ids, offsets)`` array slices as produced by ``_encode_texts``.
+    Returns ``(pred_ids, pred_scores, lengths)``: the arg-max label id and its softmax
+    probability for every real token of every window, concatenated, and the number
+    of tokens kept per window (after truncation to ``max_length``).
+    """
+    import numpy as np
+
+    if buffers is None:
+        buffers = _InputBuffers()
+
+    # Truncate to model max length (keep room for BOS and EOS)
+    lengths = [len(ids) for ids, _ in windows]
+    for n in lengths:
+        if n + 2 > max_length:
+            logger.debug("NER window truncated: %d tokens exceed the %d-token limit", n + 2, max_length)
+    lengths = [min(n, max_length - 2) for n in lengths]
+
+    # Pad every sequence to the longest one; padded positions are masked out
+    seq_len = max(lengths) + 2
+    input_ids, attention_mask, token_type_ids = buffers.views(len(windows), seq_len)
+    input_ids.fill(model_pad_id)
+    attention_mask.fill(0)
+    for row, ((ids, _), n) in enumerate(zip(windows, lengths, strict=True)):
+        input_ids[row, 0] = model_bos_id
+        input_ids[row, 1 : n + 1] = ids[:n]
+        input_ids[row, n + 1] = model_eos_id
+        attention_mask[row, : n + 2] = 1
+
+    input_names = {inp.name for inp in session.get_inputs()}
+    inputs: dict[str, np.ndarray] = {"input_ids": input_ids, "attention_mask": attention_mask}
+    if "token_type_ids" in input_names:
+        inputs["token_type_ids"] = token_type_ids
+
+    # Only real tokens matter: drop BOS (position 0), EOS and padding before any math
+    real = attention_mask.astype(bool)
+    real[:, 0] = False
+    real[np.arange(len(windows)), np.asarray(lengths) + 1] = False
+
+    output_names = {out.name for out in session.get_outputs()}
+    if output_names.issuperset(PREDICTION_OUTPUTS):
+        # The graph already computed softmax/arg-max: fetch [batch, seq_len] labels and scores
+        labels, label_scores = session.run(list(PREDICTION_OUTPUTS), inputs)
+        return labels[real], label_scores[real], lengths
+
+    logits = session.run(None, inputs)[0]  # [batch, seq_len, num_labels]
+    token_logits = logits[real].astype(np.float32, copy=False)  # [tokens, num_labels]
+
+    # Softmax probability of the arg-max label: 1 / sum(exp(logits - max))
+    pred_ids = token_logits.argmax(axis=-1)
+    shifted = token_logits - token_logits.max(axis=-1, keepdims=True)
+    pred_scores = 1.0 / np.exp(shifted).sum(axis=-1)
+    return pred_ids, pred_scores, lengths
+
+
+def _run_batch(
+    session,
+    id2label: dict[int, str],
+    windows: list[tuple],
+    model_bos_id: int,
+    model_eos_id: int,
+    model_pad_id: int,
+    max_length: int = 512,
+    buffers: _InputBuffers | None = None,
+) -> list[list[dict]]:
+    """Run NER on several pre-tokenized windows with a single padded ``session.run``.
+
+    ``windows`` holds ``(ids, offsets)`` array slices as produced by ``_encode_texts``.
+    Returns one list of entity dicts (entity_group/start/end/score) per window, with
+    offsets in the coordinates of the encoded text.
+    """
+    import numpy as np
+
+    pred_ids, pred_scores, lengths = _predict_tokens(
+        session, windows, model_bos_id, model_eos_id, model_pad_id, max_length, buffers
+    )
+    offsets = np.concatenate([offsets[:n] for (_, offsets), n in zip(windows, lengths, strict=True)])
+
+    sequence_starts = np.zeros(len(pred_ids), dtype=bool)
+    sequence_starts[np.cumsum([0, *lengths[:-1]])] = True
+    first, last, group_names, group_index, scores = _decode_spans(pred_ids, pred_scores, id2label, sequence_starts)
+
+    # Only the final spans become Python objects
+    row_of_token = np.repeat(np.arange(len(windows)), lengths)
+    results: list[list[dict]] = [[] for _ in windows]
+    for row, start, end, group, score in zip(  # noqa: B905
+        row_of_token[first].tolist(),
+        offsets[first, 0].tolist(),
+        offsets[last, 1].tolist(),
+        group_index.tolist(),
+        scores.tolist(),
+    ):
+        results[row].append({"entity_group": group_names[group], "start": start, "end": end, "score": score})
+    return results
+
+
+def _uncertain_windows(
+    session,
+    id2label: dict[int, str],
+    windows: list[tuple],
+    model_bos_id: int,
+    model_eos_id: int,
+    model_pad_id: int,
+    threshold: float,
+    max_length: int = 512,
+    buffers: _InputBuffers | None = None,
+) -> list[bool]:
+    """Flag windows a cheap model cannot settle on its own, with a single ``session.run``.
+
+    A window is flagged when any token is predicted as part of an entity, when any
+    token's top probability is below ``threshold``, or when it had to be truncated.
+    """
+    import numpy as np
+
+    pred_ids, pred_scores, lengths = _predict_tokens(
+        session, windows, model_bos_id, model_eos_id, model_pad_id, max_length, buffers
+    )
+    kinds, _, _ = _label_arrays(id2label)
+    known = (pred_ids >= 0) & (pred_ids < len(kinds))
+    is_entity = known & (kinds[np.where(known, pred_ids, 0)] != _TAG_OUTSIDE)
+
+    starts = np.cumsum([0, *lengths[:-1]])
+    has_entity = np.maximum.reduceat(is_entity.astype(np.int8), starts).astype(bool)
+    min_score = np.minimum.reduceat(np.asarray(pred_scores, dtype=np.float64), starts)
+    truncated = np.array([len(ids) for ids, _ in windows]) > np.asarray(lengths)
+    return (has_entity | (min_score < threshold) | truncated).tolist()
 
 
 def _run_window(
@@ -50,170 +367,755 @@ def _run_window(
     max_length: int = 512,
 ) -> list[dict]:
     """Run NER on one text window; returns entity dicts with entity_group/start/end/score."""
+    window = _encode_texts(sp, [text], fairseq_offset)[0]
+    # A single window needs no padding, so the pad id is never written
+    return _run_batch(session, id2label, [window], model_bos_id, model_eos_id, model_eos_id, max_length=max_length)[0]
+
+
+def _to_detected_entities(
+    text: str,
+    results: list[dict],
+    confidence_threshold: float,
+    seen_spans: set[tuple[int, int, str]],
+) -> list[DetectedEntity]:
+    """Convert one window's entity dicts (offsets into ``text``) into DetectedEntity objects."""
+    entities: list[DetectedEntity] = []
+    for ent in results:
+        label = ent["entity_group"]
+        entity_type = NER_LABEL_MAP.get(label)
+        if entity_type is None:
+            continue
+
+        score = ent["score"]
+        if score < confidence_threshold:
+            continue
+
+        global_start = ent["start"]
+        global_end = ent["end"]
+        ent_text = text[global_start:global_end]
+
+        # Trim leading/trailing whitespace from entity boundaries
+        stripped = ent_text.lstrip()
+        if len(stripped) < len(ent_text):
+            global_start += len(ent_text) - len(stripped)
+        ent_text = stripped
+        stripped = ent_text.rstrip()
+        if len(stripped) < len(ent_text):
+            global_end -= len(ent_text) - len(stripped)
+        ent_text = stripped
+
+        if not ent_text:
+            continue
+
+        # Deduplicate entities from overlapping windows
+        span_key = (global_start, global_end, label)
+        if span_key in seen_spans:
+            continue
+        seen_spans.add(span_key)
+
+        entities.append(
+            DetectedEntity(
+                entity_type=entity_type,
+                text=ent_text,
+                start=global_start,
+                end=global_end,
+                confidence=score,
+                source="ner",
+            )
+        )
+    return entities
+
+
+def _text_boundaries(text: str, extra: list[int] | None = None):
+    """Sorted character offsets where a window may end without splitting an entity.
+
+    Sentence ends and line breaks found in ``text``, plus ``extra`` offsets (the
+    document's paragraph, cell or page ends, see ``DocumentContent.boundaries``).
+    """
     import numpy as np
 
-    # Tokenize with SentencePiece — proto encoding gives character-level offsets
-    encoded = sp.encode(text, out_type="immutable_proto")
-    pieces = list(encoded.pieces)
+    found = [m.end() for m in _BOUNDARY_PATTERN.finditer(text)]
+    return np.unique(np.array(found + list(extra or []), dtype=np.int64))
 
-    # Build token sequence with BOS/EOS bookends.
-    # Raw SentencePiece ids are shifted by fairseq_offset to match the model vocabulary
-    # (e.g. CamemBERT adds 4 special tokens before the regular vocab: offset=4).
-    ids = [model_bos_id] + [p.id + fairseq_offset for p in pieces] + [model_eos_id]
-    offsets = [(0, 0)] + [(p.begin, p.end) for p in pieces] + [(0, 0)]
-    special_mask = [1] + [0] * len(pieces) + [1]
 
-    # Truncate to model max length (keep BOS and EOS)
-    if len(ids) > max_length:
-        ids = ids[: max_length - 1] + [model_eos_id]
-        offsets = offsets[: max_length - 1] + [(0, 0)]
-        special_mask = special_mask[: max_length - 1] + [1]
+def _cut_point(boundaries, lo: int, hi: int) -> int | None:
+    """Last boundary in the second half of ``(lo, hi]``, or None."""
+    import numpy as np
 
-    input_ids = np.array([ids], dtype=np.int64)
-    attention_mask = np.ones_like(input_ids)
+    if boundaries is None or not len(boundaries):
+        return None
+    k = int(np.searchsorted(boundaries, hi, side="right")) - 1
+    if k >= 0 and boundaries[k] > lo + (hi - lo) // 2:
+        return int(boundaries[k])
+    return None
 
-    input_names = {inp.name for inp in session.get_inputs()}
-    inputs: dict[str, np.ndarray] = {"input_ids": input_ids, "attention_mask": attention_mask}
-    if "token_type_ids" in input_names:
-        inputs["token_type_ids"] = np.zeros_like(input_ids)
 
-    logits = session.run(None, inputs)[0][0]  # [seq_len, num_labels]
+def _char_windows(
+    offsets, text_length: int, window_size: int, window_overlap: int, boundaries=None
+) -> list[tuple[int, int]]:
+    """Split a tokenized text into character windows, as token index ranges.
 
-    # Softmax → probabilities
-    logits = logits.astype(np.float32)
-    exp_l = np.exp(logits - logits.max(axis=-1, keepdims=True))
-    probs = exp_l / exp_l.sum(axis=-1, keepdims=True)
-    pred_ids = probs.argmax(axis=-1).tolist()
-    pred_scores = probs.max(axis=-1).tolist()
+    A window holds the tokens that start inside its character range. Without
+    ``boundaries`` windows have a fixed size and overlap by ``window_overlap``
+    characters. With ``boundaries`` (sorted character offsets) a window ends on the
+    last boundary in its second half, and the next window starts right there
+    without overlap; windows with no boundary to end on keep the overlap.
+    """
+    import numpy as np
 
-    # Aggregate tokens into entity spans (simple BIO strategy)
-    entities: list[dict] = []
-    current: dict | None = None
+    if boundaries is None:
+        step = window_size - window_overlap
+        starts = np.arange(0, max(text_length, 1), step)
+        ends = np.minimum(starts + window_size, text_length)
+    else:
+        start_list, end_list = [], []
+        start = 0
+        while True:
+            end = min(start + window_size, text_length)
+            cut = _cut_point(boundaries, start, end) if end < text_length else None
+            start_list.append(start)
+            end_list.append(cut if cut is not None else end)
+            if end >= text_length:
+                break
+            start = cut if cut is not None else max(end - window_overlap, start + 1)
+        starts, ends = np.array(start_list), np.array(end_list)
+    begins = offsets[:, 0]
+    lo = np.searchsorted(begins, starts, side="left")
+    hi = np.searchsorted(begins, ends, side="left")
+    return list(zip(lo.tolist(), hi.tolist(), strict=True))
 
-    for label_id, score, (char_start, char_end), is_special in zip(  # noqa: B905
-        pred_ids, pred_scores, offsets, special_mask
-    ):
-        if is_special:
-            if current is not None:
-                entities.append(current)
-                current = None
-            continue
 
-        label = id2label.get(label_id, "O")
-
-        if label == "O":
-            if current is not None:
-                entities.append(current)
-                current = None
-        elif label.startswith("B-"):
-            if current is not None:
-                entities.append(current)
-            current = {
-                "entity_group": label[2:],
-                "start": char_start,
-                "end": char_end,
-                "score": score,
-                "_scores": [score],
-            }
-        elif label.startswith("I-"):
-            entity_type = label[2:]
-            if current is not None and current["entity_group"] == entity_type:
-                current["end"] = char_end
-                current["_scores"].append(score)
-                current["score"] = float(np.mean(current["_scores"]))
+def _token_windows(n_tokens: int, max_length: int, token_overlap: int, boundaries=None) -> list[tuple[int, int]]:
+    """Split a tokenized text into windows packed up to the model's token budget.
+
+    Each window spans as many tokens as fit in ``max_length`` (minus BOS/EOS), so
+    nothing is truncated and short windows are not wasted. With ``boundaries``
+    (sorted token indices where a sentence, line or paragraph starts) a window ends
+    on the last boundary in its second half and the next one starts there, without
+    overlap. Otherwise consecutive windows share ``token_overlap`` tokens. Returns
+    token index ranges.
+    """
+    budget = max(1, max_length - 2)
+    token_overlap = min(max(0, token_overlap), budget // 2)
+
+    windows: list[tuple[int, int]] = []
+    i = 0
+    while i < n_tokens:
+        j = min(i + budget, n_tokens)
+        cut = _cut_point(boundaries, i, j) if j < n_tokens else None
+        windows.append((i, cut if cut is not None else j))
+        if j == n_tokens:
+            break
+        i = cut if cut is not None else j - token_overlap
+    return windows
+
+
+def _merge_window_entities(text: str, results: list[dict], seams: list[int]) -> list[dict]:
+    """Merge the entities one document's windows found into whole, unique spans.
+
+    Same-label entities that overlap are merged into one span: an entity seen by two
+    overlapping windows, whole or cut at one window's edge, comes out once and
+    whole. Same-label entities separated only by whitespace are also joined when a
+    window cut without overlap (``seams``, character offsets) falls between them.
+    The merged score is the best of the parts.
+    """
+    import bisect
+
+    merged: list[dict] = []
+    last_by_label: dict[str, dict] = {}
+    for ent in sorted(results, key=lambda e: (e["start"], e["end"])):
+        label = ent["entity_group"]
+        last = last_by_label.get(label)
+        if last is not None:
+            joined = ent["start"] < last["end"]
+            if not joined and not text[last["end"] : ent["start"]].strip():
+                k = bisect.bisect_left(seams, last["end"])
+                joined = k < len(seams) and seams[k] <= ent["start"]
+            if joined:
+                last["end"] = max(last["end"], ent["end"])
+                last["score"] = max(last["score"], ent["score"])
+                continue
+        ent = dict(ent)
+        merged.append(ent)
+        last_by_label[label] = ent
+    return merged
+
+
+def _length_buckets(lengths: list[int], batch_size: int) -> list[list[int]]:
+    """Group window indices into batches of at most ``batch_size`` windows of similar length."""
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    batch_size = max(1, batch_size)
+    return [order[i : i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+def _may_contain_names(text: str, min_letter_ratio: float) -> bool:
+    """Cheap test for windows worth sending to the model.
+
+    Rejects text without any capitalised alphabetic word, or whose share of letters
+    among non-space characters is below ``min_letter_ratio`` (numbers, codes, dates,
+    JSON punctuation).
+    """
+    if not any(word[0].isupper() for word in _WORD_PATTERN.findall(text)):
+        return False
+    if min_letter_ratio <= 0:
+        return True
+    visible = len(text) - sum(c.isspace() for c in text)
+    return len(_LETTER_PATTERN.findall(text)) >= min_letter_ratio * visible
+
+
+def _check_window_mode(window_mode: str) -> None:
+    if window_mode not in ("tokens", "chars"):
+        raise ValueError(f"Unknown window mode: {window_mode!r} (expected 'tokens' or 'chars')")
+
+
+def _shift_entities(entities: list[dict], delta: int) -> list[dict]:
+    """Move raw entity offsets by ``delta`` characters."""
+    return [{**entity, "start": entity["start"] + delta, "end": entity["end"] + delta} for entity in entities]
+
+
+class NerEngine:
+    """A loaded NER model: ONNX session(s), SentencePiece tokenizer and label map.
+
+    ``detect`` is thread-safe: ONNX Runtime sessions accept concurrent ``run`` calls
+    and each calling thread gets its own input buffers, so several detector threads
+    can share one engine. Engines with different models or session settings can be
+    held side by side. ``close`` releases the sessions; the engine is unusable after.
+
+    An engine built with several ``sessions`` (see ``build_session_pool``) dispatches
+    its batches to them from a thread pool; ONNX Runtime releases the GIL while it
+    runs, so batches execute in parallel over one copy of the weights.
+    """
+
+    def __init__(
+        self,
+        session,
+        sp,
+        id2label: dict[int, str],
+        bos_id: int,
+        eos_id: int,
+        pad_id: int,
+        fairseq_offset: int,
+        model_id: str = "",
+        sessions: list | None = None,
+        shared_weights: dict | None = None,
+        memory_bytes: int = 0,
+    ) -> None:
+        self.session = session
+        self.sessions = sessions or [session]
+        # OrtValues the pooled sessions read their weights from; must outlive them
+        self._shared_weights = shared_weights or {}
+        self._idle: queue.SimpleQueue = queue.SimpleQueue()
+        for pooled in self.sessions:
+            self._idle.put(pooled)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self.sp = sp
+        self.id2label = id2label
+        self.bos_id = bos_id
+        self.eos_id = eos_id
+        self.pad_id = pad_id
+        self.fairseq_offset = fairseq_offset
+        # Identifies the weights in cache keys (model name and precision)
+        self.model_id = model_id
+        # Approximate memory held by the weights (one copy, shared by pooled sessions)
+        self.memory_bytes = memory_bytes
+        self._local = threading.local()
+
+    @classmethod
+    def load(
+        cls,
+        model_name: str = "Jean-Baptiste/camembert-ner-with-dates",
+        session_settings: SessionSettings | None = None,
+        quantized: bool = False,
+        fused_predictions: bool = True,
+        num_sessions: int = 1,
+    ) -> "NerEngine":
+        """Load the ONNX session(s) and SentencePiece tokenizer.
+
+        With ``quantized=True`` the INT8 copy of the model is loaded (created on first use).
+        With ``fused_predictions=True`` the graph is extended to output per-token label
+        ids and scores instead of logits (prepared once and cached next to the model).
+        ``num_sessions > 1`` builds a pool of sessions sharing one copy of the weights.
+        """
+        logger.info("Loading NER model '%s' (first run downloads ~500MB)...", model_name)
+        import sentencepiece as spm
+
+        model_path, config_path, spm_path = resolve_model_files(model_name)
+        # Cached results are tied to these exact weights and labels
+        revision = model_fingerprint(model_path, config_path)
+        if quantized:
+            model_path = quantize_model(model_path)
+        if fused_predictions:
+            model_path = add_prediction_outputs(model_path)
+
+        sessions, shared_weights = build_session_pool(model_path, session_settings, num_sessions)
+
+        sp = spm.SentencePieceProcessor()
+        sp.Load(spm_path)
+
+        with open(config_path) as f:
+            config = json.load(f)
+        id2label: dict[int, str] = {int(k): v for k, v in config.get("id2label", {}).items()}
+
+        # CamemBERT (and similar fairseq-based models) shift the SentencePiece vocabulary
+        # by adding special tokens before the regular vocab.  The model's BOS/EOS ids differ
+        # from sp.bos_id() / sp.eos_id(); every regular token id must be offset accordingly.
+        model_bos_id: int = config.get("bos_token_id", sp.bos_id())
+        model_eos_id: int = config.get("eos_token_id", sp.eos_id())
+        # fairseq dictionaries put <pad> right after <s>; it only fills masked positions in a batch
+        model_pad_id: int = config.get("pad_token_id", 1)
+        fairseq_offset: int = model_bos_id - sp.bos_id()
+
+        logger.info("NER model loaded.")
+        model_id = f"{model_name}|{revision}|{'int8' if quantized else 'fp32'}"
+        return cls(
+            sessions[0],
+            sp,
+            id2label,
+            model_bos_id,
+            model_eos_id,
+            model_pad_id,
+            fairseq_offset,
+            model_id,
+            sessions=sessions,
+            shared_weights=shared_weights,
+            memory_bytes=model_size(model_path),
+        )
+
+    @property
+    def closed(self) -> bool:
+        return self.session is None
+
+    def close(self) -> None:
+        """Release the ONNX sessions, worker threads and tokenizer."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        self.session = None
+        self.sessions = []
+        self._shared_weights = {}
+        self.sp = None
+
+    def __enter__(self) -> "NerEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _buffers(self) -> _InputBuffers:
+        buffers = getattr(self._local, "buffers", None)
+        if buffers is None:
+            buffers = self._local.buffers = _InputBuffers()
+        return buffers
+
+    def _check_open(self) -> None:
+        if self.session is None:
+            raise RuntimeError("NerEngine is closed")
+
+    def _on_session(self, func, *args):
+        """Call ``func(session, *args)`` on a session; with a pool, on the first idle one."""
+        self._check_open()
+        if len(self.sessions) == 1:
+            return func(self.sessions[0], *args)
+        session = self._idle.get()
+        try:
+            return func(session, *args)
+        finally:
+            self._idle.put(session)
+
+    def _map_batches(self, func, batches: list[list[tuple]], *args) -> list:
+        """Apply ``func(session, batch, *args)`` to every batch, in parallel over the session pool."""
+        if len(self.sessions) == 1 or len(batches) <= 1:
+            return [self._on_session(func, batch, *args) for batch in batches]
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=len(self.sessions), thread_name_prefix="caviardeur-ner")
+            executor = self._executor
+        futures = [executor.submit(self._on_session, func, batch, *args) for batch in batches]
+        return [future.result() for future in futures]
+
+    def _run_on(self, session, windows: list[tuple], max_length: int) -> list[list[dict]]:
+        return _run_batch(
+            session,
+            self.id2label,
+            windows,
+            self.bos_id,
+            self.eos_id,
+            self.pad_id,
+            max_length=max_length,
+            buffers=self._buffers(),
+        )
+
+    def _flag_on(self, session, windows: list[tuple], threshold: float, max_length: int) -> list[bool]:
+        return _uncertain_windows(
+            session,
+            self.id2label,
+            windows,
+            self.bos_id,
+            self.eos_id,
+            self.pad_id,
+            threshold,
+            max_length=max_length,
+            buffers=self._buffers(),
+        )
+
+    def run_windows(self, windows: list[tuple], max_length: int = 512) -> list[list[dict]]:
+        """Run one padded batch of (token ids, offsets) windows; see ``_run_batch``.
+
+        With a session pool, the batch runs on the first idle session.
+        """
+        return self._on_session(self._run_on, windows, max_length)
+
+    def needs_escalation(
+        self, texts: list[str], threshold: float = 0.9, batch_size: int = 8, max_length: int = 512
+    ) -> list[bool]:
+        """First-stage screening of window texts with this (small) model.
+
+        Returns, per text, whether a stronger model should look at it: this model
+        found entity tokens, was unsure about some token (top probability below
+        ``threshold``), or the text did not fit in ``max_length`` tokens.
+        """
+        flags = [False] * len(texts)
+        todo = [i for i, text in enumerate(texts) if text.strip()]
+        if not todo:
+            return flags
+
+        self._check_open()
+        encoded = _encode_texts(self.sp, [texts[i] for i in todo], self.fairseq_offset)
+        buckets = _length_buckets([len(ids) for ids, _ in encoded], batch_size)
+        results = self._map_batches(
+            self._flag_on, [[encoded[i] for i in bucket] for bucket in buckets], threshold, max_length
+        )
+        for bucket, bucket_flags in zip(buckets, results, strict=True):
+            for i, flag in zip(bucket, bucket_flags, strict=True):
+                flags[todo[i]] = flag
+        return flags
+
+    def warm_up(self, batch_size: int = 8, max_length: int = 512) -> None:
+        """Run a dummy full-size batch so ONNX Runtime allocates its buffers up front."""
+        import numpy as np
+
+        self._check_open()
+        ((ids, offsets),) = _encode_texts(self.sp, ["Jean Dupont habite à Paris."], self.fairseq_offset)
+        budget = max(1, max_length - 2)
+        window = (np.resize(ids, budget), np.resize(offsets, (budget, 2)))
+        self.run_windows([window] * max(1, batch_size), max_length)
+        logger.debug("NER model warmed up with a %dx%d batch", max(1, batch_size), max_length)
+
+    def detect(
+        self,
+        texts: list[str],
+        options: NerOptions | None = None,
+        *,
+        draft: "NerEngine | None" = None,
+        boundaries: list[list[int]] | None = None,
+    ) -> list[list[DetectedEntity]]:
+        """Detect named entities in several documents; returns one entity list per text.
+
+        Each document is tokenized exactly once (all documents in one multi-threaded
+        SentencePiece call) and windows are cut as slices of the resulting id and
+        offset arrays. ``window_mode="tokens"`` packs windows by token count up to
+        ``max_length`` with ``token_overlap`` shared tokens; ``window_mode="chars"`` uses
+        ``window_size`` characters with ``window_overlap`` characters of overlap.
+        In both modes a window ends on a sentence end or line break when one falls in
+        its second half (or on one of the document's ``boundaries``, character
+        offsets of paragraph, cell or page ends), and then the next window starts
+        there with no overlap. Entities found by several windows, or cut at a window
+        edge, are merged into whole spans. Windows from all documents are sorted into
+        length buckets and grouped into padded batches of ``batch_size``, so each batch
+        costs a single ``session.run`` and many short documents share inference calls.
+
+        With ``cache_path`` set, raw window results are kept in an on-disk cache
+        (capped at ``cache_max_mb``) keyed by model and window content: windows seen in
+        an earlier run, or repeated across the given documents, skip inference.
+
+        With ``prefilter=True``, windows without any capitalised word or with a share
+        of letters below ``min_letter_ratio`` are not sent to the model; skipped windows
+        are counted in ``stats``.
+
+        With a ``draft`` engine (a small, fast model), windows are screened by it
+        first and only those it flags (entity tokens, a token below
+        ``escalation_threshold``, or truncation; see ``needs_escalation``) run on this
+        engine. Screened and escalated windows are counted in ``stats``.
+
+        The options named above are fields of ``options``. Safe to call from several
+        threads at once.
+        """
+        import numpy as np
+
+        if options is None:
+            options = NerOptions()
+
+        results: list[list[DetectedEntity]] = [[] for _ in texts]
+        doc_indices = [i for i, text in enumerate(texts) if text.strip()]
+        if not doc_indices:
+            return results
+
+        self._check_open()
+        encoded = _encode_texts(self.sp, [texts[i] for i in doc_indices], self.fairseq_offset)
+
+        # Sliding window to handle CamemBERT's 512-token limit: (doc index, ids slice, offsets slice)
+        windows: list[tuple] = []
+        # Per document, character offsets of window cuts made without overlap off a boundary
+        seams: list[list[int]] = [[] for _ in texts]
+        scanned = skipped = 0
+        for doc_idx, (ids, offsets) in zip(doc_indices, encoded, strict=True):
+            text = texts[doc_idx]
+            char_bounds = _text_boundaries(text, boundaries[doc_idx] if boundaries is not None else None)
+            token_bounds = np.unique(np.searchsorted(offsets[:, 0], char_bounds, side="left"))
+            if options.window_mode == "tokens":
+                ranges = _token_windows(len(ids), options.max_length, options.token_overlap, token_bounds)
             else:
-                if current is not None:
-                    entities.append(current)
-                current = {
-                    "entity_group": entity_type,
-                    "start": char_start,
-                    "end": char_end,
-                    "score": score,
-                    "_scores": [score],
-                }
-
-    if current is not None:
-        entities.append(current)
-
-    for e in entities:
-        del e["_scores"]
+                ranges = _char_windows(offsets, len(text), options.window_size, options.window_overlap, char_bounds)
+            clean_cuts = set(token_bounds.tolist())
+            for (_, hi), (lo, _) in zip(ranges, ranges[1:], strict=False):
+                if lo == hi < len(ids) and hi not in clean_cuts:
+                    seams[doc_idx].append(int(offsets[hi, 0]))
 
-    return entities
+            for lo, hi in ranges:
+                window_text = text[offsets[lo, 0] : offsets[hi - 1, 1]] if hi > lo else ""
+                if not window_text.strip():
+                    continue
+                scanned += 1
+                if options.prefilter and not _may_contain_names(window_text, options.min_letter_ratio):
+                    skipped += 1
+                    continue
+                windows.append((doc_idx, ids[lo:hi], offsets[lo:hi]))
+        stats.add(windows=scanned, skipped=skipped)
 
+        window_results: list[list[dict]] = [[] for _ in windows]
+        pending = list(range(len(windows)))
+        # Cache lookups: keys per window, and (window, earlier window) pairs with the same key
+        cache = open_ner_cache(options.cache_path, options.cache_max_mb) if options.cache_path is not None else None
+        keys: list[str] = []
+        duplicates: list[tuple[int, int]] = []
+        if cache is not None:
+            model_id = f"{self.model_id}|{options.max_length}"
+            keys = [
+                NerCache.key(model_id, texts[doc_idx][offsets[0, 0] : offsets[-1, 1]], ids.tobytes())
+                for doc_idx, ids, offsets in windows
+            ]
+            cached = cache.get_many(keys)
+            pending.clear()
+            first_window: dict[str, int] = {}
+            for w, key in enumerate(keys):
+                if key in cached:
+                    window_results[w] = _shift_entities(cached[key], int(windows[w][2][0, 0]))
+                elif key in first_window:
+                    duplicates.append((w, first_window[key]))
+                else:
+                    first_window[key] = w
+                    pending.append(w)
 
-def detect_ner(
-    text: str,
-    model_name: str = "Jean-Baptiste/camembert-ner-with-dates",
-    confidence_threshold: float = 0.7,
-    window_size: int = 2000,
-    window_overlap: int = 200,
-) -> list[DetectedEntity]:
-    """Detect named entities using CamemBERT NER with sliding window."""
-    if not text.strip():
-        return []
+        # Cascade: the draft model settles the windows it is sure contain no entity
+        if draft is not None and pending:
+            escalate = draft.needs_escalation(
+                [texts[windows[w][0]][windows[w][2][0, 0] : windows[w][2][-1, 1]] for w in pending],
+                options.escalation_threshold,
+                options.batch_size,
+                options.max_length,
+            )
+            drafted = len(pending)
+            pending = [w for w, flag in zip(pending, escalate, strict=True) if flag]
+            stats.add(drafted=drafted, escalated=len(pending))
 
-    session, sp, id2label, model_bos_id, model_eos_id, fairseq_offset = _get_session_and_tokenizer(model_name)
-    entities: list[DetectedEntity] = []
-    seen_spans: set[tuple[int, int, str]] = set()
+        # Length bucketing: batch windows of similar token counts together (across
+        # documents) so padding stays minimal, then restore document order afterwards.
+        # With a session pool the batches run in parallel.
+        batches = [
+            [pending[i] for i in bucket]
+            for bucket in _length_buckets([len(windows[w][1]) for w in pending], options.batch_size)
+        ]
+        all_results = self._map_batches(
+            self._run_on, [[(windows[w][1], windows[w][2]) for w in batch] for batch in batches], options.max_length
+        )
+        for batch, batch_results in zip(batches, all_results, strict=True):
+            for w, result in zip(batch, batch_results, strict=True):
+                window_results[w] = result
 
-    # Sliding window to handle CamemBERT's 512-token limit
-    step = window_size - window_overlap
-    starts = list(range(0, len(text), step))
-    if not starts:
-        starts = [0]
+        if cache is not None:
+            for w, source in duplicates:
+                delta = int(windows[w][2][0, 0] - windows[source][2][0, 0])
+                window_results[w] = _shift_entities(window_results[source], delta)
+            cache.put_many({keys[w]: _shift_entities(window_results[w], -int(windows[w][2][0, 0])) for w in pending})
 
-    for window_start in starts:
-        window_end = min(window_start + window_size, len(text))
-        window_text = text[window_start:window_end]
+        doc_entities: list[list[dict]] = [[] for _ in texts]
+        for (doc_idx, _, _), result in zip(windows, window_results, strict=True):
+            doc_entities[doc_idx].extend(result)
+        for doc_idx in doc_indices:
+            merged = _merge_window_entities(texts[doc_idx], doc_entities[doc_idx], seams[doc_idx])
+            results[doc_idx] = _to_detected_entities(texts[doc_idx], merged, options.confidence_threshold, set())
 
-        if not window_text.strip():
+        return results
+
+
+# Serializes model loading so a background warm-up and the first detection share one load
+_load_lock = threading.Lock()
+# Process-wide engines used when callers pass no engine, keyed by load arguments, least
+# recently used first. Their weights are kept under _max_loaded_bytes by closing the
+# least recently used engines, so alternating models (languages, a cascade) stay loaded.
+_default_engines: OrderedDict[tuple, NerEngine] = OrderedDict()
+_max_loaded_bytes = 2048 * 1024 * 1024
+
+
+def _evict_engines(keep: tuple[NerEngine, ...] = ()) -> None:
+    """Close least recently used default engines until the loaded weights fit the budget.
+
+    Engines in ``keep`` are never evicted, even if they alone exceed the budget.
+    The caller holds ``_load_lock``.
+    """
+    total = sum(engine.memory_bytes for engine in _default_engines.values())
+    for key, engine in list(_default_engines.items()):
+        if total <= _max_loaded_bytes:
+            break
+        if any(engine is kept for kept in keep):
             continue
+        del _default_engines[key]
+        total -= engine.memory_bytes
+        logger.info("Unloading NER model '%s' (%d MB loaded)", engine.model_id, total // (1024 * 1024))
+        engine.close()
 
-        results = _run_window(session, sp, id2label, window_text, model_bos_id, model_eos_id, fairseq_offset)
 
-        for ent in results:
-            label = ent["entity_group"]
-            entity_type = NER_LABEL_MAP.get(label)
-            if entity_type is None:
-                continue
+def _get_engine(
+    model_name: str,
+    options: NerOptions | None = None,
+    fused_predictions: bool = True,
+    *,
+    keep: tuple[NerEngine | None, ...] = (),
+) -> NerEngine:
+    """Return the default engine for ``model_name``, loading it once even across threads.
 
-            score = ent["score"]
-            if score < confidence_threshold:
-                continue
+    The engine is loaded with the session settings, precision and session pool size
+    of ``options``. Loading a model evicts (closes) the least recently used default
+    engines beyond ``options.max_loaded_mb`` of weights (when options are given, it
+    becomes the process-wide budget), except the new engine and those in ``keep``,
+    which the caller is still using.
+    """
+    global _max_loaded_bytes
+    budget = options.max_loaded_mb * 1024 * 1024 if options is not None else None
+    if options is None:
+        options = NerOptions()
+    key = (model_name, options.session_settings, options.quantized, fused_predictions, options.num_sessions)
+    with _load_lock:
+        if budget is not None:
+            _max_loaded_bytes = budget
+        engine = _default_engines.get(key)
+        if engine is None:
+            engine = _default_engines[key] = NerEngine.load(*key)
+            _evict_engines(keep=(engine, *(kept for kept in keep if kept is not None)))
+        _default_engines.move_to_end(key)
+        return engine
 
-            # Map back to global offsets
-            global_start = window_start + ent["start"]
-            global_end = window_start + ent["end"]
-            ent_text = text[global_start:global_end]
-
-            # Trim leading/trailing whitespace from entity boundaries
-            stripped = ent_text.lstrip()
-            if len(stripped) < len(ent_text):
-                global_start += len(ent_text) - len(stripped)
-            ent_text = stripped
-            stripped = ent_text.rstrip()
-            if len(stripped) < len(ent_text):
-                global_end -= len(ent_text) - len(stripped)
-            ent_text = stripped
-
-            if not ent_text:
-                continue
 
-            # Deduplicate entities from overlapping windows
-            span_key = (global_start, global_end, label)
-            if span_key in seen_spans:
-                continue
-            seen_spans.add(span_key)
-
-            entities.append(
-                DetectedEntity(
-                    entity_type=entity_type,
-                    text=ent_text,
-                    start=global_start,
-                    end=global_end,
-                    confidence=score,
-                    source="ner",
-                )
-            )
+def evict_ner(model_name: str | None = None) -> int:
+    """Close and forget the default engines of ``model_name`` (all of them when None).
 
-    return entities
+    Returns the number of engines closed; the next detection loads them again.
+    """
+    with _load_lock:
+        keys = [key for key in _default_engines if model_name is None or key[0] == model_name]
+        for key in keys:
+            _default_engines.pop(key).close()
+        return len(keys)
+
+
+def unload_ner() -> None:
+    """Close and forget the default engines; the next detection loads them again."""
+    evict_ner()
+
+
+def _route_by_language(texts: list[str], model_name: str, language_models: dict[str, str]) -> dict[str, list[int]]:
+    """Group document indices by the model configured for their language (``model_name`` otherwise)."""
+    routes: dict[str, list[int]] = {}
+    for i, text in enumerate(texts):
+        routes.setdefault(language_models.get(detect_language(text), model_name), []).append(i)
+    return routes
+
+
+def detect_ner_batch(
+    texts: list[str],
+    options: NerOptions | None = None,
+    *,
+    boundaries: list[list[int]] | None = None,
+    engine: NerEngine | None = None,
+    draft_engine: NerEngine | None = None,
+) -> list[list[DetectedEntity]]:
+    """Detect named entities in several documents; returns one entity list per text.
+
+    Runs ``engine`` if given, otherwise the process-wide engine for the model,
+    session settings, precision and session pool size of ``options``, loaded on
+    first use. With ``options.language_models``, each document is routed to the
+    model for its detected language. Default engines are kept loaded up to
+    ``options.max_loaded_mb`` of weights, least recently used first out. With a draft
+    model (``options.draft_model`` or ``draft_engine``), a small first-stage model
+    screens every window and only uncertain ones reach the full model.
+    ``boundaries`` gives, per text, the character offsets where a window may end
+    (see ``DocumentContent.boundaries``). See ``NerEngine.detect`` for the windowing,
+    batching, cache and cascade options.
+    """
+    if options is None:
+        options = NerOptions()
+    if engine is None and not any(text.strip() for text in texts):
+        return [[] for _ in texts]
+    if engine is None and options.language_models:
+        routes = _route_by_language(texts, options.model_name, options.language_models)
+    else:
+        routes = {options.model_name: list(range(len(texts)))}
+
+    results: list[list[DetectedEntity]] = [[] for _ in texts]
+    for routed_model, indices in routes.items():
+        routed_engine = engine or _get_engine(routed_model, options, keep=(draft_engine,))
+        if draft_engine is None and options.draft_model is not None:
+            draft_engine = _get_engine(options.draft_model, options, keep=(routed_engine,))
+        detected = routed_engine.detect(
+            [texts[i] for i in indices],
+            options,
+            draft=draft_engine,
+            boundaries=[boundaries[i] for i in indices] if boundaries is not None else None,
+        )
+        for i, entities in zip(indices, detected, strict=True):
+            results[i] = entities
+    return results
+
+
+def warm_up_ner(options: NerOptions | None = None, inference: bool = True) -> None:
+    """Load the default NER engine (and the cascade's draft engine) ahead of the first detection.
+
+    With ``inference=True`` a dummy full-size batch is also run, so ONNX Runtime
+    allocates its buffers and the first real batch runs at full speed. Models for
+    other languages are loaded on first use.
+    """
+    if options is None:
+        options = NerOptions()
+    engines = [_get_engine(options.model_name, options)]
+    if options.draft_model is not None:
+        engines.append(_get_engine(options.draft_model, options, keep=(engines[0],)))
+    if inference:
+        for engine in engines:
+            engine.warm_up(options.batch_size, options.max_length)
+
+
+def detect_ner(
+    text: str,
+    options: NerOptions | None = None,
+    *,
+    boundaries: list[int] | None = None,
+    engine: NerEngine | None = None,
+    draft_engine: NerEngine | None = None,
+) -> list[DetectedEntity]:
+    """Detect named entities using CamemBERT NER with sliding window.
+
+    See ``detect_ner_batch`` for the engine, language routing, windowing, batching and
+    cascade options.
+    """
+    if not text.strip():
+        return []
+
+    return detect_ner_batch(
+        [text],
+        options,
+        boundaries=[boundaries] if boundaries is not None else None,
+        engine=engine,
+        draft_engine=draft_engine,
+    )[0]
@@ -0,0 +1,399 @@
+import contextlib
+import hashlib
+import logging
+import os
+import shutil
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+
+# Files making up a model, as named on the HuggingFace hub and in a local model directory
+MODEL_FILES = ("model.onnx", "config.json", "sentencepiece.bpe.model")
+# Weights of a fetched model, stored next to model.onnx and memory-mapped by ONNX Runtime
+EXTERNAL_DATA_FILE = "model.onnx.data"
+
+# Highest level whose optimized graph is cached on disk. "all" adds layout transforms
+# (NCHWc...) specific to the CPU that ran them, and model directories are copied between
+# machines; those passes run again at each startup on top of the cached graph.
+_PORTABLE_OPTIMIZATION = "extended"
+
+_EXECUTION_MODES = {
+    "sequential": "ORT_SEQUENTIAL",
+    "parallel": "ORT_PARALLEL",
+}
+
+
+@dataclass(frozen=True)
+class SessionSettings:
+    """ONNX Runtime session knobs for the NER model (hashable, so it can key model caches)."""
+
+    # 0 lets ONNX Runtime pick (one thread per physical core)
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+    graph_optimization: str = "all"
+    execution_mode: str = "sequential"
+    cpu_mem_arena: bool = True
+    # Serialize the optimized graph next to the model and load it directly on later runs
+    cache_optimized_model: bool = True
+
+    def __post_init__(self) -> None:
+        if self.graph_optimization not in _GRAPH_OPTIMIZATION_LEVELS:
+            raise ValueError(
+                f"Unknown graph optimization level: {self.graph_optimization!r} "
+                f"(expected one of {', '.join(_GRAPH_OPTIMIZATION_LEVELS)})"
+            )
+        if self.execution_mode not in _EXECUTION_MODES:
+            raise ValueError(
+                f"Unknown execution mode: {self.execution_mode!r} (expected one of {', '.join(_EXECUTION_MODES)})"
+            )
+
+
+def _atomic_write(target: Path, write: Callable[[Path], None]) -> None:
+    """Create ``target`` with ``write(path)``, then move it into place.
+
+    ``write`` runs in a private directory next to ``target`` so a concurrent run never
+    loads a partial model. Files it writes next to ``path`` (external weights) are moved
+    too, before ``target`` itself, so the model never appears without its weights.
+    """
+    tmp_dir = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    tmp_dir.mkdir(exist_ok=True)
+    try:
+        write(tmp_dir / target.name)
+        for path in sorted(tmp_dir.iterdir(), key=lambda p: p.name == target.name):
+            os.replace(path, target.with_name(path.name))
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def resolve_model_files(model_name: str) -> tuple[str, str, str]:
+    """Return local paths to (model.onnx, config.json, sentencepiece.bpe.model).
+
+    ``model_name`` is either a local directory filled by ``fetch_model``, read with no
+    network access at all, or a HuggingFace model id. Hub files already in the local
+    HuggingFace cache are used as-is; only missing files are downloaded.
+    """
+    local_dir = Path(model_name).expanduser()
+    if local_dir.is_dir():
+        missing = [name for name in MODEL_FILES if not (local_dir / name).exists()]
+        if missing:
+            raise FileNotFoundError(
+                f"Model directory {local_dir} is missing {', '.join(missing)} (fill it with 'caviardeur model fetch')"
+            )
+        model_path, config_path, spm_path = (str(local_dir / name) for name in MODEL_FILES)
+        return model_path, config_path, spm_path
+
+    from huggingface_hub import hf_hub_download
+    from huggingface_hub.errors import LocalEntryNotFoundError
+
+    try:
+        # No metadata round-trip to the hub when everything is cached already
+        model_path, config_path, spm_path = (
+            hf_hub_download(repo_id=model_name, filename=name, local_files_only=True) for name in MODEL_FILES
+        )
+    except LocalEntryNotFoundError:
+        model_path, config_path, spm_path = (hf_hub_download(repo_id=model_name, filename=name) for name in MODEL_FILES)
+    return model_path, config_path, spm_path
+
+
+def fetch_model(model_name: str, target_dir: str | Path, force: bool = False) -> Path:
+    """Download a HuggingFace NER model once into ``target_dir`` for offline use.
+
+    The weights are stored as ONNX external data (``model.onnx.data``), which ONNX
+    Runtime memory-maps, so several processes share the same pages. The variant with
+    label/score outputs is prepared as well, so later runs only read the directory.
+    """
+    import onnx
+
+    target_dir = Path(target_dir)
+    target = target_dir / MODEL_FILES[0]
+    if target.exists() and not force:
+        return target_dir
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+    model_path, config_path, spm_path = resolve_model_files(model_name)
+    shutil.copyfile(config_path, target_dir / MODEL_FILES[1])
+    shutil.copyfile(spm_path, target_dir / MODEL_FILES[2])
+
+    logger.info("Writing NER model to %s...", target_dir)
+    data_path = target_dir / EXTERNAL_DATA_FILE
+    with contextlib.suppress(FileNotFoundError):
+        data_path.unlink()
+    # Derived copies (INT8, label outputs, optimized graphs) belong to the previous weights
+    for stale in target_dir.glob(f"{target.stem}.*.onnx*"):
+        stale.unlink()
+    _atomic_write(
+        target,
+        lambda path: onnx.save_model(
+            onnx.load(model_path), str(path), save_as_external_data=True, location=EXTERNAL_DATA_FILE
+        ),
+    )
+
+    add_prediction_outputs(target)
+    return target_dir
+
+
+def quantized_model_path(model_path: str | Path) -> Path:
+    """Location of the INT8 copy of a model file (stored next to it)."""
+    model_path = Path(model_path)
+    return model_path.with_name(f"{model_path.stem}.int8.onnx")
+
+
+def quantize_model(model_path: str | Path, force: bool = False) -> Path:
+    """Create (or reuse) an INT8 dynamically quantized copy of an FP32 ONNX model.
+
+    Weights of MatMul/Gather nodes are stored as int8 and activations are quantized
+    on the fly, which cuts model size by ~4x and speeds up CPU inference.
+    """
+    target = quantized_model_path(model_path)
+    if target.exists() and not force:
+        return target
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    logger.info("Quantizing NER model to INT8 (one-time)...")
+    _atomic_write(target, lambda path: quantize_dynamic(str(model_path), str(path), weight_type=QuantType.QInt8))
+    logger.info("INT8 model written to %s", target)
+    return target
+
+
+# Outputs added by add_prediction_outputs: arg-max label id and its softmax probability per token
+PREDICTION_OUTPUTS = ("pred_labels", "pred_scores")
+
+
+def model_size(model_path: str | Path) -> int:
+    """Size of a model file, including weights stored as external data (local model directories).
+
+    The FP32 graph and its derived copies (``model.labels.onnx``...) read their weights
+    from ``model.onnx.data``; INT8 copies are self-contained.
+    """
+    model_path = Path(model_path)
+    size = model_path.stat().st_size
+    data_path = model_path.with_name(EXTERNAL_DATA_FILE)
+    if model_path.name.startswith("model.") and ".int8." not in model_path.name and data_path.exists():
+        size += data_path.stat().st_size
+    return size
+
+
+def model_fingerprint(*paths: str | Path) -> str:
+    """Short digest of the size and modification time of model files.
+
+    The external weights file next to a graph counts too, so re-fetching a model into
+    the same directory changes the fingerprint even if ``model.onnx`` keeps its size.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        files = [Path(path)]
+        data_path = files[0].with_name(EXTERNAL_DATA_FILE)
+        if files[0].name == MODEL_FILES[0] and data_path.exists():
+            files.append(data_path)
+        for file in files:
+            stat = file.stat()
+            digest.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+
+def prediction_model_path(model_path: str | Path) -> Path:
+    """Location of the copy of a model file with label/score outputs (stored next to it)."""
+    model_path = Path(model_path)
+    return model_path.with_name(f"{model_path.stem}.labels.onnx")
+
+
+def add_prediction_outputs(model_path: str | Path) -> Path:
+    """Create (or reuse) a copy of a token-classification model that returns predictions.
+
+    Softmax, ArgMax and ReduceMax nodes are appended after the logits, and the
+    graph outputs become ``pred_labels`` (int64) and ``pred_scores`` (float32),
+    both ``[batch, seq_len]``. The session then never copies out the full logits
+    tensor, and ONNX Runtime can fuse the extra work with the classifier head.
+    """
+    target = prediction_model_path(model_path)
+    if target.exists():
+        return target
+
+    import onnx
+    from onnx import TensorProto, helper
+
+    # External weights stay where they are: the new file references them by location
+    model = onnx.load(str(model_path), load_external_data=False)
+    graph = model.graph
+    logits = graph.output[0].name
+    opset = next((o.version for o in model.opset_import if o.domain in ("", "ai.onnx")), 13)
+
+    labels_name, scores_name = PREDICTION_OUTPUTS
+    probs = "caviardeur_probs"
+    graph.node.append(helper.make_node("Softmax", [logits], [probs], axis=-1))
+    graph.node.append(helper.make_node("ArgMax", [probs], [labels_name], axis=-1, keepdims=0))
+    if opset >= 18:
+        # ReduceMax takes its axes as an input from opset 18 on
+        axes = "caviardeur_last_axis"
+        graph.initializer.append(helper.make_tensor(axes, TensorProto.INT64, [1], [-1]))
+        graph.node.append(helper.make_node("ReduceMax", [probs, axes], [scores_name], keepdims=0))
+    else:
+        graph.node.append(helper.make_node("ReduceMax", [probs], [scores_name], axes=[-1], keepdims=0))
+
+    del graph.output[:]
+    graph.output.extend(
+        [
+            helper.make_tensor_value_info(labels_name, TensorProto.INT64, ["batch", "sequence"]),
+            helper.make_tensor_value_info(scores_name, TensorProto.FLOAT, ["batch", "sequence"]),
+        ]
+    )
+
+    _atomic_write(target, lambda path: onnx.save(model, str(path)))
+    logger.debug("NER model with prediction outputs written to %s", target)
+    return target
+
+
+def _portable_settings(settings: SessionSettings) -> SessionSettings:
+    """Settings the cached optimized graph is produced with: at most the portable level."""
+    levels = list(_GRAPH_OPTIMIZATION_LEVELS)
+    level = min(settings.graph_optimization, _PORTABLE_OPTIMIZATION, key=levels.index)
+    return replace(settings, graph_optimization=level)
+
+
+def optimized_model_path(model_path: str | Path, settings: SessionSettings) -> Path:
+    """Location of the cached optimized graph for a model file.
+
+    The name encodes the ONNX Runtime version and optimization level, since an
+    optimized graph is only valid for the runtime that produced it. Levels above
+    "extended" share the "extended" graph, which does not depend on the CPU.
+    """
+    import onnxruntime as ort
+
+    model_path = Path(model_path)
+    level = _portable_settings(settings).graph_optimization
+    return model_path.with_name(f"{model_path.stem}.ort-{ort.__version__}.{level}.onnx")
+
+
+def _session_options(settings: SessionSettings, initializers: dict | None = None):
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = settings.intra_op_threads
+    options.inter_op_num_threads = settings.inter_op_threads
+    options.execution_mode = getattr(ort.ExecutionMode, _EXECUTION_MODES[settings.execution_mode])
+    options.graph_optimization_level = getattr(
+        ort.GraphOptimizationLevel, _GRAPH_OPTIMIZATION_LEVELS[settings.graph_optimization]
+    )
+    options.enable_cpu_mem_arena = settings.cpu_mem_arena
+    if initializers:
+        # Prepacked weights would be private copies per session; keep the shared ones only
+        options.add_session_config_entry("session.disable_prepacking", "1")
+        for name, value in initializers.items():
+            options.add_initializer(name, value)
+    return options
+
+
+def _cache_optimized_graph(model_path: Path, cached: Path, options):
+    """Create a session with ``options`` that also writes its optimized graph to ``cached``.
+
+    Returns the session. Failing to write the cache is not an error.
+    """
+    import onnxruntime as ort
+
+    session = None
+
+    def _write(path: Path) -> None:
+        nonlocal session
+        # Weights go to a separate data file so the cached graph is memory-mapped on load too
+        options.optimized_model_filepath = str(path)
+        options.add_session_config_entry(
+            "session.optimized_model_external_initializers_file_name", f"{cached.name}.data"
+        )
+        session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+
+    try:
+        _atomic_write(cached, _write)
+        logger.debug("Cached optimized NER graph at %s", cached)
+    except OSError:
+        if session is None:
+            raise
+        logger.debug("Could not cache optimized NER graph at %s", cached, exc_info=True)
+    return session
+
+
+def build_session(model_path: str | Path, settings: SessionSettings | None = None, initializers: dict | None = None):
+    """Create a CPU InferenceSession, reusing or writing the cached optimized graph.
+
+    ``initializers`` maps initializer names to OrtValues that replace the weights
+    stored in the model file, so several sessions can run over one copy of them.
+    """
+    import onnxruntime as ort
+
+    if settings is None:
+        settings = SessionSettings()
+    model_path = Path(model_path)
+
+    if not settings.cache_optimized_model or settings.graph_optimization == "disable":
+        return ort.InferenceSession(
+            str(model_path), _session_options(settings, initializers), providers=["CPUExecutionProvider"]
+        )
+
+    cached = optimized_model_path(model_path, settings)
+    portable = _portable_settings(settings)
+    if not cached.exists():
+        session = _cache_optimized_graph(model_path, cached, _session_options(portable, initializers))
+        if portable == settings:
+            return session
+        if not cached.exists():
+            return ort.InferenceSession(
+                str(model_path), _session_options(settings, initializers), providers=["CPUExecutionProvider"]
+            )
+
+    logger.debug("Loading optimized NER graph from %s", cached)
+    options = _session_options(settings, initializers)
+    if portable == settings:
+        # The cached graph is already optimized; skip the optimizer passes at startup
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    return ort.InferenceSession(str(cached), options, providers=["CPUExecutionProvider"])
+
+
+def _load_initializers(model_path: str | Path) -> dict:
+    """Read every initializer of a model file into an OrtValue (one copy, shared by sessions)."""
+    import onnx
+    import onnxruntime as ort
+    from onnx import numpy_helper
+
+    model = onnx.load(str(model_path))
+    return {
+        init.name: ort.OrtValue.ortvalue_from_numpy(numpy_helper.to_array(init)) for init in model.graph.initializer
+    }
+
+
+def build_session_pool(model_path: str | Path, settings: SessionSettings | None = None, size: int = 1):
+    """Create ``size`` sessions over a single in-memory copy of the model weights.
+
+    Returns ``(sessions, shared_initializers)``; the second item must be kept alive
+    as long as the sessions. With ``intra_op_threads=0``, each session gets an equal
+    share of the CPU cores instead of one thread per core, so the sessions can run
+    windows in parallel without oversubscribing the machine.
+    """
+    if settings is None:
+        settings = SessionSettings()
+    if size <= 1:
+        return [build_session(model_path, settings)], {}
+
+    if settings.intra_op_threads == 0:
+        settings = replace(settings, intra_op_threads=max(1, (os.cpu_count() or 1) // size))
+
+    # Share the weights of the graph the sessions actually load: the optimized one when cached
+    source = Path(model_path)
+    if settings.cache_optimized_model and settings.graph_optimization != "disable":
+        cached = optimized_model_path(model_path, settings)
+        if not cached.exists():
+            build_session(model_path, settings)
+        if cached.exists():
+            source = cached
+
+    shared = _load_initializers(source)
+    logger.debug("Building %d NER sessions with %d threads each", size, settings.intra_op_threads)
+    return [build_session(model_path, settings, shared) for _ in range(size)], shared
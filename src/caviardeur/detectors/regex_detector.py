@@ -1,20 +1,43 @@
 import re
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 
 from .base import DetectedEntity, EntityType
 
 # SIRET: 14 digits, optionally space-separated in groups
-_SIRET_PATTERN = re.compile(r"\b(\d{3})\s?(\d{3})\s?(\d{3})\s?(\d{5})\b")
+_SIRET_PATTERN = r"\b\d{3}\s?\d{3}\s?\d{3}\s?\d{5}\b"
 
-# French address: street type keyword + street name, optional postal code + city
+# French address: house number + street type keyword + street name, optional postal code + city.
+# The scanner only looks for the keyword; the rest is matched in a bounded region around it.
 _STREET_TYPES = (
     r"(?:rue|avenue|boulevard|place|allée|chemin|impasse|passage|cours|quai|route"
     r"|av\.|bd\.|pl\.)"
 )
-_ADDRESS_PATTERN = re.compile(
-    rf"\b\d{{1,4}}(?:\s*(?:bis|ter))?\s*,?\s*{_STREET_TYPES}\s+[A-ZÀ-Ü][\w\s\-']{{2,50}}"
-    rf"(?:\s*,?\s*\d{{5}}\s+[A-ZÀ-Ü][\w\s\-']{{2,30}})?",
+_STREET_KEYWORD_PATTERN = rf"\b{_STREET_TYPES}(?=\s)"
+# Read backwards from the keyword: "12", "12 bis,", ...
+_HOUSE_NUMBER = re.compile(r"\b\d{1,4}(?:\s*(?:bis|ter))?\s*,?\s*\Z", re.IGNORECASE)
+_STREET_NAME = re.compile(
+    r"\s+[A-ZÀ-Ü][\w\s\-']{2,50}(?:\s*,?\s*\d{5}\s+[A-ZÀ-Ü][\w\s\-']{2,30})?",
     re.IGNORECASE,
 )
+# Characters searched before the keyword for the house number, and after it for the street
+# name and city. Bounding both keeps the cost per keyword constant whatever the text around.
+_HOUSE_NUMBER_REACH = 16
+_STREET_NAME_REACH = 128
+
+
+def _expand_address(text: str, keyword: re.Match) -> tuple[int, int] | None:
+    """Span of the address around a street type keyword, or None if it is not one."""
+    number = _HOUSE_NUMBER.search(text, max(0, keyword.start() - _HOUSE_NUMBER_REACH), keyword.start())
+    if number is None:
+        return None
+    street = _STREET_NAME.match(text, keyword.end(), keyword.end() + _STREET_NAME_REACH)
+    if street is None:
+        return None
+    return number.start(), street.end()
+
+
+_WHITESPACE = re.compile(r"\s+")
 
 
 def _luhn_check(digits: str) -> bool:
@@ -30,42 +53,170 @@ def _luhn_check(digits: str) -> bool:
     return total % 10 == 0
 
 
-def detect_siret(text: str) -> list[DetectedEntity]:
-    """Detect SIRET numbers (14 digits + Luhn checksum)."""
-    entities = []
-    for m in _SIRET_PATTERN.finditer(text):
-        digits = "".join(m.groups())
-        if len(digits) == 14 and _luhn_check(digits):
-            entities.append(
+def _luhn_check_batch(values: list[str]) -> list[bool]:
+    """Luhn check of many digit strings at once (same result as ``_luhn_check`` on each)."""
+    import numpy as np
+
+    if not values:
+        return []
+    # Left zero-padding does not change a Luhn sum
+    width = max(map(len, values))
+    padded = "".join(value.rjust(width, "0") for value in values).encode("ascii")
+    digits = np.frombuffer(padded, dtype=np.uint8).reshape(len(values), width)[:, ::-1].astype(np.int64) - 48
+    doubled = digits[:, 1::2] * 2
+    digits[:, 1::2] = np.where(doubled > 9, doubled - 9, doubled)
+    return (digits.sum(axis=1) % 10 == 0).tolist()
+
+
+def _valid_sirets(values: list[str]) -> list[bool]:
+    """SIRET candidates (spaces removed) that are 14 digits with a valid Luhn checksum."""
+    return [len(value) == 14 and ok for value, ok in zip(values, _luhn_check_batch(values), strict=True)]
+
+
+@dataclass(frozen=True)
+class RegexPattern:
+    """A PII pattern known to a ``PatternRegistry``."""
+
+    name: str
+    pattern: str
+    entity_type: EntityType
+    confidence: float
+    # Called once per scan with every candidate's normalized text; returns one keep flag per candidate
+    validator: Callable[[list[str]], list[bool]] | None = None
+    # Maps a candidate's text to the value given to the validator (e.g. strips spaces)
+    normalize: Callable[[str], str] | None = None
+    ignore_case: bool = False
+    # Turns an anchor match into the entity span (or None to drop it), for patterns that
+    # only match a keyword and read the rest of the entity around it
+    expand: Callable[[str, re.Match], tuple[int, int] | None] | None = None
+
+
+class PatternRegistry:
+    """Regex PII detectors compiled into a single scanner.
+
+    Each registered pattern becomes a named alternative of one combined regex, so a
+    scan walks the text once whatever the number of patterns. At a given position
+    alternatives are tried in registration order, and matches do not overlap.
+    Candidates are grouped per pattern and each validator runs once over its batch.
+    A pattern with ``expand`` matches an anchor (a keyword) and the expand function
+    bounds the entity around it, which keeps the scan linear for entities that a
+    single regex could only match with unbounded, backtracking-prone repetitions.
+    """
+
+    def __init__(self) -> None:
+        self._patterns: dict[str, RegexPattern] = {}
+        self._scanners: dict[frozenset[str] | None, re.Pattern] = {}
+
+    def register(
+        self,
+        name: str,
+        pattern: str,
+        entity_type: EntityType,
+        confidence: float,
+        validator: Callable[[list[str]], list[bool]] | None = None,
+        normalize: Callable[[str], str] | None = None,
+        ignore_case: bool = False,
+        expand: Callable[[str, re.Match], tuple[int, int] | None] | None = None,
+    ) -> None:
+        """Add (or replace) a pattern. ``name`` must be a valid identifier.
+
+        ``pattern`` must not contain named groups of its own.
+        """
+        if not name.isidentifier():
+            raise ValueError(f"Pattern name must be an identifier: {name!r}")
+        re.compile(pattern)
+        self._patterns[name] = RegexPattern(
+            name, pattern, entity_type, confidence, validator, normalize, ignore_case, expand
+        )
+        self._scanners.clear()
+
+    def unregister(self, name: str) -> None:
+        del self._patterns[name]
+        self._scanners.clear()
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._patterns)
+
+    def _scanner(self, names: frozenset[str] | None) -> re.Pattern:
+        scanner = self._scanners.get(names)
+        if scanner is None:
+            alternatives = [
+                f"(?P<{p.name}>{'(?i:' + p.pattern + ')' if p.ignore_case else p.pattern})"
+                for p in self._patterns.values()
+                if names is None or p.name in names
+            ]
+            # A pattern that never matches when nothing is selected
+            scanner = self._scanners[names] = re.compile("|".join(alternatives) or r"(?!)")
+        return scanner
+
+    def scan(self, text: str, names: Iterable[str] | None = None) -> list[DetectedEntity]:
+        """Detect every registered pattern (or only ``names``) in one pass over ``text``."""
+        selected = frozenset(names) if names is not None else None
+        candidates: dict[str, list[re.Match]] = {}
+        for m in self._scanner(selected).finditer(text):
+            candidates.setdefault(m.lastgroup or "", []).append(m)
+
+        entities: list[DetectedEntity] = []
+        for name, matches in candidates.items():
+            spec = self._patterns[name]
+            spans = [m.span() for m in matches]
+            if spec.expand is not None:
+                spans = []
+                for m in matches:
+                    span = spec.expand(text, m)
+                    # Like finditer, an entity does not start inside the previous one
+                    if span is not None and (not spans or span[0] >= spans[-1][1]):
+                        spans.append(span)
+            if spec.validator is not None:
+                values = [text[start:end] for start, end in spans]
+                if spec.normalize is not None:
+                    values = [spec.normalize(value) for value in values]
+                spans = [span for span, ok in zip(spans, spec.validator(values), strict=True) if ok]
+            entities.extend(
                 DetectedEntity(
-                    entity_type=EntityType.SIRET,
-                    text=m.group(),
-                    start=m.start(),
-                    end=m.end(),
-                    confidence=0.95,
+                    entity_type=spec.entity_type,
+                    text=text[start:end],
+                    start=start,
+                    end=end,
+                    confidence=spec.confidence,
                     source="regex",
                 )
+                for start, end in spans
             )
-    return entities
+        entities.sort(key=lambda e: e.start)
+        return entities
+
+
+registry = PatternRegistry()
+registry.register(
+    "siret",
+    _SIRET_PATTERN,
+    EntityType.SIRET,
+    0.95,
+    validator=_valid_sirets,
+    normalize=lambda value: _WHITESPACE.sub("", value),
+)
+registry.register(
+    "address",
+    _STREET_KEYWORD_PATTERN,
+    EntityType.ADDRESS,
+    0.75,
+    ignore_case=True,
+    expand=_expand_address,
+)
+
+
+def detect_siret(text: str) -> list[DetectedEntity]:
+    """Detect SIRET numbers (14 digits + Luhn checksum)."""
+    return registry.scan(text, ("siret",))
 
 
 def detect_addresses(text: str) -> list[DetectedEntity]:
-    """Detect French addresses using regex patterns."""
-    entities = []
-    for m in _ADDRESS_PATTERN.finditer(text):
-        entities.append(
-            DetectedEntity(
-                entity_type=EntityType.ADDRESS,
-                text=m.group(),
-                start=m.start(),
-                end=m.end(),
-                confidence=0.75,
-                source="regex",
-            )
-        )
-    return entities
+    """Detect French addresses: street type keywords, with the number and street name around them."""
+    return registry.scan(text, ("address",))
 
 
 def detect_regex(text: str) -> list[DetectedEntity]:
-    """Run all regex-based detectors."""
-    return detect_siret(text) + detect_addresses(text)
+    """Run all regex-based detectors in a single pass over the text."""
+    return registry.scan(text)
@@ -1,4 +1,7 @@
 import logging
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from pathlib import Path
 
 from rich.console import Console
@@ -6,7 +9,9 @@ from rich.table import Table
 
 from .config import Config
 from .detectors.base import DetectedEntity
-from .detectors.composite import detect_all
+from .detectors.composite import detect_all, detect_all_batch
+from .detectors.ner_detector import NerOptions, warm_up_ner
+from .detectors.ner_model import SessionSettings
 from .pseudonymizer.engine import pseudonymize
 from .pseudonymizer.mapping import MappingStore
 from .readers.base import DocumentContent
@@ -68,51 +73,108 @@ def _display_detections(file_name: str, entities: list[DetectedEntity], console:
     console.print(table)
 
 
-def process_file(
-    file_path: Path,
-    config: Config,
-    mapping: MappingStore,
-    *,
-    console: Console | None = None,
-) -> list[DetectedEntity]:
-    """Process a single file through the full pipeline.
+@dataclass
+class FileResult:
+    """Outcome of processing one file with ``process_files``."""
 
-    Returns the list of detected entities.
-    """
-    if console is None:
-        console = Console()
+    path: Path
+    entities: list[DetectedEntity] = field(default_factory=list)
+    # Set when reading, detection or writing failed for this file
+    error: Exception | None = None
 
-    logger.info("Reading: %s", file_path.name)
 
-    # 1. Read
-    content = read_document(file_path)
-    if content is None:
-        return []
+def _session_settings(config: Config) -> SessionSettings:
+    return SessionSettings(
+        intra_op_threads=config.ner_intra_op_threads,
+        inter_op_threads=config.ner_inter_op_threads,
+        graph_optimization=config.ner_graph_optimization,
+        execution_mode=config.ner_execution_mode,
+        cpu_mem_arena=config.ner_cpu_mem_arena,
+        cache_optimized_model=config.ner_cache_optimized_model,
+    )
 
-    raw_text = content.raw_text
-    if not raw_text.strip():
-        logger.info("  No text content in %s, skipping.", file_path.name)
-        return []
 
-    # 2. Detect
-    entities = detect_all(
-        raw_text,
+def _ner_options(config: Config) -> NerOptions:
+    """NER options taken from the config, passed unchanged to every detection."""
+    return NerOptions(
         model_name=config.ner_model,
         confidence_threshold=config.confidence_threshold,
+        window_mode=config.sliding_window_mode,
         window_size=config.sliding_window_size,
         window_overlap=config.sliding_window_overlap,
+        token_overlap=config.sliding_window_token_overlap,
+        batch_size=config.ner_batch_size,
+        session_settings=_session_settings(config),
+        quantized=config.ner_quantized,
+        num_sessions=config.ner_sessions,
+        cache_path=config.ner_cache_path,
+        cache_max_mb=config.ner_cache_max_mb,
+        prefilter=config.ner_prefilter,
+        min_letter_ratio=config.ner_prefilter_min_letter_ratio,
+        draft_model=config.ner_draft_model,
+        escalation_threshold=config.ner_escalation_threshold,
+        language_models=config.ner_language_models,
+        max_loaded_mb=config.ner_max_loaded_mb,
     )
 
-    # 3. Display detections
+
+def start_warm_up(config: Config) -> threading.Thread | None:
+    """Start loading the NER model in a background thread, per ``config.ner_warm_up``.
+
+    ``"load"`` builds the session and tokenizer, ``"infer"`` also runs a dummy batch,
+    ``"none"`` disables the warm-up (returns None). File discovery and reading can
+    proceed meanwhile; the first detection waits for the load instead of repeating it.
+    """
+    if config.ner_warm_up not in ("none", "load", "infer"):
+        raise ValueError(f"Unknown warm-up mode: {config.ner_warm_up!r} (expected 'none', 'load' or 'infer')")
+    if config.ner_warm_up == "none":
+        return None
+
+    def _warm_up() -> None:
+        try:
+            warm_up_ner(_ner_options(config), inference=config.ner_warm_up == "infer")
+        except Exception:
+            # Detection loads the model again and reports the error where it matters
+            logger.debug("NER warm-up failed", exc_info=True)
+
+    thread = threading.Thread(target=_warm_up, name="caviardeur-ner-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def _read_for_detection(file_path: Path) -> DocumentContent | None:
+    """Read a file; returns None when it is unsupported or has no text to scan."""
+    logger.info("Reading: %s", file_path.name)
+
+    content = read_document(file_path)
+    if content is None:
+        return None
+
+    if not content.raw_text.strip():
+        logger.info("  No text content in %s, skipping.", file_path.name)
+        return None
+
+    return content
+
+
+def _finish_file(
+    file_path: Path,
+    content: DocumentContent,
+    entities: list[DetectedEntity],
+    config: Config,
+    mapping: MappingStore,
+    console: Console,
+) -> None:
+    """Display detections, then pseudonymize and write the document."""
     _display_detections(file_path.name, entities, console)
 
     if config.dry_run or not entities:
-        return entities
+        return
 
-    # 4. Pseudonymize
     anonymized = pseudonymize(content, entities, mapping)
+    # A document is only written once the pseudonyms it uses are stored
+    mapping.commit()
 
-    # 5. Write
     source_path = Path(content.metadata["source_path"])
     output_name = file_path.name
     # xls -> xlsx conversion
@@ -123,4 +185,116 @@ def process_file(
     _write_document(anonymized, output_path, source_path)
     logger.info("  Written: %s", output_path)
 
+
+def process_file(
+    file_path: Path,
+    config: Config,
+    mapping: MappingStore,
+    *,
+    console: Console | None = None,
+) -> list[DetectedEntity]:
+    """Process a single file through the full pipeline.
+
+    Returns the list of detected entities.
+    """
+    if console is None:
+        console = Console()
+
+    content = _read_for_detection(file_path)
+    if content is None:
+        return []
+
+    entities = detect_all(content.raw_text, _ner_options(config), boundaries=content.boundaries())
+    _finish_file(file_path, content, entities, config, mapping, console)
     return entities
+
+
+def _detect_group(
+    texts: list[str], boundaries: list[list[int]], options: NerOptions
+) -> list[list[DetectedEntity] | Exception]:
+    """Detect entities for a group of documents with shared NER batches.
+
+    If the batched call fails, documents are retried one by one so a single bad
+    document only fails itself.
+    """
+    results: list[list[DetectedEntity] | Exception] = []
+    try:
+        results.extend(detect_all_batch(texts, options, boundaries=boundaries))
+        return results
+    except Exception:
+        logger.debug("Batched detection failed, retrying documents one by one", exc_info=True)
+
+    results.clear()
+    for text, text_boundaries in zip(texts, boundaries, strict=True):
+        try:
+            results.append(detect_all(text, options, boundaries=text_boundaries))
+        except Exception as exc:
+            results.append(exc)
+    return results
+
+
+def process_files(
+    file_paths: Iterable[Path],
+    config: Config,
+    mapping: MappingStore,
+    *,
+    console: Console | None = None,
+) -> Iterator[FileResult]:
+    """Process many files, batching NER inference across documents.
+
+    Files are read into groups of up to ``config.scheduler_max_documents`` documents
+    or ``config.scheduler_max_chars`` characters. Each group's NER windows are
+    scheduled together (length-bucketed across documents), then every document is
+    pseudonymized and written in input order, so pseudonym numbering matches a
+    file-by-file run. Yields one FileResult per file, in input order.
+    """
+    if console is None:
+        console = Console()
+    options = _ner_options(config)
+
+    # (path, content or None for skipped files, raw text, read error)
+    pending: list[tuple[Path, DocumentContent | None, str, Exception | None]] = []
+    pending_chars = 0
+
+    def _flush() -> Iterator[FileResult]:
+        texts = [text for _, content, text, _ in pending if content is not None]
+        boundaries = [content.boundaries() for _, content, _, _ in pending if content is not None]
+        detections = iter(_detect_group(texts, boundaries, options) if texts else [])
+
+        for path, content, _, error in pending:
+            if error is not None:
+                yield FileResult(path, error=error)
+                continue
+            if content is None:
+                yield FileResult(path)
+                continue
+
+            entities = next(detections)
+            if isinstance(entities, Exception):
+                yield FileResult(path, error=entities)
+                continue
+            try:
+                _finish_file(path, content, entities, config, mapping, console)
+            except Exception as exc:
+                yield FileResult(path, entities=entities, error=exc)
+                continue
+            yield FileResult(path, entities=entities)
+
+    for file_path in file_paths:
+        try:
+            content = _read_for_detection(file_path)
+        except Exception as exc:
+            pending.append((file_path, None, "", exc))
+            continue
+
+        text = content.raw_text if content is not None else ""
+        pending.append((file_path, content, text, None))
+        pending_chars += len(text)
+
+        if len(pending) >= config.scheduler_max_documents or pending_chars >= config.scheduler_max_chars:
+            yield from _flush()
+            pending.clear()
+            pending_chars = 0
+
+    if pending:
+        yield from _flush()
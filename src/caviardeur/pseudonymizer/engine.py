@@ -3,27 +3,19 @@ from ..readers.base import DocumentContent, TextChunk
 from .mapping import MappingStore
 
 
-def _find_chunk_for_offset(chunks: list[TextChunk], global_start: int, global_end: int) -> list[tuple[int, int, int]]:
-    """Map a global offset range to specific chunks and their local offsets.
-
-    Returns a list of (chunk_index, local_start, local_end) tuples.
-    An entity may span multiple chunks.
-    """
-    result = []
-    for i, chunk in enumerate(chunks):
-        chunk_start = chunk.offset
-        chunk_end = chunk.offset + len(chunk.text)
-
-        # Check for overlap between entity span and chunk span
-        overlap_start = max(global_start, chunk_start)
-        overlap_end = min(global_end, chunk_end)
-
-        if overlap_start < overlap_end:
-            local_start = overlap_start - chunk_start
-            local_end = overlap_end - chunk_start
-            result.append((i, local_start, local_end))
-
-    return result
+def _rewrite(text: str, replacements: list[tuple[int, int, str]]) -> str:
+    """Apply non-overlapping (local_start, local_end, replacement) edits to ``text`` in one join."""
+    parts: list[str] = []
+    cursor = 0
+    for local_start, local_end, replacement in sorted(replacements):
+        if local_start < cursor:
+            # Overlaps an earlier edit in this chunk; the earlier one wins
+            continue
+        parts.append(text[cursor:local_start])
+        parts.append(replacement)
+        cursor = local_end
+    parts.append(text[cursor:])
+    return "".join(parts)
 
 
 def pseudonymize(
@@ -33,50 +25,34 @@ def pseudonymize(
 ) -> DocumentContent:
     """Replace detected entities in the document content with pseudonyms.
 
-    Returns a new DocumentContent with modified chunk texts.
+    Returns a new DocumentContent. Replacements are grouped per chunk and each
+    modified chunk's text is built in a single join. Unmodified chunks keep their
+    text and location objects: the chunk itself is shared with ``content`` when
+    its offset is unchanged, otherwise only its offset is new. The indices of the
+    rewritten chunks are recorded in ``modified`` for the writers.
     """
     if not entities:
         return content
 
-    # Sort entities by start position descending so we can replace from the end
-    # without invalidating earlier offsets
-    sorted_entities = sorted(entities, key=lambda e: e.start, reverse=True)
-
-    # Build a mutable copy of chunk texts
-    chunk_texts: dict[int, str] = {}
-    for i, chunk in enumerate(content.chunks):
-        chunk_texts[i] = chunk.text
-
-    for entity in sorted_entities:
+    # Pseudonyms are created from the last entity to the first, which fixes their numbering
+    edits: dict[int, list[tuple[int, int, str]]] = {}
+    for entity in sorted(entities, key=lambda e: e.start, reverse=True):
         pseudonym = mapping.get_or_create(entity.text, entity.entity_type)
-        affected = _find_chunk_for_offset(content.chunks, entity.start, entity.end)
-
-        if len(affected) == 1:
-            # Entity is within a single chunk — simple replacement
-            idx, local_start, local_end = affected[0]
-            text = chunk_texts[idx]
-            chunk_texts[idx] = text[:local_start] + pseudonym + text[local_end:]
-
-        elif len(affected) > 1:
-            # Entity spans multiple chunks
-            # Put the full pseudonym in the first chunk, empty the rest
-            for i, (idx, local_start, local_end) in enumerate(affected):
-                text = chunk_texts[idx]
-                if i == 0:
-                    chunk_texts[idx] = text[:local_start] + pseudonym + text[local_end:]
-                else:
-                    chunk_texts[idx] = text[:local_start] + text[local_end:]
-
-    # Build new chunks with updated text
-    new_chunks = []
-    for i, chunk in enumerate(content.chunks):
-        new_chunk = TextChunk(
-            text=chunk_texts[i],
-            offset=chunk.offset,
-            location=dict(chunk.location),
-        )
-        new_chunks.append(new_chunk)
-
-    result = DocumentContent(chunks=new_chunks, metadata=dict(content.metadata))
-    result.assign_offsets()
-    return result
+        # An entity spanning several chunks puts the full pseudonym in the first one
+        # and removes its text from the others
+        for i, (idx, local_start, local_end) in enumerate(content.locate(entity.start, entity.end)):
+            edits.setdefault(idx, []).append((local_start, local_end, pseudonym if i == 0 else ""))
+
+    new_chunks: list[TextChunk] = []
+    offset = 0
+    for idx, chunk in enumerate(content.chunks):
+        if idx in edits:
+            new_chunks.append(TextChunk(text=_rewrite(chunk.text, edits[idx]), offset=offset, location=chunk.location))
+        elif chunk.offset == offset:
+            new_chunks.append(chunk)
+        else:
+            new_chunks.append(TextChunk(text=chunk.text, offset=offset, location=chunk.location))
+        offset += len(new_chunks[-1].text)
+
+    modified = set(edits) if content.modified is None else content.modified | edits.keys()
+    return DocumentContent(chunks=new_chunks, metadata=dict(content.metadata), modified=modified)
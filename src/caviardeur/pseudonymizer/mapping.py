@@ -2,6 +2,7 @@ import contextlib
 import json
 import os
 import re
+import sqlite3
 from pathlib import Path
 
 from ..detectors.base import EntityType
@@ -15,11 +16,47 @@ _PREFIX_MAP: dict[EntityType, str] = {
 }
 
 
+# Mapping paths with these suffixes are SQLite databases, others JSON files
+_DATABASE_SUFFIXES = (".sqlite", ".db")
+
+
 def _normalize(text: str) -> str:
     """Normalize text for consistent matching: collapse whitespace, strip."""
     return re.sub(r"\s+", " ", text.strip())
 
 
+def _key(real_text: str, entity_type: EntityType) -> str:
+    """Lookup key of a real value: entity type and normalized, lowercased text."""
+    return f"{entity_type.value}::{_normalize(real_text).lower()}"
+
+
+def _parse_pseudonym(pseudonym: str) -> tuple[EntityType, int] | None:
+    """Entity type and counter of a pseudonym such as ``PERSON_012``, or None if it is not one."""
+    prefix, _, counter_str = pseudonym.rpartition("_")
+    try:
+        counter = int(counter_str)
+    except ValueError:
+        return None
+    for entity_type, p in _PREFIX_MAP.items():
+        if p == prefix:
+            return entity_type, counter
+    return None
+
+
+def _write_json(mapping: dict[str, str], path: Path) -> None:
+    """Write a pseudonym -> real value mapping with restricted permissions (contains PII)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(mapping, f, ensure_ascii=False, indent=2)
+    with contextlib.suppress(OSError):
+        os.chmod(path, 0o600)
+
+
+def is_database_path(path: Path) -> bool:
+    """Whether a mapping path names a SQLite database rather than a JSON file."""
+    return path.suffix.lower() in _DATABASE_SUFFIXES
+
+
 class MappingStore:
     """Bidirectional mapping between real PII values and pseudonyms."""
 
@@ -33,43 +70,40 @@ class MappingStore:
 
     def get_or_create(self, real_text: str, entity_type: EntityType) -> str:
         """Get existing pseudonym or create a new one for the given text."""
-        normalized = _normalize(real_text)
-        key = f"{entity_type.value}::{normalized.lower()}"
+        key = _key(real_text, entity_type)
 
         if key in self._real_to_pseudo:
             return self._real_to_pseudo[key]
 
-        # Create new pseudonym
-        self._counters[entity_type] += 1
-        prefix = _PREFIX_MAP[entity_type]
-        pseudonym = f"{prefix}_{self._counters[entity_type]:03d}"
-
+        pseudonym = self._next_pseudonym(entity_type)
         self._pseudo_to_real[pseudonym] = real_text
         self._real_to_pseudo[key] = pseudonym
         return pseudonym
 
+    def _next_pseudonym(self, entity_type: EntityType) -> str:
+        """Create the next pseudonym of an entity type."""
+        self._counters[entity_type] += 1
+        return f"{_PREFIX_MAP[entity_type]}_{self._counters[entity_type]:03d}"
+
     def get_real(self, pseudonym: str) -> str | None:
         """Look up the real value for a pseudonym."""
         return self._pseudo_to_real.get(pseudonym)
 
     def get_pseudonym(self, real_text: str, entity_type: EntityType) -> str | None:
         """Look up an existing pseudonym for a real value."""
-        normalized = _normalize(real_text)
-        key = f"{entity_type.value}::{normalized.lower()}"
-        return self._real_to_pseudo.get(key)
+        return self._real_to_pseudo.get(_key(real_text, entity_type))
 
     @property
     def mapping(self) -> dict[str, str]:
         """Return the pseudonym -> real value mapping."""
         return dict(self._pseudo_to_real)
 
+    def commit(self) -> None:
+        """Persist the pseudonyms created so far (nothing to do for an in-memory mapping)."""
+
     def save(self, path: Path) -> None:
         """Save mapping to a JSON file with restricted permissions (contains PII)."""
-        path.parent.mkdir(parents=True, exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self._pseudo_to_real, f, ensure_ascii=False, indent=2)
-        with contextlib.suppress(OSError):
-            os.chmod(path, 0o600)
+        _write_json(self._pseudo_to_real, path)
 
     @classmethod
     def load(cls, path: Path) -> "MappingStore":
@@ -79,32 +113,136 @@ class MappingStore:
             data: dict[str, str] = json.load(f)
 
         for pseudonym, real_value in data.items():
-            # Parse the pseudonym to extract entity type and counter
-            parts = pseudonym.rsplit("_", 1)
-            if len(parts) != 2:
+            parsed = _parse_pseudonym(pseudonym)
+            if parsed is None:
                 continue
+            entity_type, counter = parsed
+
+            store._pseudo_to_real[pseudonym] = real_value
+            store._real_to_pseudo[_key(real_value, entity_type)] = pseudonym
+            store._counters[entity_type] = max(store._counters[entity_type], counter)
+
+        return store
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pseudonyms (
+    pseudonym TEXT PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    real_value TEXT NOT NULL,
+    entity_type TEXT NOT NULL,
+    counter INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pseudonyms_counter ON pseudonyms (entity_type, counter);
+"""
+
+
+class SqliteMappingStore(MappingStore):
+    """Mapping kept in a SQLite database instead of memory.
+
+    Lookups by normalized value and by pseudonym go through the table's indexes, so
+    opening a mapping of millions of entries reads only the last counter of each
+    entity type. New pseudonyms are appended in a transaction that ``commit`` ends;
+    the pipeline commits before writing each document, so a document is never
+    written with pseudonyms that the database does not hold.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        with contextlib.suppress(OSError):
+            os.chmod(path, 0o600)
+        self._load_counters()
+
+    def _load_counters(self) -> None:
+        rows = self._conn.execute("SELECT entity_type, MAX(counter) FROM pseudonyms GROUP BY entity_type")
+        for entity_type, counter in rows:
+            self._counters[EntityType(entity_type)] = counter
+
+    def get_or_create(self, real_text: str, entity_type: EntityType) -> str:
+        """Get existing pseudonym or create a new one for the given text."""
+        key = _key(real_text, entity_type)
+        row = self._conn.execute("SELECT pseudonym FROM pseudonyms WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            return row[0]
+
+        pseudonym = self._next_pseudonym(entity_type)
+        self._conn.execute(
+            "INSERT INTO pseudonyms VALUES (?, ?, ?, ?, ?)",
+            (pseudonym, key, real_text, entity_type.value, self._counters[entity_type]),
+        )
+        return pseudonym
 
-            prefix, counter_str = parts
+    def get_real(self, pseudonym: str) -> str | None:
+        """Look up the real value for a pseudonym."""
+        row = self._conn.execute("SELECT real_value FROM pseudonyms WHERE pseudonym = ?", (pseudonym,)).fetchone()
+        return row[0] if row is not None else None
+
+    def get_pseudonym(self, real_text: str, entity_type: EntityType) -> str | None:
+        """Look up an existing pseudonym for a real value."""
+        key = _key(real_text, entity_type)
+        row = self._conn.execute("SELECT pseudonym FROM pseudonyms WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    @property
+    def mapping(self) -> dict[str, str]:
+        """Return the pseudonym -> real value mapping, in creation order."""
+        return dict(self._conn.execute("SELECT pseudonym, real_value FROM pseudonyms ORDER BY rowid"))
+
+    def commit(self) -> None:
+        """Persist the pseudonyms created since the last commit."""
+        self._conn.commit()
+
+    def save(self, path: Path) -> None:
+        """Commit, then export to ``path`` unless it is this database."""
+        self.commit()
+        if path.resolve() == self.path.resolve():
+            return
+        if is_database_path(path):
+            target = sqlite3.connect(path)
             try:
-                counter = int(counter_str)
-            except ValueError:
-                continue
+                self._conn.backup(target)
+            finally:
+                target.close()
+            with contextlib.suppress(OSError):
+                os.chmod(path, 0o600)
+        else:
+            self.export_json(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SqliteMappingStore":
+        """Open a mapping database (created if missing)."""
+        return cls(path)
 
-            # Find matching entity type
-            entity_type = None
-            for et, p in _PREFIX_MAP.items():
-                if p == prefix:
-                    entity_type = et
-                    break
+    def import_json(self, path: Path) -> int:
+        """Add the entries of a ``mapping.json`` file in one transaction; returns their number.
 
-            if entity_type is None:
+        An entry replaces one with the same pseudonym or the same normalized value.
+        """
+        with open(path, encoding="utf-8") as f:
+            data: dict[str, str] = json.load(f)
+
+        rows = []
+        for pseudonym, real_value in data.items():
+            parsed = _parse_pseudonym(pseudonym)
+            if parsed is None:
                 continue
+            entity_type, counter = parsed
+            rows.append((pseudonym, _key(real_value, entity_type), real_value, entity_type.value, counter))
 
-            normalized = _normalize(real_value)
-            key = f"{entity_type.value}::{normalized.lower()}"
+        with self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO pseudonyms VALUES (?, ?, ?, ?, ?)", rows)
+        self._load_counters()
+        return len(rows)
 
-            store._pseudo_to_real[pseudonym] = real_value
-            store._real_to_pseudo[key] = pseudonym
-            store._counters[entity_type] = max(store._counters[entity_type], counter)
+    def export_json(self, path: Path) -> None:
+        """Write the mapping in the ``mapping.json`` format."""
+        _write_json(self.mapping, path)
 
-        return store
+    def close(self) -> None:
+        self._conn.close()
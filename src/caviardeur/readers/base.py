@@ -1,3 +1,4 @@
+import bisect
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -20,14 +21,73 @@ class DocumentContent:
     chunks: list[TextChunk]
     # Opaque metadata needed by the writer to reconstruct the document
     metadata: dict[str, Any] = field(default_factory=dict)
+    # Indices of the chunks whose text differs from the source document; None when
+    # unknown, in which case writers treat every chunk as modified
+    modified: set[int] | None = None
+    # Chunk start offsets in chunk order (sorted), built on first lookup; reset by assign_offsets
+    _chunk_starts: list[int] | None = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def raw_text(self) -> str:
         """Concatenate all chunks into a single string for NER processing."""
         return "".join(chunk.text for chunk in self.chunks)
 
+    def boundaries(self) -> list[int]:
+        """Offsets in raw_text where a paragraph, cell, slide or page ends.
+
+        These are the starts of separator chunks. Line separators inside PDF text are
+        left out, since a name can wrap across lines.
+        """
+        offsets: list[int] = []
+        offset = 0
+        for chunk in self.chunks:
+            kind = chunk.location.get("type", "")
+            if kind.endswith("_separator") and kind != "pdf_line_separator":
+                offsets.append(offset)
+            offset += len(chunk.text)
+        return offsets
+
+    def chunk_starts(self) -> list[int]:
+        """Start offset of every chunk, in order; built once per ``assign_offsets``."""
+        if self._chunk_starts is None:
+            self._chunk_starts = [chunk.offset for chunk in self.chunks]
+        return self._chunk_starts
+
+    def locate(self, start: int, end: int) -> list[tuple[int, int, int]]:
+        """Map a raw_text offset range to the chunks it covers.
+
+        Returns (chunk_index, local_start, local_end) tuples; a range may span several
+        chunks. The first chunk is found by binary search, then only the chunks
+        inside the range are visited.
+        """
+        starts = self.chunk_starts()
+        i = max(bisect.bisect_right(starts, start) - 1, 0)
+        result = []
+        while i < len(starts) and starts[i] < end:
+            chunk_start = starts[i]
+            overlap_start = max(start, chunk_start)
+            overlap_end = min(end, chunk_start + len(self.chunks[i].text))
+            if overlap_start < overlap_end:
+                result.append((i, overlap_start - chunk_start, overlap_end - chunk_start))
+            i += 1
+        return result
+
+    def modified_chunks(self) -> list[TextChunk]:
+        """Chunks a writer has to put back into the document, in chunk order."""
+        if self.modified is None:
+            return self.chunks
+        return [self.chunks[i] for i in sorted(self.modified)]
+
+    def modified_containers(self, key: str) -> set[Any]:
+        """Values of location ``key`` (a page, slide or sheet) over the modified chunks.
+
+        Writers use it to skip whole pages, slides or sheets that were left untouched.
+        """
+        return {chunk.location[key] for chunk in self.modified_chunks() if key in chunk.location}
+
     def assign_offsets(self) -> None:
         """Compute and assign character offsets for each chunk."""
+        self._chunk_starts = None
         offset = 0
         for chunk in self.chunks:
             chunk.offset = offset
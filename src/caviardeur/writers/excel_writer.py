@@ -21,10 +21,12 @@ def write_xlsx(content: DocumentContent, output_path: Path, source_path: Path |
         if wb.worksheets:
             wb.remove(wb.active)
 
-    # Build lookup: (sheet, row, col) -> new text
+    # Build lookup: (sheet, row, col) -> new text. A converted .xls needs every cell,
+    # an .xlsx updated in place only the modified ones.
+    chunks = content.chunks if original_format == "xls" else content.modified_chunks()
     cell_map: dict[tuple[str, int, int], str] = {}
     sheets_seen: set[str] = set()
-    for chunk in content.chunks:
+    for chunk in chunks:
         loc = chunk.location
         loc_type = loc.get("type", "")
         if loc_type in ("xlsx_cell", "xls_cell"):
@@ -12,12 +12,13 @@ def write_pdf(content: DocumentContent, output_path: Path, source_path: Path) ->
     """Write pseudonymized content to a PDF using PyMuPDF's redaction API.
 
     For each modified span: whitewash the original text area, overlay the pseudonym.
+    Pages without a modified span are left as they are.
     """
     doc = fitz.open(str(source_path))
 
     # Build lookup of original text -> new text per page/block/line/span
     span_map: dict[tuple[int, int, int, int], dict] = {}
-    for chunk in content.chunks:
+    for chunk in content.modified_chunks():
         loc = chunk.location
         if loc.get("type") != "pdf_span":
             continue
@@ -30,8 +31,9 @@ def write_pdf(content: DocumentContent, output_path: Path, source_path: Path) ->
             "color": loc.get("color", 0),
         }
 
-    # Now re-read the original to find which spans actually changed
-    for page_idx in range(len(doc)):
+    # Now re-read the original to find which spans actually changed, on the pages
+    # that have a modified span only
+    for page_idx in sorted(content.modified_containers("page_idx")):
         page = doc[page_idx]
         blocks = page.get_text("dict")["blocks"]
         has_redactions = False
@@ -1,12 +1,21 @@
+import json
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
 from click.testing import CliRunner
 
 from caviardeur.cli import main
 from caviardeur.detectors.base import DetectedEntity, EntityType
 
 
+@pytest.fixture(autouse=True)
+def mock_warm_up():
+    """Never load the real NER model in the background during CLI tests."""
+    with patch("caviardeur.cli.start_warm_up") as mock:
+        yield mock
+
+
 def _mock_detect_all(text, **kwargs):
     entities = []
     for target, etype, conf in [
@@ -32,7 +41,11 @@ def _mock_detect_all(text, **kwargs):
     return entities
 
 
-@patch("caviardeur.pipeline.detect_all", side_effect=_mock_detect_all)
+def _mock_detect_all_batch(texts, **kwargs):
+    return [_mock_detect_all(text) for text in texts]
+
+
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
 def test_cli_dry_run(mock_detect, tmp_path: Path):
     txt = tmp_path / "test.txt"
     txt.write_text("Jean Dupont travaille chez Nextech Solutions SAS.", encoding="utf-8")
@@ -45,7 +58,7 @@ def test_cli_dry_run(mock_detect, tmp_path: Path):
     assert not (tmp_path / "output").exists()
 
 
-@patch("caviardeur.pipeline.detect_all", side_effect=_mock_detect_all)
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
 def test_cli_normal_run(mock_detect, tmp_path: Path):
     txt = tmp_path / "test.txt"
     txt.write_text("Jean Dupont travaille chez Nextech Solutions SAS.", encoding="utf-8")
@@ -61,7 +74,7 @@ def test_cli_normal_run(mock_detect, tmp_path: Path):
     assert (output_dir / "mapping.json").exists()
 
 
-@patch("caviardeur.pipeline.detect_all", side_effect=_mock_detect_all)
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
 def test_cli_verbose(mock_detect, tmp_path: Path):
     txt = tmp_path / "test.txt"
     txt.write_text("Jean Dupont", encoding="utf-8")
@@ -72,7 +85,7 @@ def test_cli_verbose(mock_detect, tmp_path: Path):
     assert result.exit_code == 0
 
 
-@patch("caviardeur.pipeline.detect_all", side_effect=_mock_detect_all)
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
 def test_cli_with_existing_mapping(mock_detect, tmp_path: Path):
     # First run: create mapping
     txt = tmp_path / "test.txt"
@@ -96,6 +109,31 @@ def test_cli_with_existing_mapping(mock_detect, tmp_path: Path):
     assert "Loading existing mapping" in result.output
 
 
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
+def test_cli_with_mapping_database(mock_detect, tmp_path: Path):
+    txt = tmp_path / "test.txt"
+    txt.write_text("Jean Dupont travaille chez Nextech Solutions SAS.", encoding="utf-8")
+    database = tmp_path / "mapping.sqlite"
+    runner = CliRunner()
+
+    result = runner.invoke(main, [str(txt), "-o", str(tmp_path / "out"), "-m", str(database)])
+    assert result.exit_code == 0
+    assert "Using mapping database" in result.output
+    # The database is updated in place; no mapping.json is written
+    assert not (tmp_path / "out" / "mapping.json").exists()
+
+    result = runner.invoke(main, ["mapping", "export", str(database), str(tmp_path / "mapping.json")])
+    assert result.exit_code == 0
+    assert json.loads((tmp_path / "mapping.json").read_text(encoding="utf-8")) == {
+        "PERSON_001": "Jean Dupont",
+        "COMPANY_001": "Nextech Solutions SAS",
+    }
+
+    result = runner.invoke(main, ["mapping", "import", str(tmp_path / "mapping.json"), str(tmp_path / "copy.db")])
+    assert result.exit_code == 0
+    assert "Imported 2 pseudonym(s)" in result.output
+
+
 def test_cli_no_supported_files(tmp_path: Path):
     unsupported = tmp_path / "file.xyz"
     unsupported.write_text("nothing", encoding="utf-8")
@@ -107,7 +145,7 @@ def test_cli_no_supported_files(tmp_path: Path):
     assert "No supported files found" in result.output
 
 
-@patch("caviardeur.pipeline.detect_all", return_value=[])
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=lambda texts, **kwargs: [[] for _ in texts])
 def test_cli_no_entities_no_mapping_saved(mock_detect, tmp_path: Path):
     txt = tmp_path / "test.txt"
     txt.write_text("Texte sans PII.", encoding="utf-8")
@@ -118,3 +156,161 @@ def test_cli_no_entities_no_mapping_saved(mock_detect, tmp_path: Path):
 
     assert result.exit_code == 0
     assert "Mapping saved" not in result.output
+
+
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
+def test_cli_reports_failed_file_and_continues(mock_detect, tmp_path: Path):
+    (tmp_path / "a.txt").write_text("Jean Dupont", encoding="utf-8")
+    (tmp_path / "b.txt").write_text("Nextech Solutions SAS", encoding="utf-8")
+    output_dir = tmp_path / "out"
+
+    with patch("caviardeur.pipeline._write_document", side_effect=[OSError("disk full"), None]):
+        result = CliRunner().invoke(main, [str(tmp_path), "-o", str(output_dir)])
+
+    assert result.exit_code == 0
+    assert "Error processing a.txt" in result.output
+    assert "1 PII entities detected across 2 file(s)" in result.output
+    # Both documents were scanned in a single cross-document batch
+    mock_detect.assert_called_once()
+
+
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
+def test_cli_explicit_run_command_with_quantize(mock_detect, tmp_path: Path):
+    txt = tmp_path / "test.txt"
+    txt.write_text("Jean Dupont", encoding="utf-8")
+
+    result = CliRunner().invoke(main, ["run", str(txt), "--dry-run", "--quantize", "--sessions", "4"])
+
+    assert result.exit_code == 0
+    assert mock_detect.call_args.args[1].quantized is True
+    assert mock_detect.call_args.args[1].num_sessions == 4
+
+
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
+def test_cli_language_model_options(mock_detect, tmp_path: Path):
+    txt = tmp_path / "test.txt"
+    txt.write_text("Jean Dupont", encoding="utf-8")
+
+    result = CliRunner().invoke(
+        main, [str(txt), "--dry-run", "--language-model", "EN=dslim/ner", "--max-loaded-mb", "1024"]
+    )
+
+    assert result.exit_code == 0
+    assert mock_detect.call_args.args[1].language_models == {"en": "dslim/ner"}
+    assert mock_detect.call_args.args[1].max_loaded_mb == 1024
+
+
+def test_cli_language_model_requires_lang_and_model(tmp_path: Path):
+    txt = tmp_path / "test.txt"
+    txt.write_text("Jean Dupont", encoding="utf-8")
+
+    result = CliRunner().invoke(main, [str(txt), "--dry-run", "--language-model", "dslim/ner"])
+
+    assert result.exit_code != 0
+    assert "LANG=MODEL" in result.output
+
+
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
+def test_cli_draft_model_options(mock_detect, tmp_path: Path):
+    txt = tmp_path / "test.txt"
+    txt.write_text("Jean Dupont", encoding="utf-8")
+
+    result = CliRunner().invoke(
+        main, [str(txt), "--dry-run", "--draft-model", "small/ner", "--escalation-threshold", "0.8"]
+    )
+
+    assert result.exit_code == 0
+    assert mock_detect.call_args.args[1].draft_model == "small/ner"
+    assert mock_detect.call_args.args[1].escalation_threshold == 0.8
+
+
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
+def test_cli_ner_cache_option(mock_detect, tmp_path: Path):
+    txt = tmp_path / "test.txt"
+    txt.write_text("Jean Dupont", encoding="utf-8")
+    cache_path = tmp_path / "cache" / "ner.sqlite"
+
+    result = CliRunner().invoke(main, [str(txt), "--dry-run", "--ner-cache", str(cache_path), "--ner-cache-size", "16"])
+
+    assert result.exit_code == 0
+    assert mock_detect.call_args.args[1].cache_path == cache_path
+    assert mock_detect.call_args.args[1].cache_max_mb == 16
+    assert "NER cache:" in result.output
+
+
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
+def test_cli_prefilter_options(mock_detect, tmp_path: Path):
+    txt = tmp_path / "test.txt"
+    txt.write_text("Jean Dupont", encoding="utf-8")
+
+    result = CliRunner().invoke(main, [str(txt), "--dry-run", "--no-prefilter", "--min-letter-ratio", "0.3"])
+
+    assert result.exit_code == 0
+    assert mock_detect.call_args.args[1].prefilter is False
+    assert mock_detect.call_args.args[1].min_letter_ratio == 0.3
+
+
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
+def test_cli_starts_warm_up_before_processing(mock_detect, mock_warm_up, tmp_path: Path):
+    txt = tmp_path / "test.txt"
+    txt.write_text("Jean Dupont", encoding="utf-8")
+
+    result = CliRunner().invoke(main, [str(txt), "--dry-run", "--warm-up", "load"])
+
+    assert result.exit_code == 0
+    mock_warm_up.assert_called_once()
+    assert mock_warm_up.call_args.args[0].ner_warm_up == "load"
+
+
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
+def test_cli_model_dir_option(mock_detect, tmp_path: Path):
+    txt = tmp_path / "test.txt"
+    txt.write_text("Jean Dupont", encoding="utf-8")
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+
+    result = CliRunner().invoke(main, [str(txt), "--dry-run", "--model-dir", str(model_dir)])
+
+    assert result.exit_code == 0
+    assert mock_detect.call_args.args[1].model_name == str(model_dir)
+
+
+def test_cli_model_fetch(tmp_path: Path):
+    with patch("caviardeur.detectors.ner_model.fetch_model") as mock_fetch:
+        result = CliRunner().invoke(main, ["model", "fetch", str(tmp_path / "model"), "--force"])
+
+    assert result.exit_code == 0
+    mock_fetch.assert_called_once_with("Jean-Baptiste/camembert-ner-with-dates", tmp_path / "model", force=True)
+    assert "NER model ready" in result.output
+
+
+def test_cli_model_quantize_reports_comparison(tmp_path: Path):
+    from caviardeur.detectors.ner_benchmark import QuantizationReport
+
+    (tmp_path / "doc.txt").write_text("Jean Dupont", encoding="utf-8")
+    report = QuantizationReport(440.0, 110.0, 3.0, 1.0, 10, 9, 9)
+
+    with (
+        patch("caviardeur.detectors.ner_model.resolve_model_files", return_value=("model.onnx", "c", "s")),
+        patch("caviardeur.detectors.ner_model.quantize_model", return_value=Path("model.int8.onnx")) as mock_quantize,
+        patch("caviardeur.detectors.ner_benchmark.compare_quantized", return_value=report) as mock_compare,
+    ):
+        result = CliRunner().invoke(main, ["model", "quantize", "--corpus", str(tmp_path), "--force"])
+
+    assert result.exit_code == 0, result.output
+    mock_quantize.assert_called_once_with("model.onnx", force=True)
+    assert mock_compare.call_args.args[0] == ["Jean Dupont"]
+    assert "INT8 model: model.int8.onnx" in result.output
+    assert "Speedup: 3.00x" in result.output
+    assert "recall 0.900" in result.output
+
+
+def test_cli_model_quantize_empty_corpus(tmp_path: Path):
+    with (
+        patch("caviardeur.detectors.ner_model.resolve_model_files", return_value=("model.onnx", "c", "s")),
+        patch("caviardeur.detectors.ner_model.quantize_model", return_value=Path("model.int8.onnx")),
+    ):
+        result = CliRunner().invoke(main, ["model", "quantize", "--corpus", str(tmp_path)])
+
+    assert result.exit_code == 1
+    assert "No supported documents" in result.output
@@ -0,0 +1,56 @@
+"""Shared fixtures: a tiny token-classification ONNX model built with onnx.helper."""
+
+from pathlib import Path
+
+import numpy as np
+import onnx
+import pytest
+from onnx import TensorProto, helper, numpy_helper
+
+VOCAB_SIZE = 32
+HIDDEN_SIZE = 8
+NUM_LABELS = 3
+
+
+def build_tiny_ner_model(path: Path, seed: int = 0, opset: int = 17) -> Path:
+    """Write a small ``input_ids/attention_mask -> logits`` model shaped like a NER head.
+
+    logits = (Embedding[input_ids] @ W + b) * attention_mask
+    """
+    rng = np.random.default_rng(seed)
+    embedding = rng.normal(size=(VOCAB_SIZE, HIDDEN_SIZE)).astype(np.float32)
+    weight = rng.normal(size=(HIDDEN_SIZE, NUM_LABELS)).astype(np.float32)
+    bias = rng.normal(size=(NUM_LABELS,)).astype(np.float32)
+
+    nodes = [
+        helper.make_node("Gather", ["embedding", "input_ids"], ["hidden"]),
+        helper.make_node("MatMul", ["hidden", "weight"], ["projected"]),
+        helper.make_node("Add", ["projected", "bias"], ["raw_logits"]),
+        helper.make_node("Cast", ["attention_mask"], ["mask_f"], to=TensorProto.FLOAT),
+        helper.make_node("Unsqueeze", ["mask_f", "last_axis"], ["mask_3d"]),
+        helper.make_node("Mul", ["raw_logits", "mask_3d"], ["logits"]),
+    ]
+    graph = helper.make_graph(
+        nodes,
+        "tiny_ner",
+        inputs=[
+            helper.make_tensor_value_info("input_ids", TensorProto.INT64, ["batch", "sequence"]),
+            helper.make_tensor_value_info("attention_mask", TensorProto.INT64, ["batch", "sequence"]),
+        ],
+        outputs=[helper.make_tensor_value_info("logits", TensorProto.FLOAT, ["batch", "sequence", NUM_LABELS])],
+        initializer=[
+            numpy_helper.from_array(embedding, "embedding"),
+            numpy_helper.from_array(weight, "weight"),
+            numpy_helper.from_array(bias, "bias"),
+            numpy_helper.from_array(np.array([-1], dtype=np.int64), "last_axis"),
+        ],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", opset)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+    return path
+
+
+@pytest.fixture
+def tiny_model_path(tmp_path: Path) -> Path:
+    return build_tiny_ner_model(tmp_path / "model.onnx")
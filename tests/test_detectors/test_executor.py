@@ -0,0 +1,60 @@
+"""Tests for the concurrent detector executor."""
+
+import threading
+
+import pytest
+
+from caviardeur.detectors.base import DetectedEntity, EntityType
+from caviardeur.detectors.executor import DetectorExecutor
+
+
+def _tag(label: str):
+    def _detect(texts):
+        return [[DetectedEntity(EntityType.PERSON, label, 0, len(text), source=label)] for text in texts]
+
+    return _detect
+
+
+def test_run_merges_detectors_per_document_in_order():
+    executor = DetectorExecutor()
+    executor.register("first", _tag("first"))
+    executor.register("second", _tag("second"))
+
+    results = executor.run(["a", "bb"], {"ner": _tag("ner")})
+
+    assert [[e.source for e in doc] for doc in results] == [["ner", "first", "second"]] * 2
+    assert [e.end for e in results[1]] == [2, 2, 2]
+    assert set(executor.timings) == {"ner", "first", "second"}
+    executor.reset_timings()
+    assert executor.timings == {}
+
+
+def test_registered_detectors_run_while_primary_runs():
+    started = threading.Event()
+
+    def _worker(texts):
+        started.set()
+        return [[] for _ in texts]
+
+    def _primary(texts):
+        # Only returns if the worker runs concurrently
+        assert started.wait(timeout=5)
+        return [[] for _ in texts]
+
+    executor = DetectorExecutor()
+    executor.register("worker", _worker)
+    assert executor.run(["x"], {"ner": _primary}) == [[]]
+
+
+def test_worker_errors_are_raised():
+    def _broken(texts):
+        raise RuntimeError("broken detector")
+
+    executor = DetectorExecutor()
+    executor.register("broken", _broken)
+    with pytest.raises(RuntimeError, match="broken detector"):
+        executor.run(["x"], {"ner": _tag("ner")})
+
+    executor.unregister("broken")
+    assert executor.names == []
+    assert len(executor.run(["x"], {"ner": _tag("ner")})[0]) == 1
@@ -0,0 +1,24 @@
+"""Tests for document language identification."""
+
+import pytest
+
+from caviardeur.detectors.language import detect_language
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Le présent contrat est conclu entre la société Dupont et Marie Martin.", "fr"),
+        ("This agreement is made between the company and their employees.", "en"),
+        ("Jean Dupont\n06 12 34 56 78", "fr"),  # no stopwords: default
+        ("", "fr"),
+    ],
+)
+def test_detect_language(text, expected):
+    assert detect_language(text) == expected
+
+
+def test_detect_language_default_when_undecided():
+    assert detect_language("12345 ACME", default="en") == "en"
+    # One stopword each: a tie
+    assert detect_language("les the", default="en") == "en"
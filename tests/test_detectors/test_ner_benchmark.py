@@ -0,0 +1,64 @@
+from unittest.mock import MagicMock, patch
+
+from caviardeur.detectors.base import DetectedEntity, EntityType
+from caviardeur.detectors.ner_benchmark import QuantizationReport, compare_quantized
+from caviardeur.detectors.ner_detector import NerOptions
+
+
+def _ent(start, end, etype=EntityType.PERSON):
+    return DetectedEntity(entity_type=etype, text="x" * (end - start), start=start, end=end, source="ner")
+
+
+def test_report_metrics():
+    report = QuantizationReport(
+        fp32_size_mb=440.0,
+        int8_size_mb=110.0,
+        fp32_seconds=3.0,
+        int8_seconds=1.0,
+        fp32_entities=10,
+        int8_entities=8,
+        matched_entities=8,
+    )
+    assert report.speedup == 3.0
+    assert report.precision == 1.0
+    assert report.recall == 0.8
+    assert round(report.f1, 3) == 0.889
+
+
+def test_report_metrics_without_entities():
+    report = QuantizationReport(1.0, 1.0, 1.0, 0.0, 0, 0, 0)
+    assert report.precision == report.recall == 1.0
+    assert report.speedup == 0.0
+
+
+@patch("caviardeur.detectors.ner_benchmark.NerEngine.load")
+@patch("caviardeur.detectors.ner_benchmark.quantize_model")
+@patch("caviardeur.detectors.ner_benchmark.resolve_model_files")
+def test_compare_quantized_counts_agreement(mock_resolve, mock_quantize, mock_load, tmp_path):
+    fp32_path = tmp_path / "model.onnx"
+    fp32_path.write_bytes(b"\0" * 4000)
+    int8_path = tmp_path / "model.int8.onnx"
+    int8_path.write_bytes(b"\0" * 1000)
+    mock_resolve.return_value = (str(fp32_path), "config.json", "spm.model")
+    mock_quantize.return_value = int8_path
+
+    def _load(model_name, session_settings, quantized):
+        engine = MagicMock()
+        engine.__enter__.return_value = engine
+        if quantized:
+            engine.detect.return_value = [[_ent(0, 4)], [_ent(10, 15, EntityType.COMPANY)]]
+        else:
+            engine.detect.return_value = [[_ent(0, 4), _ent(5, 9)], [_ent(10, 15)]]
+        return engine
+
+    mock_load.side_effect = _load
+
+    report = compare_quantized(["a", "b"], NerOptions(model_name="fake-model"))
+
+    assert report.fp32_size_mb == 0.004
+    assert report.int8_size_mb == 0.001
+    assert (report.fp32_entities, report.int8_entities, report.matched_entities) == (3, 2, 1)
+    # Each variant gets its own engine, loaded before timing starts and closed afterwards
+    assert [call.args[2] for call in mock_load.call_args_list] == [False, True]
+    for call in mock_load.call_args_list:
+        assert call.args[0] == "fake-model"
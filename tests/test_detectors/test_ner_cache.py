@@ -0,0 +1,95 @@
+"""Tests for the on-disk NER window cache."""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from caviardeur.detectors.ner_cache import NerCache
+from caviardeur.detectors.ner_detector import NerEngine, NerOptions, detect_ner_batch
+
+from .test_ner_detector import ID2LABEL, MockInput, _hot_logits, _make_word_sp
+
+
+def test_key_depends_on_model_text_and_tokens():
+    key = NerCache.key("model|fp32", "Jean Dupont", b"\x01")
+    assert key == NerCache.key("model|fp32", "Jean Dupont", b"\x01")
+    assert key != NerCache.key("model|int8", "Jean Dupont", b"\x01")
+    assert key != NerCache.key("model|fp32", "Jean Dupond", b"\x01")
+    assert key != NerCache.key("model|fp32", "Jean Dupont", b"\x02")
+
+
+def test_get_and_put_round_trip(tmp_path):
+    cache = NerCache(tmp_path / "ner.sqlite")
+    entities = [{"entity_group": "PER", "start": 0, "end": 11, "score": 0.99}]
+    cache.put_many({"a": entities})
+
+    assert cache.get_many(["a", "b", "a"]) == {"a": entities}
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+    # Entries survive across processes
+    reopened = NerCache(tmp_path / "ner.sqlite")
+    assert reopened.get_many(["a"]) == {"a": entities}
+
+
+def test_eviction_keeps_recently_used_entries(tmp_path):
+    cache = NerCache(tmp_path / "ner.sqlite", max_size_mb=1)
+    payload = [{"entity_group": "PER", "start": 0, "end": 1, "score": 0.5, "pad": "x" * 300_000}]
+    cache.put_many({"old": payload})
+    cache.put_many({"used": payload})
+    cache.get_many(["old"])  # "old" is now more recent than "used"
+    cache.put_many({"new": payload})
+    cache.put_many({"newest": payload})
+
+    assert set(cache.get_many(["old", "used", "new", "newest"])) == {"old", "new", "newest"}
+    assert len(cache) == 3
+
+
+def _make_per_session() -> MagicMock:
+    """Session mock tagging every token as B-PER, whatever the batch shape."""
+    session = MagicMock()
+    session.get_inputs.return_value = [MockInput("input_ids"), MockInput("attention_mask")]
+    session.run.side_effect = lambda _, inputs: [
+        np.broadcast_to(_hot_logits(1, len(ID2LABEL), [1]), (*inputs["input_ids"].shape, len(ID2LABEL)))
+    ]
+    return session
+
+
+def test_detect_ner_batch_reuses_cached_windows(tmp_path):
+    texts = ["Jean Dupont", "Marie", "Jean Dupont"]
+    session = _make_per_session()
+    mock_engine = NerEngine(session, _make_word_sp(), ID2LABEL, 5, 6, 1, 4)
+
+    with patch("caviardeur.detectors.ner_detector._get_engine", return_value=mock_engine):
+        uncached = detect_ner_batch(texts)
+        session.run.reset_mock()
+
+        first = detect_ner_batch(texts, NerOptions(cache_path=tmp_path / "ner.sqlite"))
+        # The repeated document is only sent to the model once
+        assert sum(len(call.args[1]["input_ids"]) for call in session.run.call_args_list) == 2
+
+        session.run.reset_mock()
+        second = detect_ner_batch(texts, NerOptions(cache_path=tmp_path / "ner.sqlite"))
+        session.run.assert_not_called()
+
+    assert first == uncached
+    assert second == uncached
+    assert [e.text for e in second[2]] == ["Jean", "Dupont"]
+
+
+def test_cached_offsets_are_window_relative(tmp_path):
+    session = _make_per_session()
+    mock_engine = NerEngine(session, _make_word_sp(), ID2LABEL, 5, 6, 1, 4)
+
+    with patch("caviardeur.detectors.ner_detector._get_engine", return_value=mock_engine):
+        detect_ner_batch(["Marie"], NerOptions(cache_path=tmp_path / "ner.sqlite"))
+        session.run.reset_mock()
+        # Same window text at another position in a longer document (char windows)
+        results = detect_ner_batch(
+            ["Paul Paul Paul\nMarie"],
+            NerOptions(window_mode="chars", window_size=15, window_overlap=0, cache_path=tmp_path / "ner.sqlite"),
+        )
+        # Only the "Paul Paul Paul" window needed inference
+        assert sum(len(call.args[1]["input_ids"]) for call in session.run.call_args_list) == 1
+
+    assert [(e.text, e.start) for e in results[0]][-1] == ("Marie", 15)
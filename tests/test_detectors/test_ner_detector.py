@@ -5,8 +5,30 @@ from dataclasses import dataclass, field
 from unittest.mock import MagicMock, patch
 
 import numpy as np
-
-from caviardeur.detectors.ner_detector import _run_window, detect_ner
+import pytest
+
+from caviardeur.detectors.ner_detector import (
+    NerEngine,
+    NerOptions,
+    _char_windows,
+    _decode_spans,
+    _encode_texts,
+    _get_engine,
+    _InputBuffers,
+    _length_buckets,
+    _may_contain_names,
+    _merge_window_entities,
+    _run_batch,
+    _run_window,
+    _token_windows,
+    _uncertain_windows,
+    detect_ner,
+    detect_ner_batch,
+    evict_ner,
+    stats,
+    unload_ner,
+    warm_up_ner,
+)
 
 MockInput = namedtuple("MockInput", ["name"])
 
@@ -26,10 +48,12 @@ class MockEncoded:
 
 
 def _make_session(logits_2d: np.ndarray) -> MagicMock:
-    """Build a minimal ort session mock. logits_2d: [seq_len, num_labels]."""
+    """Build a minimal ort session mock. logits_2d: [seq_len, num_labels], repeated for every batch row."""
     session = MagicMock()
     session.get_inputs.return_value = [MockInput("input_ids"), MockInput("attention_mask")]
-    session.run.return_value = [np.expand_dims(logits_2d, axis=0)]
+    session.run.side_effect = lambda _, inputs: [
+        np.broadcast_to(logits_2d, (len(inputs["input_ids"]), *logits_2d.shape))
+    ]
     return session
 
 
@@ -40,9 +64,12 @@ def _make_sp(pieces: list[tuple[int, int, int]], bos_id: int = 0, eos_id: int =
     _run_window adds BOS/EOS around them automatically.
     """
 
-    def _encode(text, out_type=None):
+    def _encode_one(text):
         return MockEncoded(pieces=[MockPiece(id=id_, begin=begin, end=end) for id_, begin, end in pieces])
 
+    def _encode(text, out_type=None, num_threads=None):
+        return [_encode_one(t) for t in text] if isinstance(text, list) else _encode_one(text)
+
     sp = MagicMock()
     sp.encode.side_effect = _encode
     sp.bos_id.return_value = bos_id
@@ -50,6 +77,21 @@ def _make_sp(pieces: list[tuple[int, int, int]], bos_id: int = 0, eos_id: int =
     return sp
 
 
+def _make_word_sp() -> MagicMock:
+    """SentencePiece mock that emits one piece (id 100) per whitespace-separated word."""
+    import re
+
+    def _encode_one(text):
+        return MockEncoded(pieces=[MockPiece(id=100, begin=m.start(), end=m.end()) for m in re.finditer(r"\S+", text)])
+
+    def _encode(text, out_type=None, num_threads=None):
+        return [_encode_one(t) for t in text] if isinstance(text, list) else _encode_one(text)
+
+    sp = _make_sp([])
+    sp.encode.side_effect = _encode
+    return sp
+
+
 def _hot_logits(seq_len: int, num_labels: int, pred_ids: list[int]) -> np.ndarray:
     """Logits where each token position is near-certain about pred_ids[i]."""
     logits = np.full((seq_len, num_labels), -10.0, dtype=np.float32)
@@ -158,6 +200,9 @@ def test_run_window_truncation_uses_model_eos_id():
         def get_inputs(self):
             return [type("I", (), {"name": "input_ids"})(), type("I", (), {"name": "attention_mask"})()]
 
+        def get_outputs(self):
+            return [type("O", (), {"name": "logits"})()]
+
         def run(self, _, inputs):
             captured["input_ids"] = inputs["input_ids"][0].tolist()
             return [np.zeros((1, 5, len(ID2LABEL)), dtype=np.float32)]
@@ -178,6 +223,139 @@ def test_run_window_truncation_uses_model_eos_id():
     assert captured["input_ids"][-1] == model_eos_id, "last token must be model EOS (not sp.eos_id)"
 
 
+def test_run_window_i_of_other_group_starts_new_entity():
+    """B-PER followed by I-LOC yields two entities rather than one mixed span."""
+    pieces = [(100, 0, 4), (200, 5, 10)]
+    logits = _hot_logits(4, len(ID2LABEL), [0, 1, 4, 0])
+
+    entities = _run_window(_make_session(logits), _make_sp(pieces), ID2LABEL, "Jean Paris", 5, 6, 4)
+
+    assert [(e["entity_group"], e["start"], e["end"]) for e in entities] == [("PER", 0, 4), ("LOC", 5, 10)]
+
+
+# ---------------------------------------------------------------------------
+# _decode_spans tests
+# ---------------------------------------------------------------------------
+
+
+def _reference_spans(pred_ids, scores, id2label, sequence_starts):
+    """Straightforward token loop the vectorized decoder must agree with."""
+    spans, current = [], None
+    for i, (label_id, score) in enumerate(zip(pred_ids, scores, strict=True)):
+        label = id2label.get(label_id, "O")
+        if sequence_starts[i] and current is not None:
+            spans.append(current)
+            current = None
+        if label[:2] not in ("B-", "I-"):
+            if current is not None:
+                spans.append(current)
+            current = None
+        elif label.startswith("I-") and current is not None and current[2] == label[2:]:
+            current = (current[0], i, current[2], current[3] + [score])
+        else:
+            if current is not None:
+                spans.append(current)
+            current = (i, i, label[2:], [score])
+    if current is not None:
+        spans.append(current)
+    return [(first, last, group, float(np.mean(s))) for first, last, group, s in spans]
+
+
+def test_decode_spans_matches_token_loop():
+    rng = np.random.default_rng(7)
+    for _ in range(50):
+        pred_ids = rng.integers(0, len(ID2LABEL) + 1, size=60)  # includes an id missing from the map
+        scores = rng.random(60).astype(np.float32)
+        sequence_starts = rng.random(60) < 0.1
+        sequence_starts[0] = True
+
+        first, last, names, group_index, means = _decode_spans(pred_ids, scores, ID2LABEL, sequence_starts)
+        decoded = [
+            (f, lst, names[g], m)
+            for f, lst, g, m in zip(first.tolist(), last.tolist(), group_index.tolist(), means.tolist(), strict=True)
+        ]
+
+        expected = _reference_spans(pred_ids.tolist(), scores.tolist(), ID2LABEL, sequence_starts)
+        assert [d[:3] for d in decoded] == [e[:3] for e in expected]
+        np.testing.assert_allclose([d[3] for d in decoded], [e[3] for e in expected], rtol=1e-6)
+
+
+# ---------------------------------------------------------------------------
+# _run_batch tests
+# ---------------------------------------------------------------------------
+
+
+def test_run_batch_pads_and_masks():
+    """Windows of different lengths share one padded session.run with an attention mask."""
+    long = (np.array([14, 24, 34]), np.array([[0, 1], [1, 2], [2, 3]]))
+    short = (np.array([44]), np.array([[10, 15]]))
+    session = _make_session(np.zeros((5, len(ID2LABEL)), dtype=np.float32))
+    logits = np.stack(
+        [
+            _hot_logits(5, len(ID2LABEL), [0, 1, 2, 2, 0]),
+            _hot_logits(5, len(ID2LABEL), [0, 3, 0, 5, 5]),
+        ]
+    )
+    session.run.side_effect = None
+    session.run.return_value = [logits]
+
+    results = _run_batch(session, ID2LABEL, [long, short], 5, 6, 1)
+
+    session.run.assert_called_once()
+    inputs = session.run.call_args[0][1]
+    assert inputs["input_ids"].tolist() == [[5, 14, 24, 34, 6], [5, 44, 6, 1, 1]]
+    assert inputs["attention_mask"].tolist() == [[1, 1, 1, 1, 1], [1, 1, 1, 0, 0]]
+    assert [e["entity_group"] for e in results[0]] == ["PER"]
+    assert (results[0][0]["start"], results[0][0]["end"]) == (0, 3)
+    # Padded positions never leak into the decoded entities; offsets stay in text coordinates
+    assert [(e["entity_group"], e["start"], e["end"]) for e in results[1]] == [("LOC", 10, 15)]
+
+
+def test_run_batch_prediction_outputs_match_logits(tiny_model_path):
+    """A session with fused label/score outputs decodes exactly like the logits path."""
+    from caviardeur.detectors.ner_model import SessionSettings, add_prediction_outputs, build_session
+
+    id2label = {0: "O", 1: "B-PER", 2: "I-PER"}
+    windows = [
+        (np.arange(3, 12, dtype=np.int64), np.array([[i, i + 1] for i in range(9)])),
+        (np.array([20, 21, 22], dtype=np.int64), np.array([[0, 2], [3, 5], [6, 8]])),
+    ]
+    settings = SessionSettings(cache_optimized_model=False)
+    plain = build_session(tiny_model_path, settings)
+    fused = build_session(add_prediction_outputs(tiny_model_path), settings)
+
+    expected = _run_batch(plain, id2label, windows, 0, 2, 1)
+    results = _run_batch(fused, id2label, windows, 0, 2, 1)
+
+    assert [[(e["entity_group"], e["start"], e["end"]) for e in r] for r in results] == [
+        [(e["entity_group"], e["start"], e["end"]) for e in r] for r in expected
+    ]
+    for got, want in zip(results, expected, strict=True):
+        np.testing.assert_allclose([e["score"] for e in got], [e["score"] for e in want], rtol=1e-5)
+
+
+def test_encode_texts_returns_id_and_offset_arrays():
+    sp = _make_word_sp()
+    (ids, offsets), (ids2, offsets2) = _encode_texts(sp, ["Jean Dupont", "Marie"], 4)
+    assert ids.dtype == np.int64
+    assert ids.tolist() == [104, 104]
+    assert offsets.tolist() == [[0, 4], [5, 11]]
+    assert offsets2.tolist() == [[0, 5]]
+    # Several documents go through one batched, multi-threaded encode call
+    sp.encode.assert_called_once()
+    assert sp.encode.call_args.args[0] == ["Jean Dupont", "Marie"]
+
+
+def test_input_buffers_reused_across_batches():
+    buffers = _InputBuffers()
+    ids, mask, _ = buffers.views(4, 10)
+    ids_small, _, _ = buffers.views(2, 7)
+    assert ids_small.flags["C_CONTIGUOUS"]
+    assert np.shares_memory(ids, ids_small)
+    ids_big, _, _ = buffers.views(8, 10)
+    assert ids_big.shape == (8, 10)
+
+
 # ---------------------------------------------------------------------------
 # detect_ner interface tests
 # ---------------------------------------------------------------------------
@@ -191,7 +369,7 @@ def test_detect_ner_whitespace_only():
     assert detect_ner("   \n\t  ") == []
 
 
-@patch("caviardeur.detectors.ner_detector._get_session_and_tokenizer")
+@patch("caviardeur.detectors.ner_detector._get_engine")
 def test_detect_ner_returns_per_entity(mock_get):
     """detect_ner returns a PERSON entity when the window produces one."""
     id2label = {0: "O", 1: "B-PER", 2: "I-PER"}
@@ -199,10 +377,10 @@ def test_detect_ner_returns_per_entity(mock_get):
     pieces = [(100, 0, 4), (200, 4, 11)]
     logits = _hot_logits(4, 3, [0, 1, 2, 0])
 
-    mock_get.return_value = (_make_session(logits), _make_sp(pieces), id2label, 5, 6, 4)
+    mock_get.return_value = NerEngine(_make_session(logits), _make_sp(pieces), id2label, 5, 6, 1, 4)
 
     text = "Jean Dupont"
-    results = detect_ner(text, model_name="fake-model")
+    results = detect_ner(text, NerOptions(model_name="fake-model"))
 
     assert len(results) == 1
     from caviardeur.detectors.base import EntityType
@@ -215,30 +393,475 @@ def test_detect_ner_returns_per_entity(mock_get):
     assert results[0].source == "ner"
 
 
-@patch("caviardeur.detectors.ner_detector._get_session_and_tokenizer")
+@patch("caviardeur.detectors.ner_detector._get_engine")
 def test_detect_ner_low_confidence_filtered(mock_get):
     """Entities below the confidence threshold are dropped."""
     id2label = {0: "O", 1: "B-PER"}
     pieces = [(100, 0, 4)]
     logits = np.zeros((3, 2), dtype=np.float32)  # equal logits → prob 0.5
 
-    mock_get.return_value = (_make_session(logits), _make_sp(pieces), id2label, 5, 6, 4)
+    mock_get.return_value = NerEngine(_make_session(logits), _make_sp(pieces), id2label, 5, 6, 1, 4)
 
-    results = detect_ner("Jean", model_name="fake-model", confidence_threshold=0.7)
+    results = detect_ner("Jean", NerOptions(model_name="fake-model", confidence_threshold=0.7))
     assert results == []
 
 
-@patch("caviardeur.detectors.ner_detector._get_session_and_tokenizer")
+@patch("caviardeur.detectors.ner_detector._get_engine")
 def test_detect_ner_deduplicates_overlapping_windows(mock_get):
     """The same span from overlapping windows is only returned once."""
     id2label = {0: "O", 1: "B-PER", 2: "I-PER"}
     pieces = [(100, 0, 4), (200, 4, 11)]
     logits = _hot_logits(4, 3, [0, 1, 2, 0])
 
-    mock_get.return_value = (_make_session(logits), _make_sp(pieces), id2label, 5, 6, 4)
+    mock_get.return_value = NerEngine(_make_session(logits), _make_sp(pieces), id2label, 5, 6, 1, 4)
 
     text = "Jean Dupont"
-    results = detect_ner(text, model_name="fake-model", window_size=8, window_overlap=4)
+    results = detect_ner(
+        text, NerOptions(model_name="fake-model", window_size=8, window_overlap=4, window_mode="chars")
+    )
 
     spans = [(r.start, r.end, r.entity_type) for r in results]
     assert len(spans) == len(set(spans))
+
+
+@patch("caviardeur.detectors.ner_detector._get_engine")
+def test_detect_ner_batches_windows(mock_get):
+    """Windows are grouped into batches of batch_size, one session.run per batch."""
+    id2label = {0: "O", 1: "B-PER"}
+    session = _make_session(_hot_logits(3, 2, [0, 1, 0]))
+
+    mock_get.return_value = NerEngine(session, _make_word_sp(), id2label, 5, 6, 1, 4)
+
+    text = "Jean " * 10  # 50 chars → 10 windows of 5 chars
+    results = detect_ner(
+        text, NerOptions(model_name="fake-model", window_size=5, window_overlap=0, batch_size=4, window_mode="chars")
+    )
+
+    assert session.run.call_count == 3
+    batch_rows = [call.args[1]["input_ids"].shape[0] for call in session.run.call_args_list]
+    assert batch_rows == [4, 4, 2]
+    # Each window tags its word; cuts without overlap join same-label neighbours
+    assert [(e.start, e.end) for e in results] == [(0, 49)]
+
+
+@patch("caviardeur.detectors.ner_detector._get_engine")
+def test_detect_ner_token_windows_cover_text_without_truncation(mock_get):
+    """Token windows pack up to max_length tokens, overlap by token_overlap, and never truncate."""
+    id2label = {0: "O", 1: "B-PER"}
+    session = MagicMock()
+    session.get_inputs.return_value = [MockInput("input_ids"), MockInput("attention_mask")]
+    session.run.side_effect = lambda _, inputs: [np.zeros((*inputs["input_ids"].shape, 2), dtype=np.float32)]
+    mock_get.return_value = NerEngine(session, _make_word_sp(), id2label, 5, 6, 1, 4)
+
+    text = " ".join(f"w{i:02d}" for i in range(30))
+    # budget = 12 - BOS/EOS = 10 tokens per window
+    detect_ner(text, NerOptions(model_name="fake-model", max_length=12, token_overlap=2, batch_size=1, prefilter=False))
+
+    windows = [call.args[1]["attention_mask"].sum() - 2 for call in session.run.call_args_list]
+    # Length bucketing runs the short tail window first
+    assert windows == [6, 10, 10, 10]
+    # The document is tokenized once; windows are slices of that encoding
+    assert mock_get.return_value.sp.encode.call_count == 1
+    tail_ids = session.run.call_args_list[0].args[1]["input_ids"][0].tolist()
+    assert tail_ids == [5] + [104] * 6 + [6]
+
+
+@patch("caviardeur.detectors.ner_detector._get_engine")
+def test_detect_ner_token_windows_end_on_sentence_boundaries(mock_get):
+    """A window ends on the last sentence end in its second half, and the next one starts there."""
+    id2label = {0: "O", 1: "B-PER"}
+    session = MagicMock()
+    session.get_inputs.return_value = [MockInput("input_ids"), MockInput("attention_mask")]
+    session.run.side_effect = lambda _, inputs: [np.zeros((*inputs["input_ids"].shape, 2), dtype=np.float32)]
+    mock_get.return_value = NerEngine(session, _make_word_sp(), id2label, 5, 6, 1, 4)
+
+    # Sentences of 7, 7 and 6 words; budget = 10 tokens per window
+    text = "a b c d e f g. h i j k l m n. o p q r s t"
+    detect_ner(text, NerOptions(model_name="fake-model", max_length=12, token_overlap=2, batch_size=1, prefilter=False))
+
+    windows = sorted(int(call.args[1]["attention_mask"].sum()) - 2 for call in session.run.call_args_list)
+    # Cut after each sentence, no shared tokens (fixed windows would need 3 windows and 4 repeats)
+    assert windows == [6, 7, 7]
+
+
+def test_token_windows_with_boundaries():
+    assert _token_windows(20, 12, 2, np.array([7, 14])) == [(0, 7), (7, 14), (14, 20)]
+    # Boundaries in the first half of a window are not worth the short window: fall back to overlap
+    assert _token_windows(20, 12, 2, np.array([3])) == [(0, 10), (8, 18), (16, 20)]
+
+
+def test_char_windows_with_boundaries():
+    offsets = np.array([[i, i + 1] for i in range(0, 40, 2)])  # one token every 2 chars
+    assert _char_windows(offsets, 40, 20, 4, np.array([14, 30])) == [(0, 7), (7, 15), (15, 20)]
+    assert _char_windows(offsets, 40, 20, 4, np.array([])) == [(0, 10), (8, 18), (16, 20)]
+
+
+def _ent(label, start, end, score=0.9):
+    return {"entity_group": label, "start": start, "end": end, "score": score}
+
+
+def test_merge_window_entities_overlapping_windows():
+    text = "Contrat avec Jean Dupont et ACME"
+    merged = _merge_window_entities(
+        text,
+        # "Jean" cut at the first window's edge; the next window sees the whole name
+        [_ent("PER", 13, 17, 0.6), _ent("PER", 13, 24, 0.95), _ent("PER", 13, 24, 0.9), _ent("ORG", 28, 32)],
+        seams=[],
+    )
+    assert [(e["entity_group"], e["start"], e["end"], e["score"]) for e in merged] == [
+        ("PER", 13, 24, 0.95),
+        ("ORG", 28, 32, 0.9),
+    ]
+
+
+def test_merge_window_entities_joins_across_seams_only():
+    text = "Jean Dupont\nMarie Curie"
+    parts = [_ent("PER", 0, 4), _ent("PER", 5, 11), _ent("PER", 12, 17), _ent("PER", 18, 23)]
+
+    # Windows cut between "Jean" and "Dupont" without overlap
+    merged = _merge_window_entities(text, parts, seams=[5])
+    assert [(e["start"], e["end"]) for e in merged] == [(0, 11), (12, 17), (18, 23)]
+    # No seam: neighbours found within one window stay distinct
+    assert len(_merge_window_entities(text, parts, seams=[])) == 4
+
+
+@patch("caviardeur.detectors.ner_detector._get_engine")
+def test_detect_ner_batch_routes_entities_to_documents(mock_get):
+    id2label = {0: "O", 1: "B-PER"}
+    session = MagicMock()
+    session.get_inputs.return_value = [MockInput("input_ids"), MockInput("attention_mask")]
+
+    def _run(_, inputs):
+        # Tag the first real token of every window as B-PER
+        logits = np.zeros((*inputs["input_ids"].shape, 2), dtype=np.float32)
+        logits[:, 1, 1] = 10.0
+        return [logits]
+
+    session.run.side_effect = _run
+    sp = _make_word_sp()
+    mock_get.return_value = NerEngine(session, sp, id2label, 5, 6, 1, 4)
+
+    results = detect_ner_batch(["Jean est là", "   ", "Marie aussi"], NerOptions(model_name="fake-model"))
+
+    assert [[e.text for e in doc] for doc in results] == [["Jean"], [], ["Marie"]]
+    assert sp.encode.call_count == 1
+    assert session.run.call_count == 1
+
+
+def test_detect_ner_rejects_unknown_window_mode():
+    with pytest.raises(ValueError, match="window mode"):
+        detect_ner("Jean Dupont", NerOptions(window_mode="words"))
+
+
+def test_length_buckets_group_similar_lengths():
+    assert _length_buckets([50, 3, 48, 5, 4], 2) == [[1, 4], [3, 2], [0]]
+
+
+@patch("caviardeur.detectors.ner_detector._get_engine")
+def test_detect_ner_batch_buckets_windows_across_documents(mock_get):
+    """Short windows from different documents share a batch instead of padding to a long one."""
+    id2label = {0: "O", 1: "B-PER"}
+    session = MagicMock()
+    session.get_inputs.return_value = [MockInput("input_ids"), MockInput("attention_mask")]
+    session.run.side_effect = lambda _, inputs: [np.zeros((*inputs["input_ids"].shape, 2), dtype=np.float32)]
+    mock_get.return_value = NerEngine(session, _make_word_sp(), id2label, 5, 6, 1, 4)
+
+    texts = ["a " * 40, "b", "c " * 38, "d d"]
+    detect_ner_batch(texts, NerOptions(model_name="fake-model", batch_size=2, prefilter=False))
+
+    shapes = [call.args[1]["input_ids"].shape for call in session.run.call_args_list]
+    assert shapes == [(2, 4), (2, 42)]
+
+
+# ---------------------------------------------------------------------------
+# Window pre-filter tests
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("Contrat signé avec Jean Dupont", True),
+        ("ÉLODIE MARTIN", True),
+        ("12 345,00\t2024-01-01\tFR-0042", False),
+        ('{"id": 12, "total": 3.5, "items": [1, 2, 3]}', False),
+        ("tout en minuscules sans nom propre", False),
+        ("Total " + "1234567890 " * 6, False),
+    ],
+)
+def test_may_contain_names(text, expected):
+    assert _may_contain_names(text, 0.1) is expected
+
+
+@patch("caviardeur.detectors.ner_detector._get_engine")
+def test_detect_ner_batch_prefilter_skips_windows(mock_get):
+    session = MagicMock()
+    session.get_inputs.return_value = [MockInput("input_ids"), MockInput("attention_mask")]
+    session.run.side_effect = lambda _, inputs: [np.zeros((*inputs["input_ids"].shape, 2), dtype=np.float32)]
+    mock_get.return_value = NerEngine(session, _make_word_sp(), {0: "O", 1: "B-PER"}, 5, 6, 1, 4)
+    texts = ["Jean Dupont", "12 345 678", "2024-01-01 ; 42 ; 3.14", "Marie"]
+
+    stats.reset()
+    detect_ner_batch(texts, NerOptions(model_name="fake-model", batch_size=8))
+
+    assert session.run.call_args.args[1]["input_ids"].shape[0] == 2
+    assert (stats.windows, stats.skipped) == (4, 2)
+
+    session.run.reset_mock()
+    detect_ner_batch(texts, NerOptions(model_name="fake-model", batch_size=8, prefilter=False))
+    assert session.run.call_args.args[1]["input_ids"].shape[0] == 4
+
+
+# ---------------------------------------------------------------------------
+# Warm-up tests
+# ---------------------------------------------------------------------------
+
+
+@patch("caviardeur.detectors.ner_detector._get_engine")
+def test_warm_up_ner_runs_full_size_dummy_batch(mock_get):
+    session = MagicMock()
+    session.get_inputs.return_value = [MockInput("input_ids"), MockInput("attention_mask")]
+    session.run.side_effect = lambda _, inputs: [np.zeros((*inputs["input_ids"].shape, 2), dtype=np.float32)]
+    mock_get.return_value = NerEngine(session, _make_word_sp(), {0: "O", 1: "B-PER"}, 5, 6, 1, 4)
+
+    warm_up_ner(NerOptions(model_name="fake-model", batch_size=3, max_length=16))
+    assert session.run.call_args.args[1]["input_ids"].shape == (3, 16)
+
+    session.run.reset_mock()
+    warm_up_ner(NerOptions(model_name="fake-model"), inference=False)
+    session.run.assert_not_called()
+
+
+def test_concurrent_loads_share_one_model_load():
+    import threading
+    import time
+
+    loads = []
+
+    def _slow_load(*args):
+        loads.append(args)
+        time.sleep(0.05)
+        return MagicMock(memory_bytes=0)
+
+    unload_ner()
+    with patch("caviardeur.detectors.ner_detector.NerEngine.load", side_effect=_slow_load):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(_get_engine("fake-model"))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(loads) == 1
+        assert len({id(r) for r in results}) == 1
+
+        # Another model is loaded next to it; unload closes both
+        other = _get_engine("other-model")
+        assert len(loads) == 2
+        unload_ner()
+        other.close.assert_called_once()
+        _get_engine("other-model")
+        assert len(loads) == 3
+    unload_ner()
+
+
+# ---------------------------------------------------------------------------
+# NerEngine tests
+# ---------------------------------------------------------------------------
+
+
+def _per_engine() -> NerEngine:
+    session = MagicMock()
+    session.get_inputs.return_value = [MockInput("input_ids"), MockInput("attention_mask")]
+    session.run.side_effect = lambda _, inputs: [
+        np.broadcast_to(_hot_logits(1, len(ID2LABEL), [1]), (*inputs["input_ids"].shape, len(ID2LABEL)))
+    ]
+    return NerEngine(session, _make_word_sp(), ID2LABEL, 5, 6, 1, 4, model_id="fake|fp32")
+
+
+def test_engine_detect_from_several_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    engine = _per_engine()
+    texts = [f"Jean Dupont {i}" if i % 2 else "Marie Curie" for i in range(40)]
+    expected = engine.detect(texts)
+
+    stats.reset()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda chunk: engine.detect(chunk), [texts[i : i + 5] for i in range(0, 40, 5)]))
+
+    assert [doc for chunk in results for doc in chunk] == expected
+    # Window counters are not lost between threads
+    assert stats.windows == 40
+    assert [e.text for e in expected[0]] == ["Marie", "Curie"]
+
+
+def test_detect_ner_uses_given_engine():
+    engine = _per_engine()
+    with patch("caviardeur.detectors.ner_detector._get_engine") as mock_get:
+        entities = detect_ner("Jean Dupont", engine=engine)
+
+    mock_get.assert_not_called()
+    assert [e.text for e in entities] == ["Jean", "Dupont"]
+
+
+def test_engine_close():
+    with _per_engine() as engine:
+        assert not engine.closed
+    assert engine.closed
+    with pytest.raises(RuntimeError, match="closed"):
+        engine.detect(["Jean Dupont"])
+    # Blank input never touches the session
+    assert engine.detect([" "]) == [[]]
+
+
+def test_engine_session_pool_runs_batches_on_every_session():
+    import threading
+
+    sessions = [_per_engine().session for _ in range(3)]
+    barrier = threading.Barrier(3, timeout=5)
+    for session in sessions:
+        run = session.run.side_effect
+
+        def _run(names, inputs, run=run):
+            # Every session must be busy at the same time for the barrier to open
+            barrier.wait()
+            return run(names, inputs)
+
+        session.run.side_effect = _run
+    engine = NerEngine(sessions[0], _make_word_sp(), ID2LABEL, 5, 6, 1, 4, sessions=sessions)
+    texts = ["Jean Dupont", "Marie Curie", "Paul Martin"]
+
+    results = engine.detect(texts, NerOptions(batch_size=1))
+
+    assert [[e.text for e in doc] for doc in results] == [["Jean", "Dupont"], ["Marie", "Curie"], ["Paul", "Martin"]]
+    assert [session.run.call_count for session in sessions] == [1, 1, 1]
+    engine.close()
+    assert engine.sessions == []
+
+
+# ---------------------------------------------------------------------------
+# Model cascade tests
+# ---------------------------------------------------------------------------
+
+
+def test_uncertain_windows_flags():
+    logits = np.stack(
+        [
+            _hot_logits(5, len(ID2LABEL), [0, 0, 0, 0, 0]),  # confident, no entity
+            _hot_logits(5, len(ID2LABEL), [0, 0, 1, 0, 0]),  # entity token
+            np.zeros((5, len(ID2LABEL)), dtype=np.float32),  # unsure everywhere
+            _hot_logits(5, len(ID2LABEL), [0, 0, 0, 0, 0]),  # truncated below
+        ]
+    )
+    session = _make_session(np.zeros((5, len(ID2LABEL)), dtype=np.float32))
+    session.run.side_effect = None
+    session.run.return_value = [logits]
+    window = (np.array([14, 24, 34]), np.array([[0, 1], [1, 2], [2, 3]]))
+    long_window = (np.arange(10), np.zeros((10, 2), dtype=np.int64))
+
+    flags = _uncertain_windows(session, ID2LABEL, [window, window, window, long_window], 5, 6, 1, 0.9, max_length=5)
+
+    assert flags == [False, True, True, True]
+
+
+def test_engine_detect_escalates_only_flagged_windows():
+    import re
+
+    def _encode_one(text):
+        # Known first names get id 101 (105 after the fairseq offset), other words id 100
+        return MockEncoded(
+            pieces=[
+                MockPiece(id=101 if m.group() in ("Jean", "Marie") else 100, begin=m.start(), end=m.end())
+                for m in re.finditer(r"\S+", text)
+            ]
+        )
+
+    draft_sp = _make_sp([])
+    draft_sp.encode.side_effect = lambda text, out_type=None, num_threads=None: (
+        [_encode_one(t) for t in text] if isinstance(text, list) else _encode_one(text)
+    )
+    draft_session = MagicMock()
+    draft_session.get_inputs.return_value = [MockInput("input_ids"), MockInput("attention_mask")]
+
+    def _draft_run(_, inputs):
+        ids = inputs["input_ids"]
+        logits = np.where(
+            (ids == 105)[..., None], _hot_logits(1, len(ID2LABEL), [1]), _hot_logits(1, len(ID2LABEL), [0])
+        )
+        return [logits.astype(np.float32)]
+
+    draft_session.run.side_effect = _draft_run
+    draft = NerEngine(draft_session, draft_sp, ID2LABEL, 5, 6, 1, 4, model_id="draft|fp32")
+    engine = _per_engine()
+
+    stats.reset()
+    results = engine.detect(["Jean Dupont", "Le Conseil se réunit", "Marie"], draft=draft)
+
+    assert [[e.text for e in doc] for doc in results] == [["Jean", "Dupont"], [], ["Marie"]]
+    assert sum(len(call.args[1]["input_ids"]) for call in engine.session.run.call_args_list) == 2
+    assert (stats.drafted, stats.escalated) == (3, 2)
+
+
+_MB = 1024 * 1024
+
+
+def _sized_load(*args):
+    return MagicMock(memory_bytes=600 * _MB, model_id=args[0])
+
+
+def test_default_engines_are_bounded_by_memory():
+    unload_ner()
+    with patch("caviardeur.detectors.ner_detector.NerEngine.load", side_effect=_sized_load) as load:
+        french = _get_engine("fr-model", NerOptions(max_loaded_mb=1500))
+        draft = _get_engine("draft-model")
+        assert _get_engine("fr-model") is french
+        assert load.call_count == 2
+
+        # A third model unloads the least recently used one to stay under 1500 MB
+        english = _get_engine("en-model")
+        draft.close.assert_called_once()
+        french.close.assert_not_called()
+        assert _get_engine("fr-model") is french
+        assert _get_engine("en-model") is english
+
+        # Engines in use are kept even beyond the budget
+        _get_engine("draft-model", NerOptions(max_loaded_mb=1000), keep=(french,))
+        english.close.assert_called_once()
+        french.close.assert_not_called()
+        assert load.call_count == 4
+    unload_ner()
+
+
+def test_evict_ner_closes_one_model():
+    unload_ner()
+    with patch("caviardeur.detectors.ner_detector.NerEngine.load", side_effect=_sized_load):
+        french = _get_engine("fr-model", NerOptions(max_loaded_mb=2048))
+        english = _get_engine("en-model")
+
+        assert evict_ner("en-model") == 1
+        english.close.assert_called_once()
+        french.close.assert_not_called()
+        assert _get_engine("en-model") is not english
+        assert evict_ner() == 2
+
+
+def test_detect_ner_batch_routes_documents_by_language():
+    engines = {}
+
+    def _engine_for(model_name, *args, **kwargs):
+        engine = engines.setdefault(model_name, MagicMock())
+        engine.detect.side_effect = lambda texts, **kwargs: [[model_name] for _ in texts]
+        return engine
+
+    texts = [
+        "Le contrat est signé par Jean Dupont.",
+        "The contract was signed by John Smith.",
+        "La réunion avec Marie est reportée.",
+    ]
+    with patch("caviardeur.detectors.ner_detector._get_engine", side_effect=_engine_for):
+        results = detect_ner_batch(texts, NerOptions(model_name="fr-model", language_models={"en": "en-model"}))
+
+    assert results == [["fr-model"], ["en-model"], ["fr-model"]]
+    # Documents of one language share batches
+    assert len(engines["fr-model"].detect.call_args.args[0]) == 2
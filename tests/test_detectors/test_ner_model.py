@@ -0,0 +1,265 @@
+import numpy as np
+import pytest
+
+from caviardeur.detectors.ner_model import SessionSettings, build_session, model_size, optimized_model_path
+
+
+def _run(session) -> np.ndarray:
+    ids = np.array([[1, 2, 3]], dtype=np.int64)
+    return session.run(None, {"input_ids": ids, "attention_mask": np.ones_like(ids)})[0]
+
+
+def test_session_settings_validation():
+    with pytest.raises(ValueError, match="graph optimization"):
+        SessionSettings(graph_optimization="max")
+    with pytest.raises(ValueError, match="execution mode"):
+        SessionSettings(execution_mode="async")
+
+
+def test_build_session_applies_options(tiny_model_path):
+    settings = SessionSettings(intra_op_threads=2, inter_op_threads=1, execution_mode="parallel", cpu_mem_arena=False)
+    session = build_session(tiny_model_path, settings)
+
+    options = session.get_session_options()
+    assert options.intra_op_num_threads == 2
+    assert options.inter_op_num_threads == 1
+    assert options.enable_cpu_mem_arena is False
+
+
+def test_build_session_caches_optimized_graph(tiny_model_path):
+    settings = SessionSettings(graph_optimization="extended")
+    cached = optimized_model_path(tiny_model_path, settings)
+    assert not cached.exists()
+
+    first = build_session(tiny_model_path, settings)
+    assert cached.exists()
+    assert cached.parent == tiny_model_path.parent
+    assert not list(tiny_model_path.parent.glob("*.tmp"))
+    assert not list(tiny_model_path.parent.glob(".*.tmp"))
+    # Weights of the cached graph are stored separately so they can be memory-mapped,
+    # under a name that does not depend on the process that wrote them
+    assert sorted(p.name for p in tiny_model_path.parent.glob(f"{cached.name}*")) == [
+        cached.name,
+        f"{cached.name}.data",
+    ]
+
+    # Second start loads the cached graph directly, with the optimizer disabled
+    second = build_session(tiny_model_path, settings)
+    assert second.get_session_options().graph_optimization_level.name == "ORT_DISABLE_ALL"
+    np.testing.assert_allclose(_run(first), _run(second), rtol=1e-6)
+
+
+def test_build_session_caches_only_portable_graph(tiny_model_path):
+    # "all" adds CPU-specific layout transforms: only the "extended" graph goes to disk
+    settings = SessionSettings(graph_optimization="all")
+    cached = optimized_model_path(tiny_model_path, settings)
+    assert cached == optimized_model_path(tiny_model_path, SessionSettings(graph_optimization="extended"))
+
+    first = build_session(tiny_model_path, settings)
+    assert cached.exists()
+    assert first.get_session_options().graph_optimization_level.name == "ORT_ENABLE_ALL"
+
+    # The remaining passes run at startup on top of the cached graph
+    second = build_session(tiny_model_path, settings)
+    assert second.get_session_options().graph_optimization_level.name == "ORT_ENABLE_ALL"
+    np.testing.assert_allclose(_run(first), _run(second), rtol=1e-6)
+
+
+def test_build_session_without_cache(tiny_model_path):
+    settings = SessionSettings(cache_optimized_model=False)
+    build_session(tiny_model_path, settings)
+    assert not optimized_model_path(tiny_model_path, settings).exists()
+
+
+def test_quantize_model_creates_int8_copy(tiny_model_path):
+    from caviardeur.detectors.ner_model import quantize_model, quantized_model_path
+
+    target = quantize_model(tiny_model_path)
+
+    assert target == quantized_model_path(tiny_model_path)
+    assert target.exists()
+    assert not list(tiny_model_path.parent.glob("*.tmp"))
+    fp32 = _run(build_session(tiny_model_path, SessionSettings(cache_optimized_model=False)))
+    int8 = _run(build_session(target, SessionSettings(cache_optimized_model=False)))
+    assert fp32.shape == int8.shape
+    np.testing.assert_allclose(fp32, int8, atol=0.5)
+
+    # Cached copy is reused unless forced
+    mtime = target.stat().st_mtime_ns
+    assert quantize_model(tiny_model_path) == target
+    assert target.stat().st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("opset", [17, 18])
+def test_add_prediction_outputs_matches_logits(tmp_path, opset):
+    from caviardeur.detectors.ner_model import PREDICTION_OUTPUTS, add_prediction_outputs, prediction_model_path
+
+    from .conftest import build_tiny_ner_model
+
+    model_path = build_tiny_ner_model(tmp_path / "model.onnx", opset=opset)
+    target = add_prediction_outputs(model_path)
+
+    assert target == prediction_model_path(model_path)
+    assert not list(tmp_path.glob("*.tmp"))
+    settings = SessionSettings(cache_optimized_model=False)
+    logits = _run(build_session(model_path, settings))
+    session = build_session(target, settings)
+    assert [out.name for out in session.get_outputs()] == list(PREDICTION_OUTPUTS)
+
+    ids = np.array([[1, 2, 3]], dtype=np.int64)
+    labels, scores = session.run(None, {"input_ids": ids, "attention_mask": np.ones_like(ids)})
+    probs = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    probs /= probs.sum(axis=-1, keepdims=True)
+    assert labels.tolist() == logits.argmax(axis=-1).tolist()
+    np.testing.assert_allclose(scores, probs.max(axis=-1), rtol=1e-5)
+
+    # Cached copy is reused
+    mtime = target.stat().st_mtime_ns
+    assert add_prediction_outputs(model_path) == target
+    assert target.stat().st_mtime_ns == mtime
+
+
+def _write_model_dir(path, model_path):
+    import shutil
+
+    path.mkdir(exist_ok=True)
+    shutil.copyfile(model_path, path / "model.onnx")
+    (path / "config.json").write_text("{}")
+    (path / "sentencepiece.bpe.model").write_bytes(b"spm")
+    return path
+
+
+def test_resolve_model_files_from_local_dir_without_network(tmp_path, tiny_model_path):
+    from unittest.mock import patch
+
+    from caviardeur.detectors.ner_model import resolve_model_files
+
+    model_dir = _write_model_dir(tmp_path / "local", tiny_model_path)
+    with patch("huggingface_hub.hf_hub_download", side_effect=AssertionError("network")):
+        paths = resolve_model_files(str(model_dir))
+
+    assert paths == tuple(str(model_dir / name) for name in ("model.onnx", "config.json", "sentencepiece.bpe.model"))
+
+    (model_dir / "config.json").unlink()
+    with pytest.raises(FileNotFoundError, match="config.json"):
+        resolve_model_files(str(model_dir))
+
+
+def test_resolve_model_files_prefers_hub_cache(tmp_path):
+    from unittest.mock import patch
+
+    from huggingface_hub.errors import LocalEntryNotFoundError
+
+    from caviardeur.detectors.ner_model import resolve_model_files
+
+    def _cached(repo_id, filename, local_files_only=False):
+        return f"/cache/{filename}"
+
+    with patch("huggingface_hub.hf_hub_download", side_effect=_cached) as mock_download:
+        assert resolve_model_files("org/model")[0] == "/cache/model.onnx"
+    assert all(call.kwargs["local_files_only"] for call in mock_download.call_args_list)
+
+    def _not_cached(repo_id, filename, local_files_only=False):
+        if local_files_only:
+            raise LocalEntryNotFoundError("not cached")
+        return f"/downloaded/{filename}"
+
+    with patch("huggingface_hub.hf_hub_download", side_effect=_not_cached):
+        assert resolve_model_files("org/model")[2] == "/downloaded/sentencepiece.bpe.model"
+
+
+def test_fetch_model_writes_memory_mappable_model(tmp_path, tiny_model_path):
+    from unittest.mock import patch
+
+    from caviardeur.detectors.ner_model import add_prediction_outputs, fetch_model, prediction_model_path
+
+    source = _write_model_dir(tmp_path / "hub", tiny_model_path)
+    files = tuple(str(source / name) for name in ("model.onnx", "config.json", "sentencepiece.bpe.model"))
+    target = tmp_path / "models" / "camembert"
+
+    with patch("caviardeur.detectors.ner_model.resolve_model_files", return_value=files):
+        assert fetch_model("org/model", target) == target
+
+    assert (target / "config.json").read_text() == "{}"
+    assert (target / "model.onnx.data").stat().st_size > 0
+    # Weights live in the data file; the graph files only reference them
+    assert (target / "model.onnx").stat().st_size < tiny_model_path.stat().st_size
+    labels = prediction_model_path(target / "model.onnx")
+    assert labels.exists()
+    assert labels.stat().st_size < tiny_model_path.stat().st_size
+    assert add_prediction_outputs(target / "model.onnx") == labels
+
+    settings = SessionSettings(cache_optimized_model=False)
+    np.testing.assert_allclose(
+        _run(build_session(target / "model.onnx", settings)), _run(build_session(tiny_model_path, settings))
+    )
+
+
+def test_build_session_pool_shares_weights(tiny_model_path):
+    from caviardeur.detectors.ner_model import build_session_pool
+
+    single = _run(build_session(tiny_model_path, SessionSettings(cache_optimized_model=False)))
+    sessions, shared = build_session_pool(tiny_model_path, SessionSettings(), size=3)
+
+    assert len(sessions) == 3
+    assert {"embedding", "weight", "bias"} <= set(shared)
+    for session in sessions:
+        options = session.get_session_options()
+        assert options.intra_op_num_threads >= 1
+        assert options.get_session_config_entry("session.disable_prepacking") == "1"
+        np.testing.assert_allclose(_run(session), single, rtol=1e-6)
+    # Shared weights are read from the cached optimized graph the sessions load
+    assert optimized_model_path(tiny_model_path, SessionSettings()).exists()
+
+    # A pool of one is a plain session
+    (session,), shared = build_session_pool(tiny_model_path, SessionSettings(), size=1)
+    assert shared == {}
+
+
+def test_model_size_counts_external_weights(tmp_path):
+    (tmp_path / "model.onnx").write_bytes(b"\0" * 100)
+    assert model_size(tmp_path / "model.onnx") == 100
+    (tmp_path / "model.onnx.data").write_bytes(b"\0" * 900)
+    (tmp_path / "model.labels.onnx").write_bytes(b"\0" * 10)
+    (tmp_path / "model.int8.onnx").write_bytes(b"\0" * 50)
+    assert model_size(tmp_path / "model.onnx") == 1000
+    assert model_size(tmp_path / "model.labels.onnx") == 910
+    assert model_size(tmp_path / "model.int8.onnx") == 50
+
+
+def test_atomic_write_moves_companion_files_and_cleans_up(tmp_path):
+    from caviardeur.detectors.ner_model import _atomic_write
+
+    def _write(path):
+        path.with_name("model.onnx.data").write_bytes(b"weights")
+        path.write_bytes(b"graph")
+
+    _atomic_write(tmp_path / "model.onnx", _write)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["model.onnx", "model.onnx.data"]
+
+    def _fail(path):
+        path.write_bytes(b"partial")
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        _atomic_write(tmp_path / "model.int8.onnx", _fail)
+    # Nothing partial is left in place, and no private directory either
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["model.onnx", "model.onnx.data"]
+
+
+def test_model_fingerprint_changes_with_refetched_weights(tmp_path):
+    import os
+
+    from caviardeur.detectors.ner_model import model_fingerprint
+
+    (tmp_path / "model.onnx").write_bytes(b"\0" * 100)
+    (tmp_path / "model.onnx.data").write_bytes(b"\1" * 900)
+    (tmp_path / "config.json").write_text("{}")
+    first = model_fingerprint(tmp_path / "model.onnx", tmp_path / "config.json")
+    assert first == model_fingerprint(tmp_path / "model.onnx", tmp_path / "config.json")
+
+    # Same graph file, new weights of the same size (as written by `model fetch --force`)
+    (tmp_path / "model.onnx.data").write_bytes(b"\2" * 900)
+    stat = (tmp_path / "model.onnx.data").stat()
+    os.utime(tmp_path / "model.onnx.data", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert model_fingerprint(tmp_path / "model.onnx", tmp_path / "config.json") != first
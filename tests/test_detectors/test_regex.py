@@ -1,7 +1,12 @@
+import pytest
+
 from caviardeur.detectors.base import EntityType
 from caviardeur.detectors.regex_detector import (
+    PatternRegistry,
     _luhn_check,
+    _luhn_check_batch,
     detect_addresses,
+    detect_regex,
     detect_siret,
 )
 
@@ -68,3 +73,86 @@ def test_detect_address_avenue():
 def test_detect_address_no_match():
     entities = detect_addresses("Ceci est un texte sans adresse.")
     assert len(entities) == 0
+
+
+# --- Pattern registry ---
+
+
+def test_luhn_check_batch_matches_scalar():
+    values = ["73282932000074", "12345678901234", "79927398713", "0", ""]
+    assert _luhn_check_batch(values) == [_luhn_check(v) for v in values]
+    assert _luhn_check_batch([]) == []
+
+
+def test_detect_regex_finds_all_patterns():
+    text = "SIRET 732 829 320 00074, siège au 12 rue de la Paix, 75002 Paris."
+    entities = detect_regex(text)
+    assert [e.entity_type for e in entities] == [EntityType.SIRET, EntityType.ADDRESS]
+    assert entities[0].text == "732 829 320 00074"
+
+
+def test_registry_validates_candidates_in_one_batch():
+    seen = []
+
+    def _even(values):
+        seen.append(values)
+        return [int(v) % 2 == 0 for v in values]
+
+    registry = PatternRegistry()
+    registry.register("ticket", r"\bT-\d{3}\b", EntityType.SIRET, 0.9, validator=_even, normalize=lambda v: v[2:])
+    registry.register("code", r"\bcode-\w+", EntityType.COMPANY, 0.5, ignore_case=True)
+
+    entities = registry.scan("T-100, T-101, CODE-x and T-102")
+
+    assert seen == [["100", "101", "102"]]
+    assert [(e.text, e.confidence) for e in entities] == [("T-100", 0.9), ("CODE-x", 0.5), ("T-102", 0.9)]
+    assert [e.text for e in registry.scan("T-100 code-y", names=["code"])] == ["code-y"]
+
+    registry.unregister("ticket")
+    assert registry.names == ["code"]
+
+
+def test_registry_rejects_invalid_names():
+    with pytest.raises(ValueError, match="identifier"):
+        PatternRegistry().register("not valid", r"x", EntityType.SIRET, 0.5)
+
+
+def test_detect_address_bis_and_keyword_in_street_name():
+    entities = detect_addresses("Livraison au 3 bis, place de la Concorde, puis 4 rue du Chemin Vert")
+    assert [e.text for e in entities] == ["3 bis, place de la Concorde", "4 rue du Chemin Vert"]
+
+
+def test_detect_address_requires_house_number():
+    assert detect_addresses("Il habite rue de la Paix depuis 2012 rue") == []
+    assert detect_addresses("Code 12345 rue de la Paix") == []
+
+
+# --- Address scanner throughput ---
+
+_MB = 1_000_000
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # Long whitespace runs after numbers (OCR layout): unbounded \s* used to go quadratic
+        ("1" + " " * 2000) * 250,
+        ("12" + " " * 2000 + "rue" + " " * 2000 + "x") * 100,
+        # Keywords everywhere, none of them an address
+        "12 rue " * 75_000,
+        # Long runs of lowercase words after numbers and keywords
+        ("12 " + "rue de la paix et des " * 50) * 500,
+        # Realistic text, one address per sentence
+        "Le contrat signé au 12 rue de la Paix, 75002 Paris par Jean. " * 8_000,
+    ],
+    ids=["whitespace", "whitespace-keyword", "keywords", "lowercase", "prose"],
+)
+def test_detect_addresses_throughput(text):
+    import time
+
+    start = time.perf_counter()
+    detect_addresses(text)
+    elapsed = time.perf_counter() - start
+
+    # Linear scan: about 1.5-20 MB/s on a laptop; the bound leaves room for slow CI machines
+    assert len(text) / elapsed > 0.25 * _MB
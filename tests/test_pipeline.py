@@ -3,9 +3,11 @@
 from pathlib import Path
 from unittest.mock import patch
 
+import pytest
+
 from caviardeur.config import Config
 from caviardeur.detectors.base import DetectedEntity, EntityType
-from caviardeur.pipeline import process_file
+from caviardeur.pipeline import process_file, process_files, start_warm_up
 from caviardeur.pseudonymizer.mapping import MappingStore
 
 FIXTURES = Path(__file__).parent / "fixtures"
@@ -270,3 +272,142 @@ def test_pipeline_pptx(mock_detect, tmp_path: Path):
                 all_text += shape.text_frame.text
     assert "Jean Dupont" not in all_text
     assert "PERSON" in all_text
+
+
+# --- Writers only touch modified chunks ---
+
+
+def test_write_pptx_only_rewrites_modified_runs(tmp_path: Path):
+    from pptx import Presentation
+
+    from caviardeur.readers.pptx_reader import read_pptx
+    from caviardeur.writers.pptx_writer import write_pptx
+
+    content = read_pptx(FIXTURES / "sample.pptx")
+    content.chunks[2].text = "PSEUDO_A"  # slide 0
+    content.chunks[7].text = "PSEUDO_B"  # slide 1, not marked as modified
+    content.modified = {2}
+
+    write_pptx(content, tmp_path / "out.pptx", FIXTURES / "sample.pptx")
+
+    slides = Presentation(str(tmp_path / "out.pptx")).slides
+    assert slides[0].shapes[1].text_frame.text == "PSEUDO_A"
+    assert slides[1].shapes[1].text_frame.paragraphs[0].text == "Client: Jean Dupont"
+
+
+def test_write_docx_only_rewrites_modified_runs(tmp_path: Path):
+    from docx import Document
+
+    from caviardeur.readers.docx_reader import read_docx
+    from caviardeur.writers.docx_writer import write_docx
+
+    content = read_docx(FIXTURES / "sample.docx")
+    content.chunks[2].text = "Nom: PSEUDO_A"
+    content.chunks[4].text = "Entreprise: PSEUDO_B"  # not marked as modified
+    content.modified = {2}
+
+    write_docx(content, tmp_path / "out.docx", FIXTURES / "sample.docx")
+
+    paragraphs = Document(str(tmp_path / "out.docx")).paragraphs
+    assert paragraphs[1].text == "Nom: PSEUDO_A"
+    assert paragraphs[2].text == "Entreprise: Nextech Solutions SAS"
+
+
+# --- Cross-document scheduling ---
+
+
+def _mock_detect_all_batch(texts, **kwargs):
+    return [_mock_detect_all(text) for text in texts]
+
+
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
+def test_process_files_groups_documents(mock_detect, tmp_path: Path):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    paths = []
+    for name, text in [
+        ("a.txt", "Jean Dupont"),
+        ("b.txt", "   "),
+        ("c.txt", "Marie Laurent"),
+        ("d.txt", "Jean Dupont"),
+    ]:
+        path = input_dir / name
+        path.write_text(text, encoding="utf-8")
+        paths.append(path)
+
+    config = Config(output_dir=tmp_path / "output", scheduler_max_documents=2)
+    mapping = MappingStore()
+
+    results = list(process_files(paths, config, mapping))
+
+    assert [r.path.name for r in results] == ["a.txt", "b.txt", "c.txt", "d.txt"]
+    assert [len(r.entities) for r in results] == [1, 0, 1, 1]
+    # Blank documents are not sent to the detectors
+    assert [call.args[0] for call in mock_detect.call_args_list] == [["Jean Dupont"], ["Marie Laurent", "Jean Dupont"]]
+    # Pseudonyms are assigned in input order, as with a file-by-file run
+    assert (tmp_path / "output" / "c.txt").read_text(encoding="utf-8") == "PERSON_002"
+    assert (tmp_path / "output" / "d.txt").read_text(encoding="utf-8") == "PERSON_001"
+
+
+@patch("caviardeur.pipeline.detect_all", side_effect=_mock_detect_all)
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=RuntimeError("batch failed"))
+def test_process_files_falls_back_to_single_documents(mock_batch, mock_single, tmp_path: Path):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    good = input_dir / "good.txt"
+    good.write_text("Jean Dupont", encoding="utf-8")
+    bad = input_dir / "bad.txt"
+    bad.write_text("boom", encoding="utf-8")
+
+    def _detect(text, **kwargs):
+        if text == "boom":
+            raise ValueError("bad document")
+        return _mock_detect_all(text)
+
+    mock_single.side_effect = _detect
+    results = list(process_files([good, bad], Config(dry_run=True), MappingStore()))
+
+    assert results[0].error is None
+    assert len(results[0].entities) == 1
+    assert isinstance(results[1].error, ValueError)
+
+
+@patch("caviardeur.pipeline.detect_all_batch", side_effect=_mock_detect_all_batch)
+def test_process_files_reports_read_errors(mock_detect, tmp_path: Path):
+    broken = tmp_path / "broken.docx"
+    broken.write_text("not a zip", encoding="utf-8")
+    ok = tmp_path / "ok.txt"
+    ok.write_text("Jean Dupont", encoding="utf-8")
+
+    results = list(process_files([broken, ok], Config(dry_run=True), MappingStore()))
+
+    assert results[0].error is not None
+    assert results[1].error is None
+    assert len(results[1].entities) == 1
+
+
+@patch("caviardeur.pipeline.warm_up_ner")
+def test_start_warm_up_loads_model_in_background(mock_warm_up):
+    thread = start_warm_up(Config(ner_warm_up="infer", ner_quantized=True, ner_batch_size=4))
+    thread.join(timeout=5)
+
+    (options,) = mock_warm_up.call_args.args
+    assert options.quantized is True
+    assert options.batch_size == 4
+    assert mock_warm_up.call_args.kwargs["inference"] is True
+
+    # The default only loads the model; the dummy batch is opt-in
+    mock_warm_up.reset_mock()
+    start_warm_up(Config()).join(timeout=5)
+    assert mock_warm_up.call_args.kwargs["inference"] is False
+
+
+@patch("caviardeur.pipeline.warm_up_ner", side_effect=OSError("offline"))
+def test_start_warm_up_swallows_errors_and_can_be_disabled(mock_warm_up):
+    thread = start_warm_up(Config())
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+    assert start_warm_up(Config(ner_warm_up="none")) is None
+    with pytest.raises(ValueError, match="warm-up mode"):
+        start_warm_up(Config(ner_warm_up="eager"))
@@ -132,3 +132,62 @@ def test_pseudonymize_multi_chunk():
     raw = result.raw_text
     assert "PERSON_001" in raw
     assert "Jean Dupont" not in raw
+
+
+def _person(text: str, start: int) -> DetectedEntity:
+    return DetectedEntity(entity_type=EntityType.PERSON, text=text, start=start, end=start + len(text), source="ner")
+
+
+def test_pseudonymize_shares_untouched_chunks():
+    chunks = [
+        TextChunk(text="Titre\n", location={"para_idx": 0}),
+        TextChunk(text="Signé par Jean Dupont", location={"para_idx": 1}),
+        TextChunk(text="\nFin", location={"para_idx": 2}),
+    ]
+    content = DocumentContent(chunks=chunks)
+    content.assign_offsets()
+
+    result = pseudonymize(content, [_person("Jean Dupont", 16)], MappingStore())
+
+    assert result.chunks[0] is chunks[0]
+    assert result.chunks[1].text == "Signé par PERSON_001"
+    assert result.chunks[1].location is chunks[1].location
+    # Shifted chunk: new offset, same text and location objects
+    assert result.chunks[2] is not chunks[2]
+    assert (result.chunks[2].offset, result.chunks[2].location) == (26, {"para_idx": 2})
+    assert result.chunks[2].location is chunks[2].location
+    # The input document is left as it was
+    assert [c.offset for c in content.chunks] == [0, 6, 27]
+    assert result.locate(26, 30) == [(2, 0, 4)]
+
+
+def test_pseudonymize_many_entities_in_one_chunk():
+    names = ["Jean Dupont", "Marie Curie"] * 2000
+    text = " et ".join(names)
+    content = DocumentContent(chunks=[TextChunk(text=text)])
+    content.assign_offsets()
+    entities = []
+    start = 0
+    for name in names:
+        entities.append(_person(name, start))
+        start += len(name) + len(" et ")
+
+    result = pseudonymize(content, entities, MappingStore())
+
+    # Numbering follows the reverse document order, as before
+    assert result.raw_text == " et ".join(["PERSON_002", "PERSON_001"] * 2000)
+
+
+def test_pseudonymize_records_modified_chunks():
+    chunks = [TextChunk(text="Jean "), TextChunk(text="Dupont"), TextChunk(text=" et "), TextChunk(text="Marie Curie")]
+    content = DocumentContent(chunks=chunks)
+    content.assign_offsets()
+    mapping = MappingStore()
+
+    result = pseudonymize(content, [_person("Jean Dupont", 0)], mapping)
+    assert result.modified == {0, 1}
+    assert content.modified is None
+
+    # A second pass adds to the chunks changed by the first
+    again = pseudonymize(result, [_person("Marie Curie", len(result.raw_text) - 11)], mapping)
+    assert again.modified == {0, 1, 3}
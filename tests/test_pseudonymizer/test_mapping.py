@@ -1,7 +1,7 @@
 from pathlib import Path
 
 from caviardeur.detectors.base import EntityType
-from caviardeur.pseudonymizer.mapping import MappingStore
+from caviardeur.pseudonymizer.mapping import MappingStore, SqliteMappingStore, is_database_path
 
 
 def test_get_or_create_new():
@@ -89,3 +89,59 @@ def test_save_and_load(tmp_path: Path):
     # Verify existing entries are found
     r = loaded.get_or_create("Jean Dupont", EntityType.PERSON)
     assert r == "PERSON_001"
+
+
+def test_sqlite_store_round_trip(tmp_path: Path):
+    path = tmp_path / "mapping.sqlite"
+    store = SqliteMappingStore(path)
+    assert store.get_or_create("Jean Dupont", EntityType.PERSON) == "PERSON_001"
+    assert store.get_or_create("jean  dupont", EntityType.PERSON) == "PERSON_001"
+    assert store.get_or_create("Acme Corp", EntityType.COMPANY) == "COMPANY_001"
+    assert store.get_or_create("Marie Laurent", EntityType.PERSON) == "PERSON_002"
+    store.commit()
+    store.close()
+
+    reopened = SqliteMappingStore(path)
+    assert reopened.mapping == {"PERSON_001": "Jean Dupont", "COMPANY_001": "Acme Corp", "PERSON_002": "Marie Laurent"}
+    assert reopened.get_real("COMPANY_001") == "Acme Corp"
+    assert reopened.get_real("PERSON_999") is None
+    assert reopened.get_pseudonym("MARIE LAURENT", EntityType.PERSON) == "PERSON_002"
+    assert reopened.get_pseudonym("Marie Laurent", EntityType.COMPANY) is None
+    # Counters continue from the stored pseudonyms
+    assert reopened.get_or_create("Pierre Martin", EntityType.PERSON) == "PERSON_003"
+
+
+def test_sqlite_store_drops_uncommitted_pseudonyms(tmp_path: Path):
+    path = tmp_path / "mapping.db"
+    store = SqliteMappingStore(path)
+    store.get_or_create("Jean Dupont", EntityType.PERSON)
+    store.commit()
+    store.get_or_create("Marie Laurent", EntityType.PERSON)
+    store.close()
+
+    assert SqliteMappingStore(path).mapping == {"PERSON_001": "Jean Dupont"}
+
+
+def test_sqlite_store_json_import_and_export(tmp_path: Path):
+    json_store = MappingStore()
+    json_store.get_or_create("Jean Dupont", EntityType.PERSON)
+    json_store.get_or_create("Acme Corp", EntityType.COMPANY)
+    json_store.save(tmp_path / "mapping.json")
+
+    store = SqliteMappingStore(tmp_path / "mapping.sqlite")
+    assert store.import_json(tmp_path / "mapping.json") == 2
+    assert store.get_or_create("jean dupont", EntityType.PERSON) == "PERSON_001"
+    assert store.get_or_create("Marie Laurent", EntityType.PERSON) == "PERSON_002"
+
+    store.save(tmp_path / "export.json")
+    exported = MappingStore.load(tmp_path / "export.json")
+    assert exported.mapping == store.mapping
+
+    store.save(tmp_path / "copy.db")
+    assert SqliteMappingStore(tmp_path / "copy.db").mapping == store.mapping
+
+
+def test_is_database_path():
+    assert is_database_path(Path("out/mapping.sqlite"))
+    assert is_database_path(Path("mapping.DB"))
+    assert not is_database_path(Path("mapping.json"))
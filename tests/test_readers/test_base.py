@@ -0,0 +1,79 @@
+from caviardeur.readers.base import DocumentContent, TextChunk
+
+
+def test_boundaries_mark_separator_chunks():
+    content = DocumentContent(
+        chunks=[
+            TextChunk("Jean", location={"type": "pdf_span"}),
+            TextChunk(" ", location={"type": "pdf_line_separator"}),
+            TextChunk("Dupont", location={"type": "pdf_span"}),
+            TextChunk("\n", location={"type": "pdf_page_separator"}),
+            TextChunk("ACME", location={"type": "pdf_span"}),
+        ]
+    )
+
+    # Page ends are boundaries; line breaks inside a page are not
+    assert content.boundaries() == [11]
+    assert content.raw_text[11] == "\n"
+
+
+def _content(*texts: str) -> DocumentContent:
+    content = DocumentContent(chunks=[TextChunk(text) for text in texts])
+    content.assign_offsets()
+    return content
+
+
+def test_locate_single_and_spanning_chunks():
+    content = _content("Jean ", "", "Dupont", " habite ici")
+
+    assert content.locate(0, 4) == [(0, 0, 4)]
+    # The empty chunk between the two runs is skipped
+    assert content.locate(0, 11) == [(0, 0, 5), (2, 0, 6)]
+    assert content.locate(8, 14) == [(2, 3, 6), (3, 0, 3)]
+    assert content.locate(30, 40) == []
+
+
+def test_locate_matches_linear_scan():
+    content = _content(*["ab", "", "cde", "f", "", "ghij", "k"] * 20)
+
+    def _linear(start, end):
+        result = []
+        for i, chunk in enumerate(content.chunks):
+            lo, hi = max(start, chunk.offset), min(end, chunk.offset + len(chunk.text))
+            if lo < hi:
+                result.append((i, lo - chunk.offset, hi - chunk.offset))
+        return result
+
+    length = len(content.raw_text)
+    for start in range(length):
+        for end in range(start + 1, min(start + 12, length + 1)):
+            assert content.locate(start, end) == _linear(start, end)
+
+
+def test_assign_offsets_rebuilds_the_index():
+    content = _content("Jean", " Dupont")
+    assert content.locate(5, 11) == [(1, 1, 7)]
+
+    content.chunks.insert(0, TextChunk("M. "))
+    content.assign_offsets()
+    assert content.locate(5, 11) == [(1, 2, 4), (2, 0, 4)]
+
+
+def test_modified_chunks_and_containers():
+    content = DocumentContent(
+        chunks=[
+            TextChunk("Jean", location={"type": "pptx_run", "slide_idx": 0}),
+            TextChunk("\n", location={"type": "pptx_slide_separator", "slide_idx": 0}),
+            TextChunk("Marie", location={"type": "pptx_run", "slide_idx": 1}),
+            TextChunk("Paul", location={"type": "pptx_run", "slide_idx": 4}),
+        ]
+    )
+
+    # Unknown: every chunk counts as modified
+    assert content.modified_chunks() == content.chunks
+    assert content.modified_containers("slide_idx") == {0, 1, 4}
+
+    content.modified = {3, 0}
+    assert [c.text for c in content.modified_chunks()] == ["Jean", "Paul"]
+    assert content.modified_containers("slide_idx") == {0, 4}
+    assert content.modified_containers("page_idx") == set()